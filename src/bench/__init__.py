@@ -0,0 +1,17 @@
+"""
+오프라인 벤치마크/부하 테스트(봇 토큰 없이 실행).
+
+- fake_discord : 가짜 디스코드 서버(지연·5xx·429·채널/전역 레이트리밋 주입)와 Bot 믹스인
+- scenarios    : 정각 발사(10k~100k 구독자, 다중 길드), 디스패처 단독, 클릭 폭주,
+                 스케줄 재생(SimulatedClock 으로 며칠~몇 주를 수 초에 재생, 발사 추적/기대 발사 대조)
+- __main__     : 명령행 실행/결과 비교
+
+실행(src 디렉터리에서):
+    python -m bench                                  # 기본: 구독자 1만 명, 길드 10곳
+    python -m bench fire --subscribers 100000 --guilds 100
+    python -m bench all --json result.json --compare baseline.json
+    python -m bench replay --days 14 --trace trace.jsonl     # 2주치 발사 추적(가상 시간)
+
+상태 파일(구독/원장/길드 설정)은 임시 디렉터리에 만들고 끝나면 지운다 → 운영 config/ 는 건드리지 않음.
+이 패키지는 봇 실행 시 임포트되지 않는다.
+"""
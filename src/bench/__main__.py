@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import shutil
+import sys
+import tempfile
+
+from pathlib                import Path
+from typing                 import (
+    Any,
+    Dict,
+    Optional
+)
+
+SCENARIOS = ("fire", "dispatch", "toggle", "replay")
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="오프라인 벤치마크(가짜 디스코드 서버)")
+    parser.add_argument("scenario", nargs="?", default="all", choices=SCENARIOS + ("all",))
+    parser.add_argument("--subscribers", type=int, default=10_000, help="정각 발사 구독자 수(모든 길드 합)")
+    parser.add_argument("--guilds", type=int, default=10, help="정각 발사 길드 수")
+    parser.add_argument("--backend", default="json", choices=("json", "sqlite"))
+    parser.add_argument("--concurrency", type=int, default=8, help="디스패처 동시 전송 수")
+    parser.add_argument("--messages", type=int, default=500, help="디스패처 단독 메시지 수")
+    parser.add_argument("--channels", type=int, default=50, help="디스패처 단독 채널 수")
+    parser.add_argument("--users", type=int, default=100_000, help="클릭 폭주 사용자 풀")
+    parser.add_argument("--clicks", type=int, default=20_000, help="클릭 폭주 토글 수")
+    parser.add_argument("--spammers", type=int, default=0, help="클릭 폭주 중 연타하는 사용자 수(클릭의 절반을 이들이 누름)")
+    parser.add_argument("--days", type=float, default=7.0, help="스케줄 재생 기간(일, 가상 시간)")
+    parser.add_argument("--start", type=dt.datetime.fromisoformat, help="재생 시작 시각(ISO 8601, 기본 2025-03-08T21:30+09:00)")
+    parser.add_argument("--replay-subscribers", type=int, default=1_000, help="재생 구독자 수(모든 길드 합)")
+    parser.add_argument("--replay-guilds", type=int, default=3, help="재생 길드 수")
+    parser.add_argument("--message-mode", default="send", choices=("send", "edit"), help="알림 메시지 방식(fire/replay)")
+    parser.add_argument("--trace", help="재생 발사 추적을 JSON Lines 로 저장")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="임의 5xx 비율(0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="버킷과 무관한 임의 429 비율(0~1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="tracemalloc 힙 최대 사용량 측정(느려짐)")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 으로 저장")
+    parser.add_argument("--compare", help="이전 결과(JSON)와 비교해 변화율 출력")
+    parser.add_argument("--verbose", action="store_true", help="봇 INFO 로그 출력")
+    return parser.parse_args(argv)
+
+def _print_report(name: str, report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"\n[{name}]")
+    for key, value in report.items():
+        line = f"  {key:<26} {value}"
+        old  = (baseline or {}).get(key)
+        if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            line += f"   (기준 {old}, {(value - old) / old * 100:+.1f}%)"
+        print(line)
+
+async def _run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    # 무거운 모듈(discord 등)은 인자 검사가 끝난 뒤 임포트(--help 를 빠르게)
+    from bench.fake_discord import TransportProfile
+    from bench.scenarios    import REPLAY_START, bench_dispatch, bench_hourly_fire, bench_replay, bench_toggle_storm
+    from module.bot_factory import KST
+
+    profile = TransportProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_5xx_rate=args.error_rate,
+        error_429_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    selected = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results: Dict[str, Dict[str, Any]] = {}
+    if "fire" in selected:
+        results["fire"] = await bench_hourly_fire(
+            args.subscribers, args.guilds, profile,
+            backend=args.backend, concurrency=args.concurrency, memory=args.memory, message_mode=args.message_mode,
+        )
+    if "dispatch" in selected:
+        results["dispatch"] = await bench_dispatch(
+            args.messages, args.channels, profile, concurrency=args.concurrency, memory=args.memory,
+        )
+    if "toggle" in selected:
+        results["toggle"] = await bench_toggle_storm(
+            args.users, args.clicks, backend=args.backend, seed=args.seed, memory=args.memory, spammers=args.spammers,
+        )
+    if "replay" in selected:
+        start = args.start or REPLAY_START
+        results["replay"] = await bench_replay(
+            args.days, args.replay_subscribers, args.replay_guilds, profile,
+            start=start if start.tzinfo else start.replace(tzinfo=KST),
+            backend=args.backend, concurrency=args.concurrency, trace_path=args.trace, memory=args.memory,
+            message_mode=args.message_mode,
+        )
+    return results
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    from module.logger import setup_logger
+    setup_logger("INFO" if args.verbose else "ERROR")   # 429 재시도 경고는 결과 표에 집계
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+
+    # get_app_dir() 는 sys.argv[0] 기준 → 임시 디렉터리를 앱 디렉터리로 지정해 상태 파일을 격리
+    workdir = Path(tempfile.mkdtemp(prefix="alertbot-bench-"))
+    (workdir / "config").mkdir()
+    sys.argv[0] = str(workdir / "bench.py")
+    try:
+        results = asyncio.run(_run(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, report in results.items():
+        _print_report(name, report, baseline.get(name))
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
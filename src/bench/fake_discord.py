@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import itertools
+import random
+import discord
+
+from collections            import deque
+from dataclasses            import dataclass
+from typing                 import (
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.expiry_engine   import DISCORD_EPOCH_MS
+
+# --------------------------------------
+# 가짜 디스코드 전송 계층(지연/오류/레이트리밋 주입)
+# --------------------------------------
+LIBRARY_TRIES: int                  = 5                             # discord.py HTTPClient 요청당 시도 수
+LIBRARY_RETRY_STATUSES: Set[int]    = {500, 502, 504, 524}          # HTTPClient 가 재시도하는 5xx
+
+@dataclass
+class TransportProfile:
+    """가짜 서버의 응답 특성"""
+    latency_ms: float                   = 50.0          # API 호출 1건의 기본 지연
+    jitter_ms: float                    = 20.0          # 지연 편차(균등 분포 ±)
+    error_5xx_rate: float               = 0.0           # 임의 5xx 비율(0~1)
+    error_429_rate: float               = 0.0           # 버킷과 무관한 임의 429 비율(공유 IP 등 외부 요인 흉내)
+    channel_limit: Tuple[int, float]    = (5, 5.0)      # (라우트, 채널)당 (요청 수, 창 길이 초) — 넘으면 429
+    global_limit: Tuple[int, float]     = (50, 1.0)     # 봇 전역 (요청 수, 창 길이 초)
+    seed: int                           = 0
+
+@dataclass
+class Delivery:
+    """가짜 서버가 받은 메시지 1건"""
+    channel_id: int
+    guild_id: int
+    at: float           # epoch 초(서버 clock 기준)
+    content: str
+    message_id: int
+    edited: bool        = False     # 새 메시지가 아니라 기존 메시지 수정
+
+class FakeResponse:
+    """discord.HTTPException 생성용 응답 객체(status/reason/headers 만 사용)"""
+    def __init__(self, status: int, reason: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.status     = status
+        self.reason     = reason
+        self.headers    = headers or {}
+
+class FakeDiscord:
+    """
+    채널/길드/메시지를 메모리에 두는 가짜 서버.
+    - 모든 호출은 request() 를 거쳐 지연 → 임의 오류 → 슬라이딩 윈도 레이트리밋 순으로 판정
+      (discord.py HTTPClient 의 내부 재시도까지 흉내 → 클라이언트에는 재시도 소진 후의 오류만 보임)
+    - 성공한 전송/수정은 deliveries 에 (채널, 시각, 본문)으로 기록 → 발사-전달 지연 계산용
+    - 살아 있는 메시지 ID 를 기억 → 지워진 메시지를 수정하면 404(Unknown Message)
+    - 지연/레이트리밋 창/기록 시각은 clock 기준(SimulatedClock 이면 가상 시간)
+    """
+    def __init__(self, profile: Optional[TransportProfile] = None, clock: Clock = SYSTEM_CLOCK) -> None:
+        self.profile: TransportProfile                          = profile or TransportProfile()
+        self.clock: Clock                                       = clock
+        self._rng                                               = random.Random(self.profile.seed)
+        self._seq                                               = itertools.count()
+        self._windows: Dict[Tuple[str, int], Deque[float]]      = {}
+        self._global: Deque[float]                              = deque()
+        self.guilds: Dict[int, FakeGuild]                       = {}
+        self.channels: Dict[int, FakeChannel]                   = {}
+        self.deliveries: List[Delivery]                         = []
+        self.messages: Set[int]                                 = set()     # 삭제되지 않은 메시지 ID
+        self.edits: int                                         = 0
+        self.requests: int                                      = 0
+        self.deleted: int                                       = 0
+        self.injected_5xx: int                                  = 0
+        self.injected_429: int                                  = 0
+        self.limited_429: int                                   = 0     # 레이트리밋 초과로 돌려준 429
+        self.library_retries: int                               = 0     # 라이브러리(HTTPClient) 흉내 재시도 수
+        self.in_flight: int                                     = 0
+
+    # ----- 구성 -----
+    def add_guild(self, guild_id: int, channel_ids: Iterable[int]) -> "FakeGuild":
+        guild = self.guilds[guild_id] = FakeGuild(self, guild_id)
+        for channel_id in channel_ids:
+            self.channels[channel_id] = FakeChannel(self, channel_id, guild)
+        return guild
+
+    def next_id(self) -> int:
+        """clock 기준 스노플레이크(생성 시각이 ID 에 들어 있어야 만료 엔진이 bulk-delete 대상으로 판정)"""
+        millis = int(self.clock.time() * 1000) - DISCORD_EPOCH_MS
+        return (millis << 22) | (next(self._seq) & 0x3FFFFF)
+
+    # ----- 요청 판정 -----
+    def _window_full(self, window: Deque[float], limit: Tuple[int, float], now: float) -> float:
+        """창이 가득 찼으면 다음 자리가 날 때까지 남은 시간, 아니면 0"""
+        count, per = limit
+        while window and now - window[0] >= per:
+            window.popleft()
+        return per - (now - window[0]) if len(window) >= count else 0.0
+
+    @staticmethod
+    def _error(status: int, reason: str, headers: Optional[Dict[str, str]] = None) -> discord.HTTPException:
+        return discord.HTTPException(FakeResponse(status, reason, headers), {"message": reason, "code": 0})
+
+    async def request(self, route: str, key: int) -> None:
+        """
+        API 호출 1건. discord.py HTTPClient 처럼 429 는 retry_after 대기, 5xx(500/502/504/524)는
+        1 + 2·시도 초 대기 후 최대 LIBRARY_TRIES 번까지 스스로 재시도하고, 그래도 실패하면 discord 예외로 던진다
+        """
+        for tries in range(LIBRARY_TRIES):
+            try:
+                return await self._attempt(route, key)
+            except discord.HTTPException as e:
+                if tries + 1 >= LIBRARY_TRIES:
+                    raise
+                if e.status == 429:
+                    await self.clock.sleep(float(e.response.headers["Retry-After"]))
+                elif e.status in LIBRARY_RETRY_STATUSES:
+                    await self.clock.sleep(1 + tries * 2)
+                else:
+                    raise
+                self.library_retries += 1
+
+    async def _attempt(self, route: str, key: int) -> None:
+        """실제 요청 1회: 지연 → 임의 오류 → 슬라이딩 윈도 레이트리밋 순으로 판정"""
+        self.requests  += 1
+        self.in_flight += 1
+        try:
+            profile = self.profile
+            delay   = max(0.0, profile.latency_ms + self._rng.uniform(-profile.jitter_ms, profile.jitter_ms)) / 1000
+            await self.clock.sleep(delay)
+            if self._rng.random() < profile.error_5xx_rate:
+                self.injected_5xx += 1
+                raise self._error(502, "Bad Gateway")
+            if self._rng.random() < profile.error_429_rate:
+                self.injected_429 += 1
+                raise self._error(429, "Too Many Requests", {"Retry-After": "0.5", "X-RateLimit-Scope": "shared"})
+            now         = self.clock.monotonic()
+            window      = self._windows.setdefault((route, key), deque())
+            wait_global = self._window_full(self._global, profile.global_limit, now)
+            wait_route  = self._window_full(window, profile.channel_limit, now)
+            if wait_global or wait_route:
+                self.limited_429 += 1
+                headers = {"Retry-After": f"{max(wait_global, wait_route):.3f}"}
+                if wait_global:
+                    headers["X-RateLimit-Global"] = "true"
+                raise self._error(429, "Too Many Requests", headers)
+            window.append(now)
+            self._global.append(now)
+        finally:
+            self.in_flight -= 1
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", message_id: int, content: str) -> None:
+        self.channel    = channel
+        self.id         = message_id
+        self.content    = content
+
+    async def delete(self) -> None:
+        server = self.channel.server
+        await server.request("delete", self.channel.id)
+        server.messages.discard(self.id)
+        server.deleted += 1
+
+    async def edit(self, content: Optional[str] = None, **kwargs) -> "FakeMessage":
+        server = self.channel.server
+        await server.request("edit", self.channel.id)
+        if self.id not in server.messages:
+            raise discord.NotFound(FakeResponse(404, "Not Found"), {"message": "Unknown Message", "code": 10008})
+        if content is not None:
+            self.content = content
+        server.edits += 1
+        server.deliveries.append(Delivery(
+            self.channel.id, self.channel.guild.id if self.channel.guild else 0, server.clock.time(),
+            self.content, self.id, edited=True,
+        ))
+        return self
+
+class FakeChannel:
+    def __init__(self, server: FakeDiscord, channel_id: int, guild: Optional["FakeGuild"]) -> None:
+        self.server = server
+        self.id     = channel_id
+        self.guild  = guild
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> FakeMessage:
+        await self.server.request("send", self.id)
+        message = FakeMessage(self, self.server.next_id(), content or "")
+        self.server.messages.add(message.id)
+        self.server.deliveries.append(Delivery(
+            self.id, self.guild.id if self.guild else 0, self.server.clock.time(), message.content, message.id,
+        ))
+        return message
+
+    async def delete_messages(self, messages) -> None:
+        await self.server.request("delete", self.id)
+        self.server.messages.difference_update(getattr(m, "id", m) for m in messages)
+        self.server.deleted += len(messages)
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return FakeMessage(self, message_id, "")
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str) -> None:
+        self.id     = role_id
+        self.name   = name
+
+class FakeGuild:
+    def __init__(self, server: FakeDiscord, guild_id: int) -> None:
+        self.server                     = server
+        self.id                         = guild_id
+        self.roles: Dict[int, FakeRole] = {}
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self.roles.get(role_id)
+
+    async def create_role(self, name: str, **kwargs) -> FakeRole:
+        await self.server.request("role", self.id)
+        role_id = self.server.next_id()
+        role    = self.roles[role_id] = FakeRole(role_id, name)
+        return role
+
+class FakeHTTP:
+    """bot.http 중 역할 부여/회수만 흉내"""
+    def __init__(self, server: FakeDiscord) -> None:
+        self.server = server
+
+    async def add_role(self, guild_id: int, user_id: int, role_id: int, reason: Optional[str] = None) -> None:
+        await self.server.request("role", guild_id)
+
+    async def remove_role(self, guild_id: int, user_id: int, role_id: int, reason: Optional[str] = None) -> None:
+        await self.server.request("role", guild_id)
+
+@dataclass
+class FakeUser:
+    id: int
+    name: str = "bench-bot"
+
+    def __str__(self) -> str:
+        return self.name
+
+# --------------------------------------
+# Bot 에 섞어 쓰는 가짜 연결
+# --------------------------------------
+class FakeTransportMixin:
+    """
+    commands.Bot 의 get_channel/get_guild/guilds/user/http/create_dm 를 가짜 서버로 대체.
+    MRO 에서 ShutdownHookMixin 과 commands.Bot 사이에 둔다 → close() 는 종료 훅만 실행하고 실제 연결은 건드리지 않음
+    """
+    def attach(self, server: FakeDiscord) -> None:
+        self.server = server
+        self.http   = FakeHTTP(server)
+        self._dms: Dict[int, FakeChannel] = {}
+
+    @property
+    def user(self) -> FakeUser:
+        return FakeUser(id=1)
+
+    @property
+    def guilds(self) -> List[FakeGuild]:
+        return list(self.server.guilds.values())
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.server.channels.get(channel_id) or self._dms.get(channel_id)
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self.server.guilds.get(guild_id)
+
+    async def create_dm(self, user) -> FakeChannel:
+        await self.server.request("dm_open", 0)
+        channel = self._dms[user.id] = FakeChannel(self.server, self.server.next_id(), None)
+        return channel
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,489 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import dataclasses
+import datetime as dt
+import json
+import random
+import resource
+import shutil
+import threading
+import time
+import tracemalloc
+import discord
+
+from concurrent.futures     import ThreadPoolExecutor
+from dataclasses            import dataclass
+from pathlib                import Path
+from typing                 import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+from discord.ext            import commands
+from bench.fake_discord     import (
+    FakeDiscord,
+    FakeTransportMixin,
+    TransportProfile
+)
+from module.clock           import SimulatedClock
+from module.bot_factory     import (
+    KST,
+    ShutdownHookMixin,
+    setup_bot_commands
+)
+from module.dispatcher      import (
+    MessageDispatcher,
+    MessageJob,
+    PRIORITY_ALERT
+)
+from module.metrics         import METRICS
+from module.guild_registry  import (
+    GUILDS_DIR,
+    GuildConfig
+)
+from module.scheduler       import FireTrace
+from module.schedule_table  import (
+    DEFAULT_SCHEDULE,
+    EventSpec,
+    load_schedule
+)
+from module.subscription_manager import (
+    ALL_TYPE,
+    SubscriptionManager
+)
+from module.user_store      import save_subscriptions
+from module.utils           import get_state_dir
+
+BENCH_EVENT: str            = "on_time"     # 정각 알림 1회를 발사(구독자 전원이 수신 대상)
+REPLAY_START                = dt.datetime(2025, 3, 8, 21, 30, tzinfo=KST)  # 미국 DST 전환(3/9) 주간 → KST 는 영향 없어야 함
+REPLAY_DRAIN_SECONDS: float = 600.0         # 재생 끝 시각 이후 전송/삭제를 마저 처리하는 가상 시간
+
+# 시나리오 결과: 이름 → 값(숫자는 기준 결과와 비교 가능)
+Report = Dict[str, Any]
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """정렬 후 최근접 순위 백분위(q: 0~1). 값이 없으면 None"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000, 2)
+
+def _rss_mb() -> float:
+    """프로세스 최대 RSS(MB, 리눅스 ru_maxrss 는 KB)"""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+class MemoryProbe:
+    """tracemalloc 으로 시나리오 구간의 파이썬 힙 최대 사용량 측정(켜면 실행이 2~3배 느려짐)"""
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+
+    def __enter__(self) -> "MemoryProbe":
+        if self.enabled:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.enabled:
+            self.peak_mb = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+            tracemalloc.stop()
+
+    def report(self) -> Report:
+        result: Report = {"rss_max_mb": _rss_mb()}
+        if self.enabled:
+            result["heap_peak_mb"] = self.peak_mb
+        return result
+
+class BenchBot(ShutdownHookMixin, FakeTransportMixin, commands.Bot):
+    """실제 봇 구성(setup_bot_commands)을 가짜 서버에 연결한 Bot"""
+
+@dataclass(frozen=True)
+class BenchEvent(EventSpec):
+    """cron 대신 정해진 시각 1회만 발사하는 이벤트(벤치 시작 직후 발사)"""
+    fire_at: Optional[dt.datetime] = None
+
+    def next_fire_after(self, after: dt.datetime) -> dt.datetime:
+        return self.fire_at if after < self.fire_at else self.fire_at + dt.timedelta(days=1)
+
+def _bench_schedule(fire_at: dt.datetime, lead_seconds: float) -> List[EventSpec]:
+    """기본 스케줄의 키/템플릿을 그대로 쓰되 BENCH_EVENT 만 fire_at 에 발사(나머지는 하루 뒤)"""
+    return [
+        BenchEvent(**{
+            **{f.name: getattr(spec, f.name) for f in dataclasses.fields(EventSpec)},
+            "lead_seconds": lead_seconds,
+            "fire_at": fire_at if spec.key == BENCH_EVENT else fire_at + dt.timedelta(days=1),
+        })
+        for spec in DEFAULT_SCHEDULE
+    ]
+
+def _reset_state() -> None:
+    """시나리오 간 상태 파일(원장/삭제 대기/길드 설정) 공유 방지"""
+    state_dir = get_state_dir()
+    shutil.rmtree(state_dir, ignore_errors=True)
+    state_dir.mkdir(parents=True, exist_ok=True)
+
+def _seed_guilds(server: FakeDiscord, subscribers: int, guilds: int, backend: str, all_ratio: float, seed: int) -> int:
+    """길드 설정/구독 파일을 미리 만들어 registry.load() 가 읽게 한다. 채널 수 반환"""
+    rng       = random.Random(seed)
+    guild_dir = get_state_dir() / GUILDS_DIR
+    guild_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(guilds):
+        guild_id, channel_id = (index + 1) << 22, (index + 1) * 1000
+        server.add_guild(guild_id, [channel_id])
+        config = GuildConfig(guild_id=guild_id, channel_id=channel_id, retention_seconds=600)
+        (guild_dir / f"{guild_id}.json").write_text(json.dumps(dataclasses.asdict(config)), encoding="utf-8")
+        data: Dict[str, set] = {spec.key: set() for spec in DEFAULT_SCHEDULE}
+        data[ALL_TYPE] = set()
+        for user in range(index, subscribers, guilds):
+            data[ALL_TYPE if rng.random() < all_ratio else BENCH_EVENT].add(10 ** 17 + user)
+        save_subscriptions(config.subs_file, data, backend)
+    return guilds
+
+async def _wait_drained(server: FakeDiscord, after: float, timeout: float) -> None:
+    """after(epoch) 이후 전송이 시작되고 디스패처 대기열/처리 중 잡이 모두 비면 반환(지표 게이지로 확인)"""
+    queued, in_flight = METRICS.get("alertbot_queue_depth"), METRICS.get("alertbot_dispatch_in_flight")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        if time.time() > after and server.deliveries and not queued.value() and not in_flight.value():
+            return
+    raise TimeoutError(f"{timeout:.0f}s 안에 전송이 끝나지 않음(전송 {len(server.deliveries)}건)")
+
+# --------------------------------------
+# 시나리오
+# --------------------------------------
+async def bench_hourly_fire(
+        subscribers: int,
+        guilds: int,
+        profile: TransportProfile,
+        backend: str = "json",
+        concurrency: int = 8,
+        all_ratio: float = 0.7,
+        lead_seconds: float = 2.0,
+        timeout: float = 600.0,
+        memory: bool = False,
+        message_mode: str = "send"
+) -> Report:
+    """
+    정각 알림 1회 발사 → 모든 길드 채널 전송 완료까지.
+    실제 setup_bot_commands 구성(길드 레지스트리, 사전 렌더링, 발사 원장, 디스패처, 스케줄러)을 그대로 사용
+    """
+    _reset_state()
+    server = FakeDiscord(profile)
+    _seed_guilds(server, subscribers, guilds, backend, all_ratio, profile.seed)
+    with MemoryProbe(memory) as probe:
+        bot = BenchBot(command_prefix="#", intents=discord.Intents.default())
+        bot.attach(server)
+        fire_at = (dt.datetime.now(tz=KST) + dt.timedelta(seconds=lead_seconds + 1.0)).replace(microsecond=0)
+        setup_bot_commands(
+            bot, "bench", 0, 0, 600,
+            subscription_backend=backend,
+            schedule=_bench_schedule(fire_at, lead_seconds),
+            dispatch_concurrency=concurrency,
+            alert_message_mode=message_mode,
+        )
+        started = time.perf_counter()
+        await bot.on_ready()
+        setup_seconds = time.perf_counter() - started
+        try:
+            await _wait_drained(server, fire_at.timestamp(), timeout)
+        finally:
+            await bot.close()
+
+    fire_ts    = fire_at.timestamp()
+    deliveries = [d for d in server.deliveries if d.at >= fire_ts]
+    latencies  = [d.at - fire_ts for d in deliveries]
+    first_by_guild: Dict[int, float] = {}
+    for d in deliveries:
+        first_by_guild.setdefault(d.guild_id, d.at - fire_ts)
+    window     = (max(d.at for d in deliveries) - fire_ts) if deliveries else 0.0
+    return {
+        "subscribers": subscribers,
+        "guilds": guilds,
+        "messages": sum(1 for d in deliveries if not d.edited),
+        "edits": sum(1 for d in deliveries if d.edited),
+        "mentions": sum(d.content.count("<@") for d in deliveries),
+        "setup_s": round(setup_seconds, 3),
+        "fire_to_delivery_p50_ms": _ms(percentile(latencies, 0.5)),
+        "fire_to_delivery_p99_ms": _ms(percentile(latencies, 0.99)),
+        "first_chunk_p99_ms": _ms(percentile(list(first_by_guild.values()), 0.99)),
+        "last_delivery_s": round(window, 3),
+        "throughput_msg_s": round(len(deliveries) / window, 1) if window else None,
+        "server_429": server.limited_429 + server.injected_429,
+        "server_5xx": server.injected_5xx,
+        "library_retries": server.library_retries,
+        "requests": server.requests,
+        **probe.report(),
+    }
+
+async def bench_dispatch(
+        messages: int,
+        channels: int,
+        profile: TransportProfile,
+        concurrency: int = 8,
+        timeout: float = 600.0,
+        memory: bool = False
+) -> Report:
+    """디스패처 단독: 여러 채널에 메시지 N개 적재 → 전부 처리될 때까지 처리량/지연"""
+    server = FakeDiscord(profile)
+    server.add_guild(1 << 22, [1000 + i for i in range(channels)])
+    bot = BenchBot(command_prefix="#", intents=discord.Intents.default())
+    bot.attach(server)
+    latencies: List[float] = []
+    results = {"ok": 0, "failed": 0}
+
+    def on_result(enqueued: float):
+        def done(ok: bool) -> None:
+            results["ok" if ok else "failed"] += 1
+            if ok:
+                latencies.append(time.perf_counter() - enqueued)
+        return done
+
+    with MemoryProbe(memory) as probe:
+        dispatcher = MessageDispatcher(bot, concurrency=concurrency)
+        dispatcher.start(worker_count=concurrency)
+        started = time.perf_counter()
+        await dispatcher.enqueue_many([
+            MessageJob(channel_id=1000 + i % channels, content=f"bench {i}", priority=PRIORITY_ALERT, on_result=on_result(started))
+            for i in range(messages)
+        ])
+        try:
+            await asyncio.wait_for(dispatcher.queue.join(), timeout=timeout)
+        finally:
+            elapsed = time.perf_counter() - started
+            await dispatcher.stop()
+
+    stats = dispatcher.stats
+    return {
+        "messages": messages,
+        "channels": channels,
+        "sent": results["ok"],
+        "failed": results["failed"],
+        "elapsed_s": round(elapsed, 3),
+        "throughput_msg_s": round(results["ok"] / elapsed, 1) if elapsed else None,
+        "latency_p50_ms": _ms(percentile(latencies, 0.5)),
+        "latency_p99_ms": _ms(percentile(latencies, 0.99)),
+        "client_429": stats.rate_limited,
+        "retries_5xx": stats.server_errors,
+        "library_retries": server.library_retries,
+        "rate_limit_wait_s": round(stats.rate_limit_wait, 3),
+        **probe.report(),
+    }
+
+async def bench_toggle_storm(
+        users: int,
+        clicks: int,
+        backend: str = "json",
+        burst: int = 500,
+        seed: int = 0,
+        memory: bool = False,
+        spammers: int = 0
+) -> Report:
+    """
+    클릭 폭주: users 명 중 무작위로 clicks 번 토글(burst 개씩 동시에) → 토글 지연 + 마지막 저장까지 시간.
+    spammers > 0 이면 클릭의 절반을 그 수만큼의 사용자가 연타(사용자별 한도로 거절된 수는 throttled)
+    """
+    rng       = random.Random(seed)
+    types     = [spec.key for spec in DEFAULT_SCHEDULE] + [ALL_TYPE]
+    latencies: List[float] = []
+
+    async def click(user_id: int, sub_type: str) -> None:
+        started = time.perf_counter()
+        await manager.toggle(user_id, sub_type)
+        latencies.append(time.perf_counter() - started)
+
+    def pick_user() -> int:
+        if spammers and rng.random() < 0.5:
+            return 10 ** 17 + users + rng.randrange(spammers)
+        return 10 ** 17 + rng.randrange(users)
+
+    with MemoryProbe(memory) as probe:
+        manager = SubscriptionManager(f"bench_toggle.{backend}.json", backend=backend)
+        started = time.perf_counter()
+        for offset in range(0, clicks, burst):
+            await asyncio.gather(*(
+                click(pick_user(), rng.choice(types))
+                for _ in range(min(burst, clicks - offset))
+            ))
+        toggled = time.perf_counter() - started
+        await manager.flush()
+        persisted = time.perf_counter() - started
+
+    return {
+        "users": users,
+        "clicks": clicks,
+        "backend": backend,
+        "toggle_p50_ms": _ms(percentile(latencies, 0.5)),
+        "toggle_p99_ms": _ms(percentile(latencies, 0.99)),
+        "clicks_per_s": round(clicks / toggled, 1) if toggled else None,
+        "persisted_s": round(persisted, 3),
+        "subscribed_users": len(manager.subscribers_of(BENCH_EVENT)),
+        "throttled": manager.throttle.rejected,
+        **probe.report(),
+    }
+
+# --------------------------------------
+# 스케줄 재생(가속 시뮬레이션 시계)
+# --------------------------------------
+class _TrackingExecutor(ThreadPoolExecutor):
+    """to_thread 작업 수를 세는 기본 실행기 → 파일 저장이 끝나기 전에는 시뮬레이션 시계가 시간을 건너뛰지 않음"""
+    def __init__(self) -> None:
+        super().__init__(thread_name_prefix="bench")
+        self._lock              = threading.Lock()
+        self.pending: int       = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            self.pending += 1
+        future = super().submit(fn, *args, **kwargs)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+def expected_slots(schedule: Sequence[EventSpec], start: dt.datetime, end: dt.datetime) -> List[Tuple[str, dt.datetime]]:
+    """
+    next_fire_after 와 독립적으로 분 단위 전수 조사한 기대 발사 목록((이벤트 키, 시각), 시각 순).
+    시작 직전 허용치(max(90초, deadline)) 안에 지난 발사는 스케줄러가 따라잡으므로 포함
+    """
+    tolerance = max(max(90.0, spec.deadline_seconds) for spec in schedule)
+    minute    = (start - dt.timedelta(seconds=tolerance)).replace(second=0, microsecond=0)
+    slots: List[Tuple[str, dt.datetime]] = []
+    while minute <= end:
+        for spec in schedule:
+            horizon = start - dt.timedelta(seconds=max(90.0, spec.deadline_seconds))
+            if (
+                minute > horizon
+                and minute.minute in spec.minutes
+                and minute.hour in spec.hours
+                and minute.weekday() in spec.weekdays
+            ):
+                slots.append((spec.key, minute))
+        minute += dt.timedelta(minutes=1)
+    return slots
+
+def _trace_rows(traces: List[FireTrace], server: FakeDiscord) -> List[Dict[str, Any]]:
+    """발사 기록마다 그 뒤(다음 발사 전까지) 서버에 도착한 메시지/멘션을 붙인 추적 행"""
+    fired_at = [t.fired.timestamp() for t in traces]
+    rows = [
+        {
+            "event": t.event,
+            "scheduled": t.scheduled.isoformat(),
+            "fired": t.fired.isoformat(timespec="milliseconds"),
+            "lateness_ms": round(t.lateness * 1000, 3),
+            "missed": t.missed,
+            "messages": 0,
+            "edits": 0,
+            "mentions": 0,
+            "delivered_ms": None,
+        }
+        for t in traces
+    ]
+    for d in server.deliveries:
+        index = bisect.bisect_right(fired_at, d.at) - 1
+        if index < 0:
+            continue
+        row = rows[index]
+        row["edits" if d.edited else "messages"] += 1
+        row["mentions"]    += d.content.count("<@")
+        row["delivered_ms"] = round((d.at - traces[index].scheduled.timestamp()) * 1000, 1)
+    return rows
+
+async def bench_replay(
+        days: float,
+        subscribers: int,
+        guilds: int,
+        profile: TransportProfile,
+        start: dt.datetime = REPLAY_START,
+        backend: str = "json",
+        concurrency: int = 8,
+        schedule: Optional[List[EventSpec]] = None,
+        trace_path: Optional[str] = None,
+        memory: bool = False,
+        message_mode: str = "send"
+) -> Report:
+    """
+    SimulatedClock 으로 days 일치 스케줄을 가상 시간에 재생(가짜 서버 지연/레이트리밋도 가상 시간).
+    실제 setup_bot_commands 구성을 그대로 쓰고, 발사 기록(FireTrace)을 기대 발사 목록과 대조한다.
+    trace_path 가 있으면 발사별 추적을 JSON Lines 로 저장
+    """
+    _reset_state()
+    schedule = list(schedule or load_schedule(None))
+    end      = start + dt.timedelta(days=days)
+    executor = _TrackingExecutor()
+    asyncio.get_running_loop().set_default_executor(executor)
+    clock    = SimulatedClock(start, busy=lambda: executor.pending > 0)
+    server   = FakeDiscord(profile, clock=clock)
+    traces: List[FireTrace] = []
+    _seed_guilds(server, subscribers, guilds, backend, 0.7, profile.seed)
+
+    with MemoryProbe(memory) as probe:
+        bot = BenchBot(command_prefix="#", intents=discord.Intents.default())
+        bot.attach(server)
+        setup_bot_commands(
+            bot, "bench", 0, 0, 600,
+            subscription_backend=backend,
+            schedule=schedule,
+            dispatch_concurrency=concurrency,
+            clock=clock,
+            fire_listener=traces.append,
+            alert_message_mode=message_mode,
+        )
+        started = time.perf_counter()
+        await bot.on_ready()
+        try:
+            await clock.run_until(end.timestamp() + REPLAY_DRAIN_SECONDS)
+        finally:
+            await bot.close()
+        wall = time.perf_counter() - started
+
+    traces   = [t for t in traces if t.scheduled <= end]
+    rows     = _trace_rows(traces, server)
+    if trace_path:
+        with Path(trace_path).open("w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    expected = expected_slots(schedule, start, end)
+    fired    = [(t.event, t.scheduled) for t in traces]
+    counts: Dict[Tuple[str, dt.datetime], int] = {}
+    for slot in fired:
+        counts[slot] = counts.get(slot, 0) + 1
+    delivered = [r["delivered_ms"] / 1000 for r in rows if r["delivered_ms"] is not None]
+    lateness  = [t.lateness for t in traces if not t.missed]
+    return {
+        "days": days,
+        "start": start.isoformat(),
+        "subscribers": subscribers,
+        "guilds": guilds,
+        "expected_fires": len(expected),
+        "fires": len(traces),
+        "missing": len(set(expected) - set(counts)),
+        "unexpected": len(set(counts) - set(expected)),
+        "duplicates": sum(n - 1 for n in counts.values() if n > 1),
+        "missed": sum(1 for t in traces if t.missed),
+        "midnight_fires": sum(1 for t in traces if t.scheduled.hour == 0 and t.scheduled.minute == 0),
+        "lateness_max_ms": _ms(max(lateness)) if lateness else None,
+        "fire_to_delivery_p50_ms": _ms(percentile(delivered, 0.5)),
+        "fire_to_delivery_p99_ms": _ms(percentile(delivered, 0.99)),
+        "message_mode": message_mode,
+        "messages": sum(1 for d in server.deliveries if not d.edited),
+        "edits": server.edits,
+        "mentions": sum(d.content.count("<@") for d in server.deliveries),
+        "deleted": server.deleted,
+        "requests": server.requests,
+        "server_429": server.limited_429 + server.injected_429,
+        "sim_steps": clock.steps,
+        "wall_s": round(wall, 3),
+        "speedup": round((end.timestamp() + REPLAY_DRAIN_SECONDS - start.timestamp()) / wall) if wall else None,
+        **probe.report(),
+    }
@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# tests/ 에서 `module` 패키지를 임포트할 수 있도록 src 를 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    """get_state_dir() 가 임시 디렉터리/config 를 가리키도록 sys.argv[0] 을 바꾼다"""
+    (tmp_path / "config").mkdir()
+    monkeypatch.setattr(sys, "argv", [str(tmp_path / "main.py")])
+    return tmp_path / "config"
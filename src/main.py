@@ -1,29 +1,51 @@
-import sys
-import logging
-from module.logger         import setup_logger
-from module.utils          import get_app_dir
-from module.config_loader  import ConfigLoader
-from module.bot_factory    import create_bot, setup_bot_commands
-
-def main() -> None:
-    setup_logger()
-    app_dir         = get_app_dir()
-    config_path     = app_dir / "config" / "Config.json"
-
-    try:
-        config                      = ConfigLoader(config_path)
-        token                       = config.get("TOKEN")
-        channel_id                  = config.get("DEFAULT_CHANNEL_ID")
-        test_role_name              = config.get("TEST_ROLE_NAME")
-        debug_channel_id            = config.get("DEBUG_CHANNEL_ID")
-        message_retention_seconds   = config.get("MESSAGE_RETENTION_SECONDS")
-    except Exception as e:
-        logging.error(f"설정 파일 로드 실패: {e}")
-        sys.exit(1)
-
-    bot = create_bot()
-    setup_bot_commands(bot, test_role_name, channel_id, debug_channel_id, message_retention_seconds)
-    bot.run(token)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import time
+PROCESS_START = time.perf_counter()     # 콜드 스타트 측정 기준(다른 임포트보다 먼저)
+
+import sys
+import logging
+from module.logger         import setup_logger
+from module.utils          import get_state_dir
+from module.startup        import StartupProfile, PROFILE_STARTUP_FLAG
+from module.config_loader  import ConfigLoader
+
+def main() -> None:
+    profile         = StartupProfile(PROCESS_START, exit_after_ready=PROFILE_STARTUP_FLAG in sys.argv[1:])
+    profile.record("imports", time.perf_counter() - PROCESS_START)
+    setup_logger()
+    config_path     = get_state_dir() / "Config.json"
+
+    try:
+        with profile.phase("config"):
+            config      = ConfigLoader(config_path)
+            settings    = config.snapshot   # 1회 파싱 + 타입/범위 검증(이후 변경은 mtime 감시로 재적재)
+    except Exception as e:
+        logging.error(f"설정 파일 로드 실패: {e}")
+        sys.exit(1)
+    if (settings.log_format, settings.log_level) != ("text", "INFO"):
+        setup_logger(settings.log_level, settings.log_format)
+
+    # discord.py 등 무거운 의존성은 설정 검증이 끝난 뒤에 읽는다(설정 오류면 바로 종료)
+    with profile.phase("bot_imports"):
+        from module.bot_factory import create_bot, setup_bot_commands
+
+    with profile.phase("setup"):
+        bot = create_bot(shard_plan=settings.shard_plan, startup=profile)
+        setup_bot_commands(
+            bot, settings.test_role_name, settings.default_channel_id, settings.debug_channel_id,
+            settings.message_retention_seconds,
+            subscription_backend=settings.subscription_backend,
+            alert_lead_seconds=settings.alert_lead_seconds,
+            schedule=list(settings.schedule),
+            dispatch_concurrency=settings.dispatch_concurrency,
+            shard_plan=settings.shard_plan,
+            mention_mode=settings.mention_mode,
+            alert_message_mode=settings.alert_message_mode,
+            config_loader=config,
+            metrics_port=settings.metrics_port,
+            metrics_host=settings.metrics_host,
+        )
+    # discord.py 기본 stderr 핸들러 대신 루트 로거(큐 파이프라인)로 전달
+    bot.run(settings.token, log_handler=None)
+
+if __name__ == "__main__":
+    main()
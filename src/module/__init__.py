@@ -4,15 +4,27 @@
 - 이 파일은 디렉터리를 '패키지'로 인식시키고, 외부에서 사용할 공개 API를 정리합니다.
 - 무거운 작업(스케줄 시작, 네트워크/파일 IO 등)은 절대 수행하지 않습니다.  # 사이드이펙트 금지
 - 각 모듈의 책임은 아래 표와 동일하며, 여기서는 경량 re-export 만 제공합니다.
+- re-export 는 지연 임포트: 이름을 처음 사용할 때 해당 하위 모듈만 읽습니다.
 
 공개 API(요약)
 - main     : (엔트리포인트는 별도 파일 main.py)
-- config   : ConfigLoader
-- bot      : create_bot, setup_bot_commands, MessageDispatcher, SubscriptionManager
-- store    : load_subscriptions, save_subscriptions
-- alerts   : create_hourly_check_message, create_hourly_5min_message, create_hourly_3min_message
-- utils    : get_app_dir
-- logging  : setup_logger
+- config   : ConfigLoader, BotConfig
+- bot      : create_bot, setup_bot_commands, AlertBot, MessageDispatcher, MessageJob, MessageOutbox,
+             LiveMessageStore
+- limits   : RouteRateLimiter, WindowBucket
+- subs     : SubscriptionManager, SUB_TYPES, TYPE_BITS, DM_PREF, build_type_bits
+- dm       : DirectMessageSender
+- guilds   : GuildRegistry, GuildConfig, ShardPlan, parse_shard_plan, RoleSyncQueue
+- schedule : AlertScheduler, FireTrace, EventSpec, load_schedule, DEFAULT_SCHEDULE, FireLedger
+- clock    : Clock, SystemClock, SimulatedClock, SYSTEM_CLOCK
+- store    : load_subscriptions, save_subscriptions, open_subscription_store, migrate_json_to_sqlite,
+             SubscriptionStore, SubscriptionJournal, SqliteSubscriptionStore
+- alerts   : create_hourly_check_message, create_hourly_5min_message, create_hourly_3min_message,
+             render_mention_chunks, PreparedAlert, DISCORD_MESSAGE_LIMIT
+- utils    : get_app_dir, get_state_dir
+- startup  : StartupProfile
+- logging  : setup_logger, stop_logger, JsonFormatter, RateLimitFilter
+- metrics  : METRICS, MetricsRegistry, MetricsServer, LoopMonitor
 
 예시 사용:
     from module import (
@@ -26,31 +38,142 @@
 
 from __future__ import annotations
 
-# 표의 역할에 맞춘 경량 re-export (정적 분석/자동완성 품질 향상)
-from .config_loader   import ConfigLoader
-from .bot_factory     import (
-    create_bot,
-    setup_bot_commands,
-    MessageDispatcher,     # 메시지 큐/재시도/자동삭제 디스패처
-    SubscriptionManager,   # 구독 토글/저장 관리자
-)
-from .user_store      import load_subscriptions, save_subscriptions
-from .alert_service   import (
-    create_hourly_check_message,
-    create_hourly_5min_message,
-    create_hourly_3min_message,
-)
-from .utils           import get_app_dir
-from .logger          import setup_logger
+import importlib
+
+from typing import TYPE_CHECKING, Any, Dict
+
+# 공개 이름 → 정의된 하위 모듈. 처음 접근할 때 그 모듈만 임포트(PEP 562)
+# → `import module.config_loader` 등이 discord 같은 무거운 의존성을 끌고 오지 않음(콜드 스타트 단축)
+_EXPORTS: Dict[str, str] = {
+    "ConfigLoader": "config_loader", "BotConfig": "config_loader",
+    "create_bot": "bot_factory", "setup_bot_commands": "bot_factory", "AlertBot": "bot_factory",
+    "ShardedAlertBot": "bot_factory",
+    "MessageDispatcher": "dispatcher", "MessageJob": "dispatcher",
+    "MessageOutbox": "outbox",
+    "LiveMessageStore": "live_messages",
+    "RouteRateLimiter": "rate_limiter", "WindowBucket": "rate_limiter",
+    "SubscriptionManager": "subscription_manager", "SUB_TYPES": "subscription_manager",
+    "TYPE_BITS": "subscription_manager", "DM_PREF": "subscription_manager",
+    "build_type_bits": "subscription_manager",
+    "DirectMessageSender": "dm_delivery",
+    "GuildRegistry": "guild_registry", "GuildConfig": "guild_registry",
+    "ShardPlan": "sharding", "parse_shard_plan": "sharding",
+    "RoleSyncQueue": "role_sync",
+    "AlertScheduler": "scheduler", "FireTrace": "scheduler",
+    "Clock": "clock", "SystemClock": "clock", "SimulatedClock": "clock", "SYSTEM_CLOCK": "clock",
+    "FireLedger": "fire_ledger",
+    "EventSpec": "schedule_table", "load_schedule": "schedule_table", "DEFAULT_SCHEDULE": "schedule_table",
+    "load_subscriptions": "user_store", "save_subscriptions": "user_store",
+    "open_subscription_store": "user_store", "migrate_json_to_sqlite": "user_store",
+    "SubscriptionStore": "user_store", "SubscriptionJournal": "user_store",
+    "SqliteSubscriptionStore": "user_store",
+    "create_hourly_check_message": "alert_service", "create_hourly_5min_message": "alert_service",
+    "create_hourly_3min_message": "alert_service", "render_mention_chunks": "alert_service",
+    "PreparedAlert": "alert_service", "DISCORD_MESSAGE_LIMIT": "alert_service",
+    "get_app_dir": "utils", "get_state_dir": "utils",
+    "StartupProfile": "startup",
+    "setup_logger": "logger", "stop_logger": "logger", "JsonFormatter": "logger",
+    "RateLimitFilter": "logger",
+    "METRICS": "metrics", "MetricsRegistry": "metrics", "MetricsServer": "metrics",
+    "LoopMonitor": "loop_monitor",
+}
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value     # 다음 접근부터는 일반 속성 조회
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+if TYPE_CHECKING:
+    # 표의 역할에 맞춘 re-export (정적 분석/자동완성용, 실행 시에는 위의 지연 임포트)
+    from .config_loader   import ConfigLoader, BotConfig   # 검증된 설정 스냅샷
+    from .bot_factory     import (
+        create_bot,
+        setup_bot_commands,
+        AlertBot,              # 종료 훅 지원 Bot
+        ShardedAlertBot,       # 샤드 모드(AutoShardedBot)
+        MessageDispatcher,     # 메시지 큐/재시도/자동삭제 디스패처
+        MessageJob,
+    )
+    from .outbox          import MessageOutbox   # 디스패처 영속 큐(최소 1회 전송, 멱등 키)
+    from .live_messages   import LiveMessageStore   # 수정 모드 상태 메시지 ID 기록
+    from .rate_limiter    import RouteRateLimiter, WindowBucket
+    from .subscription_manager import (
+        SubscriptionManager,   # 구독 토글/저장 관리자(비트 플래그 + 수신자 인덱스)
+        SUB_TYPES,
+        TYPE_BITS,
+        DM_PREF,               # 수신 방식(DM) 선호 키
+        build_type_bits,
+    )
+    from .dm_delivery     import DirectMessageSender  # DM 알림 전송(워커 풀 + 채널/차단 캐시)
+    from .guild_registry  import (
+        GuildRegistry,         # 길드별 채널/보존시간/구독 네임스페이스
+        GuildConfig,
+    )
+    from .sharding        import ShardPlan, parse_shard_plan
+    from .role_sync       import RoleSyncQueue   # 역할 멘션 모드(구독 ↔ 관리 역할 동기화)
+    from .scheduler       import AlertScheduler, FireTrace
+    from .clock           import (
+        Clock,                 # 스케줄러/만료 타이머/레이트리밋/워치독 공용 시계
+        SystemClock,
+        SimulatedClock,        # 가속 재생용 이산 사건 시계
+        SYSTEM_CLOCK,
+    )
+    from .fire_ledger     import FireLedger   # 재시작 안전 발사 원장
+    from .schedule_table  import (
+        EventSpec,             # ALERT_SCHEDULE 한 항목(키/라벨/템플릿/cron 시각)
+        load_schedule,
+        DEFAULT_SCHEDULE,
+    )
+    from .user_store      import (
+        load_subscriptions,
+        save_subscriptions,
+        open_subscription_store,    # 백엔드 선택("json" | "sqlite")
+        migrate_json_to_sqlite,     # JSON → SQLite 1회 이관
+        SubscriptionStore,
+        SubscriptionJournal,
+        SqliteSubscriptionStore,
+    )
+    from .alert_service   import (
+        create_hourly_check_message,
+        create_hourly_5min_message,
+        create_hourly_3min_message,
+        render_mention_chunks,          # 2000자 제한 분할
+        PreparedAlert,
+        DISCORD_MESSAGE_LIMIT,
+    )
+    from .utils           import get_app_dir, get_state_dir
+    from .startup         import StartupProfile   # 콜드 스타트 단계별 시간(--profile-startup)
+    from .logger          import (
+        setup_logger,          # 큐 기반 비동기 로깅(백그라운드 포맷/출력)
+        stop_logger,
+        JsonFormatter,
+        RateLimitFilter,       # 반복 경고 샘플링
+    )
+    from .metrics         import METRICS, MetricsRegistry, MetricsServer   # 지표 레지스트리 / /metrics 엔드포인트
+    from .loop_monitor    import LoopMonitor   # 루프 지연 백분위/블로킹 감지/발사 창 부하 차단
 
 # 외부에 노출할 심볼만 명시
 __all__: list[str] = [
-    "ConfigLoader",
-    "create_bot", "setup_bot_commands",
-    "MessageDispatcher", "SubscriptionManager",
-    "load_subscriptions", "save_subscriptions",
+    "ConfigLoader", "BotConfig",
+    "create_bot", "setup_bot_commands", "AlertBot", "ShardedAlertBot",
+    "MessageDispatcher", "MessageJob", "MessageOutbox", "LiveMessageStore", "RouteRateLimiter", "WindowBucket",
+    "SubscriptionManager", "SUB_TYPES", "TYPE_BITS", "DM_PREF", "build_type_bits",
+    "DirectMessageSender",
+    "GuildRegistry", "GuildConfig", "ShardPlan", "parse_shard_plan", "RoleSyncQueue",
+    "AlertScheduler", "FireTrace", "Clock", "SystemClock", "SimulatedClock", "SYSTEM_CLOCK",
+    "EventSpec", "load_schedule", "DEFAULT_SCHEDULE", "FireLedger",
+    "load_subscriptions", "save_subscriptions", "open_subscription_store", "migrate_json_to_sqlite",
+    "SubscriptionStore", "SubscriptionJournal", "SqliteSubscriptionStore",
     "create_hourly_check_message", "create_hourly_5min_message", "create_hourly_3min_message",
-    "get_app_dir", "setup_logger",
+    "render_mention_chunks", "PreparedAlert", "DISCORD_MESSAGE_LIMIT",
+    "get_app_dir", "get_state_dir", "StartupProfile", "setup_logger", "stop_logger", "JsonFormatter", "RateLimitFilter",
+    "METRICS", "MetricsRegistry", "MetricsServer", "LoopMonitor",
 ]
 
 # 패키지 버전 (필요 시 CI에서 자동 주입 가능)
@@ -1,28 +1,132 @@
-import datetime
-from typing import List
-
-def create_hourly_5min_message(timestamp: datetime.datetime, mention_ids: List[int]) -> str:
-    next_hour = (timestamp.hour + 1) % 24
-    mentions = " ".join(f"<@{user_id}>" for user_id in mention_ids)
-    return (
-        f"⏰인간, 허접~ 결계도 까먹음. 어쩔? 결계는 가야됨 인정? 🗡️\n"
-        f"**불길한 소환의 결계 5분 전 알림!**\n"
-        f"{mentions}\n"
-    )
-
-def create_hourly_3min_message(timestamp: datetime.datetime, mention_ids: List[int]) -> str:
-    next_hour = (timestamp.hour + 1) % 24
-    mentions = " ".join(f"<@{user_id}>" for user_id in mention_ids)
-    return (
-        f"⏰인간, 허접~ 결계도 까먹음. 어쩔? 결계는 가야됨 인정? 🗡️\n"
-        f"**불길한 소환의 결계 3분 전 알림!**\n"
-        f"> 시간: {next_hour}시 정각 발생 (약 2분 내 보스 소환)\n"
-        f"{mentions}\n"
-    )
-
-def create_hourly_check_message(timestamp: datetime.datetime, mention_ids: List[int]) -> str:
-    mentions = " ".join(f"<@{user_id}>" for user_id in mention_ids)
-    return (
-        f"🤪 허접 인간, 안가고 뭐하심? 🗡️\n"
-        f"{mentions}\n"
-    )
\ No newline at end of file
+import datetime
+import logging
+from typing import Dict, Iterable, List, Optional
+
+# 디스코드 일반 메시지 본문 최대 길이(문자)
+DISCORD_MESSAGE_LIMIT: int = 2000
+
+# 기본 결계 알림 헤더 템플릿(str.format 필드: {hour}, {minute}, {next_hour}, {label})
+HOURLY_5MIN_TEMPLATE: str = (
+    "⏰인간, 허접~ 결계도 까먹음. 어쩔? 결계는 가야됨 인정? 🗡️\n"
+    "**불길한 소환의 결계 5분 전 알림!**\n"
+)
+HOURLY_3MIN_TEMPLATE: str = (
+    "⏰인간, 허접~ 결계도 까먹음. 어쩔? 결계는 가야됨 인정? 🗡️\n"
+    "**불길한 소환의 결계 3분 전 알림!**\n"
+    "> 시간: {next_hour}시 정각 발생 (약 2분 내 보스 소환)\n"
+)
+HOURLY_CHECK_TEMPLATE: str = "🤪 허접 인간, 안가고 뭐하심? 🗡️\n"
+
+def render_header(template: str, timestamp: datetime.datetime, label: str = "") -> str:
+    return template.format(
+        hour=timestamp.hour,
+        minute=timestamp.minute,
+        next_hour=(timestamp.hour + 1) % 24,
+        label=label,
+    )
+
+def _hourly_5min_header(timestamp: datetime.datetime) -> str:
+    return render_header(HOURLY_5MIN_TEMPLATE, timestamp)
+
+def _hourly_3min_header(timestamp: datetime.datetime) -> str:
+    return render_header(HOURLY_3MIN_TEMPLATE, timestamp)
+
+def _hourly_check_header(timestamp: datetime.datetime) -> str:
+    return render_header(HOURLY_CHECK_TEMPLATE, timestamp)
+
+class PreparedAlert:
+    """
+    헤더 + 멘션 목록을 길이 제한(limit) 이하의 메시지 청크들로 미리 나눠 둔 페이로드.
+    - 첫 청크에만 헤더, 멘션은 순서대로 앞 청크부터 가득 채움(greedy → 최소 개수)
+    - 헤더 + 개행이 limit 을 넘으면 헤더를 잘라 씀(스케줄 테이블 검증에서 미리 거름)
+    - add()/remove() 로 구독 변경분만 패치 → 해당 청크만 다시 렌더링
+      (추가는 마지막 청크 뒤에 이어 붙이고, 제거로 비는 청크는 렌더링 시 건너뜀)
+    """
+    def __init__(self, header: str, mention_ids: Iterable[int] = (), limit: int = DISCORD_MESSAGE_LIMIT) -> None:
+        if len(header) + 1 > limit:
+            # 발사 시점에 예외로 알림을 잃지 않도록 잘라서 보냄(길이 검증은 스케줄 테이블 적재 때)
+            logging.warning("알림 헤더가 너무 길어 잘라서 전송(%d자 → %d자)", len(header), limit - 1)
+            header = header[:limit - 1]
+        self.header: str                    = header
+        self.limit: int                     = limit
+        self._groups: List[List[int]]       = [[]]
+        self._sizes: List[int]              = [0]       # 청크별 멘션 문자열 길이(공백 포함)
+        self._texts: List[Optional[str]]    = [None]    # 렌더링 캐시(None = 다시 렌더링 필요)
+        self._where: Dict[int, int]         = {}        # user_id → 청크 인덱스
+        for user_id in mention_ids:
+            self.add(user_id)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._where
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _capacity(self, index: int) -> int:
+        # 마지막 개행 1자 + (첫 청크면) 헤더 길이를 뺀 멘션 공간
+        return self.limit - 1 - (len(self.header) if index == 0 else 0)
+
+    def add(self, user_id: int) -> None:
+        if user_id in self._where:
+            return
+        mention = len(f"<@{user_id}>")
+        last    = len(self._groups) - 1
+        extra   = mention + (1 if self._groups[last] else 0)
+        # 빈 청크도 확인: 헤더가 길어 첫 청크에 멘션 자리가 없으면 다음 청크부터 채움(첫 청크는 헤더만)
+        if self._sizes[last] + extra > self._capacity(last):
+            self._groups.append([])
+            self._sizes.append(0)
+            self._texts.append(None)
+            last, extra = last + 1, mention
+        self._groups[last].append(user_id)
+        self._sizes[last] += extra
+        self._texts[last] = None
+        self._where[user_id] = last
+
+    def remove(self, user_id: int) -> None:
+        index = self._where.pop(user_id, None)
+        if index is None:
+            return
+        group = self._groups[index]
+        group.remove(user_id)
+        self._sizes[index] -= len(f"<@{user_id}>") + (1 if group else 0)
+        self._texts[index] = None
+
+    def set_member(self, user_id: int, present: bool) -> None:
+        if present:
+            self.add(user_id)
+        else:
+            self.remove(user_id)
+
+    def render(self) -> List[str]:
+        """변경된 청크만 다시 렌더링하여 전송할 본문 목록 반환(비어 있는 후속 청크 제외)"""
+        chunks: List[str] = []
+        for i, group in enumerate(self._groups):
+            if i > 0 and not group:
+                continue
+            if self._texts[i] is None:
+                prefix = self.header if i == 0 else ""
+                self._texts[i] = f"{prefix}{' '.join(f'<@{user_id}>' for user_id in group)}\n"
+            chunks.append(self._texts[i])
+        return chunks
+
+def render_mention_chunks(header: str, mention_ids: Iterable[int], limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """
+    헤더 + 멘션 목록을 길이 제한(limit) 이하의 메시지 여러 개로 분할한다.
+    - 첫 메시지에만 헤더를 붙이고, 이후 메시지는 멘션만 담는다.
+    - 멘션은 순서대로 앞 메시지부터 가득 채운다(greedy → 최소 개수).
+    - 구독자가 없으면 헤더만 담긴 메시지 1개를 반환한다.
+    """
+    return PreparedAlert(header, mention_ids, limit).render()
+
+def create_hourly_5min_message(timestamp: datetime.datetime, mention_ids: List[int]) -> str:
+    mentions = " ".join(f"<@{user_id}>" for user_id in mention_ids)
+    return f"{_hourly_5min_header(timestamp)}{mentions}\n"
+
+def create_hourly_3min_message(timestamp: datetime.datetime, mention_ids: List[int]) -> str:
+    mentions = " ".join(f"<@{user_id}>" for user_id in mention_ids)
+    return f"{_hourly_3min_header(timestamp)}{mentions}\n"
+
+def create_hourly_check_message(timestamp: datetime.datetime, mention_ids: List[int]) -> str:
+    mentions = " ".join(f"<@{user_id}>" for user_id in mention_ids)
+    return f"{_hourly_check_header(timestamp)}{mentions}\n"
@@ -1,472 +1,843 @@
-from __future__ import annotations
-
-import asyncio
-import datetime as dt
-import logging
-import discord
-
-from dataclasses            import dataclass
-from zoneinfo               import ZoneInfo
-
-from discord.ext            import (
-    commands,
-    tasks
-)
-from discord.ui             import (
-    Button, 
-    View
-)
-from typing                 import (
-    List, 
-    Dict, 
-    Set, 
-    Tuple,
-    Optional
-)
-from module.alert_service   import (
-    create_hourly_check_message,
-    create_hourly_5min_message,
-    create_hourly_3min_message,
-)
-from module.user_store      import (
-    load_subscriptions, 
-    save_subscriptions
-)
-
-# --------------------------------------
-# 상수/전역(키 이름 고정: value=운영채널, debug=디버그채널)
-# --------------------------------------
-KST                         = ZoneInfo("Asia/Seoul")
-SUBSCRIBED_USERS_FILE: str  = "subscribed_users.json"
-SUB_TYPES: List[str]        = ["minute_5_before", "minute_3_before", "on_time"]
-
-channel_id_holder: Dict[str, int]   = {"value": 0, "debug": 0}  # value=운영, debug=디버그
-time_config_holder: Dict[str, int]  = {"retention_seconds": 600}    # 자동 삭제 지연(초)
-
-# --------------------------------------
-# 구독 상태 매니저 (동시성 안전)
-# --------------------------------------
-class SubscriptionManager:
-    """
-    구독 상태를 일원화하여 관리하는 매니저.
-    - 파일 I/O 동시성 제어(asyncio.Lock)
-    - 'all'과 개별 구독 간 배타성 보장
-    """
-    def __init__(self, file_name: str) -> None:
-        self._file_name: str                 = file_name
-        self._lock: asyncio.Lock             = asyncio.Lock()
-        # 메모리 캐시(set): JSON ↔ set 변환은 user_store가 담당
-        self._data: Dict[str, Set[int]]      = {
-            "minute_5_before": set(),
-            "minute_3_before": set(),
-            "on_time":         set(),
-            "all":             set(),
-        }
-        # 초기 로드
-        self._data = load_subscriptions(self._file_name)
-
-    async def toggle(self, user_id: int, sub_type: str) -> Tuple[bool, str]:
-        """
-        구독/해제를 토글한다.
-        - sub_type == 'all': 개별 구독 모두 제거 후 all 토글
-        - sub_type in SUB_TYPES: all 제거 후 해당 타입만 토글
-        Returns: (성공여부, 사용자 메시지)
-        """
-        async with self._lock:
-            try:
-                if sub_type == "all":
-                    for t in SUB_TYPES:
-                        self._data[t].discard(user_id)
-                    if user_id in self._data["all"]:
-                        self._data["all"].discard(user_id)
-                        msg = "🔕 전체 구독 해제? 어, 됐다니까.\n이제 신경 끄고 살아."
-                    else:
-                        self._data["all"].add(user_id)
-                        msg = "✅ 전체 구독? 됐다, 됐어.\n이젠 뭐 또 바라는거 있어?"
-                else:
-                    # 개별 구독 선택 시 all에서 제외
-                    self._data["all"].discard(user_id)
-                    if user_id in self._data[sub_type]:
-                        self._data[sub_type].discard(user_id)
-                        msg = f"🔕 {self._label_from_type(sub_type)} 구독 해제? 어, 됐다니까.\n이제 신경 끄고 살아."
-                    else:
-                        self._data[sub_type].add(user_id)
-                        msg = f"✅ {self._label_from_type(sub_type)} 구독? 됐다, 됐어.\n이젠 뭐 또 바라는거 있어?"
-
-                # 저장 (작지만 안전하게 개별 스레드로)
-                ok = await asyncio.to_thread(save_subscriptions, self._file_name, self._data)
-                if not ok:
-                    return False, "❌ 구독 상태 저장 실패! 인강, 뭐 건드렸냐? 얼른 롼리자 소환해라."
-                return True, msg
-            except Exception as e:
-                logging.exception("toggle() 실패: %s", e)
-                return False, "❌ 구독 처리 중 오류! 인간, 뭐 잘못 눌렀냐?"
-
-    def recipients_for(self, sub_type: str) -> List[int]:
-        """
-        알림 전송 대상 계산:
-        - 항상 `all ∪ sub_type`
-        """
-        # 읽기만 하므로 락 없이 스냅샷 사용(일관성 요구 시 락 추가 가능)
-        all_users  = self._data.get("all", set())
-        sub_users  = self._data.get(sub_type, set())
-        combined   = all_users | sub_users
-        return list(combined)
-
-    def _label_from_type(self, sub_type: str) -> str:
-        return {
-            "minute_5_before": "정각 5분 전",
-            "minute_3_before": "정각 3분 전",
-            "on_time":         "정각",
-            "all":             "전체",
-        }.get(sub_type, sub_type)
-    
-# --------------------------------------
-# 메시지 디스패처(큐 + 세마포어 + 재시도)
-# --------------------------------------
-@dataclass
-class MessageJob:
-    channel_id: int
-    content: str
-    delete_after: Optional[int] = None  # 초
-
-class MessageDispatcher:
-    """
-    큐 기반 메시지 전송기.
-    - concurrency 제한(세마포어)
-    - 전송 실패 시 지수 백오프 재시도(최대 3회)
-    - delete_after 가 설정된 경우 삭제 스케줄
-    """
-    def __init__(self, bot: commands.Bot, concurrency: int = 2) -> None:
-        self.bot                                = bot
-        self.queue: asyncio.Queue[MessageJob]   = asyncio.Queue()
-        self._sem                               = asyncio.Semaphore(concurrency)
-        self._workers: List[asyncio.Task]       = []
-        self._stopped                           = asyncio.Event()
-
-    def start(self, worker_count: int = 2) -> None:
-        for _ in range(worker_count):
-            self._workers.append(asyncio.create_task(self._worker()))
-
-    async def stop(self) -> None:
-        self._stopped.set()
-        for w in self._workers:
-            w.cancel()
-        # 남은 잡 처리 대기(optional)
-        await asyncio.gather(*self._workers, return_exceptions=True)
-
-    async def enqueue(self, job: MessageJob) -> None:
-        await self.queue.put(job)
-
-    async def _worker(self) -> None:
-        while not self._stopped.is_set():
-            job: MessageJob = await self.queue.get()
-            try:
-                async with self._sem:
-                    await self._send_job(job)
-            except Exception as e:
-                logging.exception("메시지 전송 작업 실패: %s", e)
-            finally:
-                self.queue.task_done()
-
-    async def _send_job(self, job: MessageJob) -> None:
-        channel = self.bot.get_channel(job.channel_id)
-        if channel is None:
-            logging.warning("채널(ID=%s)을 찾지 못해 전송 스킵", job.channel_id)
-            return
-
-        # 최대 3회 재시도, 1s → 2s → 4s 백오프
-        delay = 1.0
-        for attempt in range(1, 4):
-            try:
-                msg = await channel.send(job.content)
-                if job.delete_after and job.delete_after > 0:
-                    asyncio.create_task(self._delete_later(msg, job.delete_after))
-                logging.info("메시지 전공 성공")
-                return
-            except discord.HTTPException as e:
-                logging.warning("HTTPException(%s) 시도 %d/3", e, attempt)
-                await asyncio.sleep(delay)
-                delay *= 2
-            except discord.Forbidden:
-                logging.error("메시지 전송 권한 없음(채널 ID=%s)", job.channel_id)
-                return
-            except Exception as e:
-                logging.exception("예상치 못한 전송 오류: %s", e)
-                await asyncio.sleep(delay)
-                delay *= 2
-
-    @staticmethod
-    async def _delete_later(msg: discord.Message, after_seconds: int) -> None:
-        try:
-            await asyncio.sleep(after_seconds)
-            await msg.delete()
-        except discord.Forbidden:
-            logging.warning("메시지 삭제 권한 없음")
-        except discord.HTTPException as e:
-            logging.warning("메시지 삭제 실패: %s", e)
-        except Exception:
-            logging.exception("메시지 삭제 처리 중 예외")
-
-# --------------------------------------
-# UI 구성요소
-# --------------------------------------
-class SubscribeButton(Button):
-    """구독/해제 토글 버튼"""
-    def __init__(
-            self, 
-            manager: SubscriptionManager, 
-            label: str, 
-            custom_id: str,
-            style: discord.ButtonStyle = discord.ButtonStyle.primary, 
-            emoji: Optional[str] = None
-    ) -> None:
-        super().__init__(label=label, style=style, custom_id=custom_id, emoji=emoji)
-        self.manager = manager
-
-    async def callback(self, interaction: discord.Interaction):
-        user_id: int                        = interaction.user.id
-        sub_type: str                       = self.custom_id  # "minute_5_before" | "minute_3_before" | "on_time" | "all"
-        
-        ok, msg = await self.manager.toggle(user_id=user_id, sub_type=sub_type)
-        try:
-            if ok:
-                await interaction.response.send_message(content=msg, ephemeral=True)
-            else:
-                # 이미 response를 보냈다면 flowup
-                if interaction.response.is_done():
-                    await interaction.followup.send(content=msg, ephemeral=True)
-                else:
-                    await interaction.response.send_message(content=msg, ephemeral=True)
-            logging.info("구독/해제 interaction response 성공")
-        except Exception as e:
-            logging.exception("interaction response 실패: %s", e)
-
-class SubscribeView(View):
-    """구독 안내 메시지 + 버튼 묶음"""
-    def __init__(self, manager: SubscriptionManager) -> None:
-        super().__init__(timeout=None)
-        # 버튼 생성
-        self.add_item(SubscribeButton(manager=manager, label="정각 5분 전", custom_id="minute_5_before", emoji="<emoji_37:1400881330769756243>"))
-        self.add_item(SubscribeButton(manager=manager, label="정각 3분 전", custom_id="minute_3_before", emoji="<emoji_37:1400881330769756243>"))
-        self.add_item(SubscribeButton(manager=manager, label="정각", custom_id="on_time", emoji="🔔"))
-        self.add_item(SubscribeButton(manager=manager, label="전체 구독", custom_id="all", style=discord.ButtonStyle.success, emoji="✅"))
-        return
-
-# --------------------------------------
-# Bot Factory
-# --------------------------------------
-def create_bot(command_prefix: str = "#") -> commands.Bot:
-    intents = discord.Intents.default()
-    intents.message_content = True
-    return commands.Bot(command_prefix=command_prefix, intents=intents)
-
-def setup_bot_commands(
-    bot: commands.Bot,
-    test_role_name: str,
-    initial_channel_id: int,
-    debug_channel_id: int,
-    message_retention_seconds: int
-) -> None:
-    bot_instance                            = bot
-    # 운영/디버그 채널, 삭제 지연 설정
-    channel_id_holder["value"]              = initial_channel_id
-    channel_id_holder["debug"]              = debug_channel_id
-    time_config_holder['retention_seconds'] = message_retention_seconds
-
-    # 매니저/디스패처
-    subs_manager    = SubscriptionManager(SUBSCRIBED_USERS_FILE)
-    dispatcher      = MessageDispatcher(bot=bot_instance, concurrency=2)
-    
-    dispatcher_started: bool = False  # 중복 시작 방지용 플래그
-    
-    # ------------- 공통 유틸 -------------
-
-    def _has_role(ctx: commands.Context, role_name: str) -> bool:
-        return any(role.name == role_name for role in getattr(ctx.author, "roles", []))
-
-    async def _send_debug(text: str) -> None:
-        debug_ch = bot_instance.get_channel(channel_id_holder["debug"])
-        if debug_ch:
-            try:
-                await debug_ch.send(text)
-            except Exception:
-                logging.exception("디버그 채널 전송 실패")
-    
-    # ----- 워치독(루프 지연 감시) -----
-    last_monotonic: Optional[float] = None
-
-    @tasks.loop(seconds=1.0, reconnect=True)
-    async def event_loop_watchdog() -> None:
-        nonlocal last_monotonic
-        now = asyncio.get_running_loop().time()
-        if last_monotonic is not None:
-            drift = now - last_monotonic - 1.0  # 이상적 간격 1초
-            if drift > 2.0:
-                logging.warning("이벤트 루프 지연 감지: %.3fs", drift)
-                # 필요 시 디버그 채널 알림(과도한 알림 방지 위해 주석)
-                # await _send_debug(f"⚠️ 이벤트 루프 지연 감지: {drift:.3f}s")
-        last_monotonic = now
-
-    # ----- 스케줄러(공식 loop 사용) -----
-    last_fired_at: Dict[str, Tuple[int, int]] = {
-        "minute_5_before": (-1, -1),
-        "minute_3_before": (-1, -1),
-        "on_time": (-1, -1),
-    }
-
-    def _should_fire(sub_type: str, now_kst: dt.datetime) -> bool:
-        """해당 타입이 이 분에 발사되어야 하는지 검사 (중복 발사 방지)"""
-        minute_map = {
-            "minute_5_before": 55,
-            "minute_3_before": 57,
-            "on_time": 0,
-        }
-        target_minute = minute_map[sub_type]
-        if now_kst.minute != target_minute:
-            return False
-        last_h, last_m = last_fired_at[sub_type]
-        cur_key = (now_kst.hour, now_kst.minute)
-        if (last_h, last_m) == cur_key:
-            return False
-        last_fired_at[sub_type] = cur_key
-        return True
-    
-    @tasks.loop(minutes=1, reconnect=True)
-    async def scheduler_loop() -> None:
-        now_kst = dt.datetime.now(tz=KST)
-
-        try:
-            # 55분: 5분 전
-            if _should_fire("minute_5_before", now_kst):
-                recipients = subs_manager.recipients_for("minute_5_before")
-                content = create_hourly_5min_message(now_kst, mention_ids=recipients)
-                await dispatcher.enqueue(
-                    MessageJob(
-                        channel_id=channel_id_holder["value"],
-                        content=content,
-                        delete_after=time_config_holder["retention_seconds"],
-                    )
-                )
-
-            # 57분: 3분 전
-            if _should_fire("minute_3_before", now_kst):
-                recipients = subs_manager.recipients_for("minute_3_before")
-                content = create_hourly_3min_message(now_kst, mention_ids=recipients)
-                await dispatcher.enqueue(
-                    MessageJob(
-                        channel_id=channel_id_holder["value"],
-                        content=content,
-                        delete_after=time_config_holder["retention_seconds"],
-                    )
-                )
-
-            # 00분: 정각 체크
-            if _should_fire("on_time", now_kst):
-                recipients = subs_manager.recipients_for("on_time")
-                content = create_hourly_check_message(now_kst, mention_ids=recipients)
-                await dispatcher.enqueue(
-                    MessageJob(
-                        channel_id=channel_id_holder["value"],
-                        content=content,
-                        delete_after=time_config_holder["retention_seconds"],
-                    )
-                )
-
-        except Exception as e:
-            logging.exception("스케줄러 처리 중 예외: %s", e)
-            await _send_debug(f"❌ 스케줄러 오류: {e}")
-
-    # ----- 이벤트 -----
-    @bot_instance.event
-    async def on_ready():
-        nonlocal dispatcher_started
-        logging.info("%s 실행됨", bot_instance.user)
-        # 디스패처는 이벤트 루프가 '실행 중'일 때 시작
-        if not dispatcher_started:
-            dispatcher.start(worker_count=2)
-            dispatcher_started = True
-
-        if not scheduler_loop.is_running():
-            scheduler_loop.start()
-        if not event_loop_watchdog.is_running():
-            event_loop_watchdog.start()
-
-    # ------------- 명령어 -------------
-    @bot_instance.command(name="test_alert")
-    async def test_alert(ctx: commands.Context):
-        if not _has_role(ctx, test_role_name):
-            try:
-                msg = await ctx.send("😐 너 누구심?")
-                await asyncio.sleep(1)
-                await msg.delete()
-            except discord.Forbidden:
-                await ctx.send("❌ 권한이 없어 메시지를 삭제할 수 없습니다.")
-            except discord.HTTPException as e:
-                await ctx.send(f"❌ 메시지 삭제 중 오류가 발생했습니다: {e}")
-            except Exception as e:
-                await ctx.send("❌ 알 수 없는 오류가 발생했습니다.")
-                await _send_debug(f"test_alert 오류: {e}")
-            return
-        
-        await ctx.send("✅ 테스트 권한 확인 완료!")
-
-    @bot_instance.command(name="set_channel")
-    async def set_channel(ctx: commands.Context, new_channel_id: int):
-        if not _has_role(ctx, test_role_name):
-            await ctx.send("😐 너 누구심?")
-            return
-
-        if bot_instance.get_channel(new_channel_id) is None:
-            await ctx.send(f"채널 ID {new_channel_id}를 찾을 수 없습니다.")
-            return
-
-        channel_id_holder["value"] = int(new_channel_id)
-        await ctx.send(f"알림 채널 ID가 `{new_channel_id}`(으)로 변경되었습니다.")
-
-    @bot_instance.command(name="set_debug_channel")
-    async def set_debug_channel(ctx: commands.Context, new_channel_id: int):
-        if not _has_role(ctx, test_role_name):
-            await ctx.send("😐 너 누구심?")
-            return
-
-        if bot_instance.get_channel(new_channel_id) is None:
-            await ctx.send(f"채널 ID {new_channel_id}를 찾을 수 없습니다.")
-            return
-
-        channel_id_holder["debug"] = int(new_channel_id)
-        await ctx.send(f"디버그 채널 ID가 `{new_channel_id}`(으)로 변경되었습니다.")
-
-    @bot_instance.command(name="set_retention_seconds")
-    async def set_retention_seconds(ctx: commands.Context, new_retention_seconds: int):
-        if not _has_role(ctx, test_role_name):
-            await ctx.send("😐 너 누구심?")
-            return
-
-        if new_retention_seconds < 0 or new_retention_seconds > 3600 * 6:
-            await ctx.send("❌ 0 ~ 21600(6h) 범위에서 설정하세요.")
-            return
-
-        time_config_holder["retention_seconds"] = int(new_retention_seconds)
-        await ctx.send(f"알림 메시지 자동 삭제 시간을 `{new_retention_seconds}s`(으)로 변경했습니다.")
-
-    @bot_instance.command(name="알림구독")
-    async def send_subscribe(ctx: commands.Context):
-        if not _has_role(ctx, test_role_name):
-            await ctx.send("😐 너 누구심?")
-        elif not ctx.author.id == 292505059806412801:
-            await ctx.send("😐 너 누구심?")
-
-        view  = SubscribeView(manager=subs_manager)
-        embed = discord.Embed(
-            title="결계 & 정각 알리미 📢",
-            description=(
-                "버튼? 누르든 말든 네 맘대로 해~\n"
-                "두 번 누르면 해제? 뭐, 그딴 건 알아서 하라구!\n\n"
-                "결계 시간? 알려주긴 할 건데, 못 봤다고 찡찡대진 마.\n"
-                "귀찮게 굴지 마라, 알겠어?"
-            ),
-            color=discord.Color.dark_blue(),
-        )
-        embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/your_thumbnail.png")
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import itertools
+import logging
+import signal
+import discord
+
+from zoneinfo               import ZoneInfo
+
+from discord.ext            import (
+    commands,
+    tasks
+)
+from discord.ui             import (
+    Button, 
+    View
+)
+from typing                 import (
+    List, 
+    Dict, 
+    Set,
+    Tuple,
+    Optional,
+    Callable,
+    Awaitable
+)
+from module.alert_service   import PreparedAlert
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.config_loader   import (
+    CONFIG_POLL_SECONDS,
+    MAX_RETENTION_SECONDS,
+    RESTART_REQUIRED_KEYS,
+    BotConfig,
+    ConfigLoader
+)
+from module.dispatcher      import (
+    API_CALL_SECONDS,
+    MessageDispatcher,
+    MessageJob,
+    PRIORITY_ALERT
+)
+from module.dm_delivery     import (
+    CLOSED_DMS_FILE,
+    DM_OUTBOX_FILE,
+    DM_WORKERS,
+    DirectMessageSender
+)
+from module.expiry_engine   import PENDING_DELETIONS_FILE
+from module.live_messages   import (
+    LIVE_MESSAGES_FILE,
+    MESSAGE_MODE_EDIT,
+    PING_RETENTION_SECONDS,
+    render_live_status
+)
+from module.outbox          import OUTBOX_FILE
+from module.fire_ledger     import (
+    FIRE_LEDGER_FILE,
+    FireLedger,
+    FireRecord
+)
+from module.guild_registry  import (
+    GuildConfig,
+    GuildRegistry
+)
+from module.loop_monitor    import (
+    FIRE_GUARD_SECONDS,
+    LOOP_LAG_SECONDS,
+    LoopMonitor
+)
+from module.metrics         import (
+    METRICS,
+    METRICS_HOST,
+    MetricsServer
+)
+from module.role_sync       import (
+    RoleSyncQueue,
+    render_role_mentions
+)
+from module.scheduler       import (
+    FIRE_LATENESS_SECONDS,
+    AlertScheduler,
+    FireListener
+)
+from module.schedule_table  import (
+    EventSpec,
+    load_schedule
+)
+from module.sharding        import ShardPlan
+from module.startup         import StartupProfile
+from module.subscription_manager import (
+    ALL_TYPE,
+    DM_PREF,
+    SAVE_SECONDS,
+    TOGGLE_SECONDS,
+    SubscriptionManager,
+    ToggleThrottle
+)
+
+# --------------------------------------
+# 상수/전역
+# --------------------------------------
+KST                         = ZoneInfo("Asia/Seoul")
+SUBSCRIBED_USERS_FILE: str  = "subscribed_users.json"   # 단일 길드 시절 구독 파일(첫 길드로 이관)
+DISPATCH_CONCURRENCY: int   = 8                         # 길드 간 동시 전송 수(레이트리밋은 버킷이 보장)
+SHARED_REFRESH_SECONDS: int = 5                         # 샤드 프로세스 간 구독 변경 확인 주기(초)
+SHUTDOWN_BUDGET_SECONDS     = 9.0                       # 모든 종료 훅이 나눠 쓰는 마감(컨테이너 기본 종료 유예 10초 안)
+SHUTDOWN_SAVE_RESERVE       = 1.5                       # 큐 비우기에 쓰지 않고 남기는 상태 저장 몫(아웃박스/원장/구독 압축)
+
+FIRE_TO_DELIVERY_SECONDS    = METRICS.histogram(
+    "alertbot_fire_to_delivery_seconds", "예정 발사 시각부터 알림 청크 전송 완료까지", ("event",)
+)
+
+# --------------------------------------
+# UI 구성요소
+# --------------------------------------
+class SubscribeButton(Button):
+    """구독/해제 토글 버튼"""
+    def __init__(
+            self, 
+            registry: GuildRegistry, 
+            label: str, 
+            custom_id: str,
+            style: discord.ButtonStyle = discord.ButtonStyle.primary, 
+            emoji: Optional[str] = None
+    ) -> None:
+        super().__init__(label=label, style=style, custom_id=custom_id, emoji=emoji)
+        self.registry = registry
+
+    async def callback(self, interaction: discord.Interaction):
+        user_id: int                        = interaction.user.id
+        sub_type: str                       = self.custom_id  # 스케줄 테이블의 key | "all"
+        
+        # 클릭한 길드의 구독 네임스페이스에서 토글
+        manager: SubscriptionManager        = self.registry.manager_for(interaction.guild_id or 0)
+        # 메모리 상태만 바꾸고 바로 응답(디스크 저장은 매니저의 write-behind 큐가 뒤에서 처리)
+        ok, msg = await manager.toggle(user_id=user_id, sub_type=sub_type)
+        try:
+            if ok:
+                await interaction.response.send_message(content=msg, ephemeral=True)
+            else:
+                # 이미 response를 보냈다면 flowup
+                if interaction.response.is_done():
+                    await interaction.followup.send(content=msg, ephemeral=True)
+                else:
+                    await interaction.response.send_message(content=msg, ephemeral=True)
+            logging.info("구독/해제 interaction response 성공")
+        except Exception as e:
+            logging.exception("interaction response 실패: %s", e)
+
+class SubscribeView(View):
+    """구독 안내 메시지 + 버튼 묶음(스케줄 테이블의 이벤트마다 버튼 1개 + 전체 구독)"""
+    def __init__(self, registry: GuildRegistry, schedule: List[EventSpec]) -> None:
+        super().__init__(timeout=None)
+        # 버튼 생성
+        for event in schedule:
+            self.add_item(SubscribeButton(
+                registry=registry,
+                label=event.label,
+                custom_id=event.key,
+                style=getattr(discord.ButtonStyle, event.style),
+                emoji=event.emoji,
+            ))
+        self.add_item(SubscribeButton(registry=registry, label="전체 구독", custom_id="all", style=discord.ButtonStyle.success, emoji="✅"))
+        self.add_item(SubscribeButton(registry=registry, label="DM으로 받기", custom_id=DM_PREF, style=discord.ButtonStyle.secondary, emoji="📬"))
+        return
+
+# --------------------------------------
+# Bot Factory
+# --------------------------------------
+class ShutdownHookMixin:
+    """
+    종료(close) 직전에 등록된 정리 훅(저널 압축 등)을 실행.
+    모든 훅은 close() 시점부터 SHUTDOWN_BUDGET_SECONDS 인 하나의 마감을 나눠 씀(shutdown_remaining)
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+        self._shutdown_deadline: Optional[float]                  = None  # 이벤트 루프 시각(단조)
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        self._shutdown_hooks.append(hook)
+
+    def shutdown_remaining(self, reserve: float = 0.0) -> float:
+        """종료 마감까지 남은 시간에서 reserve(뒤 훅의 저장 몫)를 뺀 값(0 이상). close() 전이면 예산 전체 기준"""
+        now = asyncio.get_running_loop().time()
+        deadline = self._shutdown_deadline if self._shutdown_deadline is not None else now + SHUTDOWN_BUDGET_SECONDS
+        return max(0.0, deadline - now - reserve)
+
+    async def close(self) -> None:
+        if self._shutdown_deadline is None:
+            self._shutdown_deadline = asyncio.get_running_loop().time() + SHUTDOWN_BUDGET_SECONDS
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception:
+                logging.exception("종료 훅 실행 실패: %r", hook)
+        await super().close()
+
+class StartupTaskMixin:
+    """
+    로그인(HTTP) 직전에 등록된 시작 작업(상태 파일 적재 등)을 태스크로 띄워 로그인/게이트웨이 연결과 동시에 진행.
+    로그인 소요 시간과 끝난 시점은 startup(StartupProfile)에 기록
+    """
+    def __init__(self, *args, startup: Optional[StartupProfile] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.startup: StartupProfile                                = startup or StartupProfile()
+        self._startup_tasks: List[Callable[[], Awaitable[None]]]    = []
+
+    def add_startup_task(self, task: Callable[[], Awaitable[None]]) -> None:
+        self._startup_tasks.append(task)
+
+    async def login(self, token: str) -> None:
+        for task in self._startup_tasks:
+            asyncio.ensure_future(task())
+        with self.startup.phase("login"):
+            await super().login(token)
+        self.startup.mark("login")
+
+class AlertBot(StartupTaskMixin, ShutdownHookMixin, commands.Bot):
+    """게이트웨이 연결 1개짜리 기본 Bot"""
+
+class ShardedAlertBot(StartupTaskMixin, ShutdownHookMixin, commands.AutoShardedBot):
+    """샤드 모드 Bot(한 프로세스가 shard_ids 의 샤드 연결들을 담당)"""
+
+def create_bot(
+        command_prefix: str = "#",
+        shard_plan: Optional[ShardPlan] = None,
+        startup: Optional[StartupProfile] = None
+) -> commands.Bot:
+    intents = discord.Intents.default()
+    intents.message_content = True
+    if shard_plan is None or not shard_plan.enabled:
+        return AlertBot(command_prefix=command_prefix, intents=intents, startup=startup)
+    logging.info("샤드 모드로 시작: %s", shard_plan.describe())
+    return ShardedAlertBot(
+        command_prefix=command_prefix,
+        intents=intents,
+        startup=startup,
+        shard_count=shard_plan.shard_count,
+        shard_ids=list(shard_plan.shard_ids) if shard_plan.shard_ids is not None else None,
+    )
+
+def setup_bot_commands(
+    bot: commands.Bot,
+    test_role_name: str,
+    initial_channel_id: int,
+    debug_channel_id: int,
+    message_retention_seconds: int,
+    subscription_backend: str = "json",
+    alert_lead_seconds: int = 60,
+    schedule: Optional[List[EventSpec]] = None,
+    dispatch_concurrency: int = DISPATCH_CONCURRENCY,
+    shard_plan: Optional[ShardPlan] = None,
+    mention_mode: str = "user",
+    alert_message_mode: str = "send",
+    dm_workers: int = DM_WORKERS,
+    config_loader: Optional[ConfigLoader] = None,
+    metrics_port: int = 0,
+    metrics_host: str = METRICS_HOST,
+    clock: Clock = SYSTEM_CLOCK,
+    fire_listener: Optional[FireListener] = None,
+) -> None:
+    bot_instance    = bot
+    shard_plan      = shard_plan or ShardPlan()
+    if shard_plan.is_partial and subscription_backend != "sqlite":
+        # 여러 프로세스가 같은 구독 파일을 보려면 공유 가능한 저장소가 필요
+        logging.warning("샤드를 여러 프로세스로 나눠 실행 → 구독 저장소를 sqlite 로 전환")
+        subscription_backend = "sqlite"
+    # 길드 설정이 없는 곳에서 쓰는 전역 디버그 채널(봇 운영자용)
+    default_debug   = {"channel_id": debug_channel_id}
+
+    # 알림 스케줄 테이블(없으면 기본 결계 55/57/00분)
+    schedule        = list(schedule or load_schedule(None, alert_lead_seconds))
+    events          = {event.key: event for event in schedule}
+
+    # 길드별 구독 네임스페이스/디스패처
+    labels          = {event.key: event.label for event in schedule}
+    role_mode       = mention_mode == "role"   # 구독 타입별 관리 역할 1개를 멘션(메시지 크기 O(1))
+
+    # 토글 한도는 길드가 아니라 사용자 단위 → 모든 길드 매니저가 하나를 공유(여러 길드에서 연타해도 한도 1개)
+    toggle_throttle = ToggleThrottle()
+
+    def _new_manager(guild_id: int, subs_file: str) -> SubscriptionManager:
+        manager = SubscriptionManager(
+            subs_file,
+            backend=subscription_backend,
+            sub_types=list(events),
+            labels=labels,
+            throttle=toggle_throttle,
+        )
+        if role_mode:
+            manager.add_listener(role_sync.listener_for(guild_id))
+        return manager
+
+    # 이 프로세스가 맡은 샤드의 길드만 적재/발사, 프로세스별 상태 파일은 분리
+    registry        = GuildRegistry(_new_manager, owns=shard_plan.owns)
+    dispatcher      = MessageDispatcher(
+        bot=bot_instance,
+        concurrency=dispatch_concurrency,
+        expiry_file_name=shard_plan.state_file_name(PENDING_DELETIONS_FILE),
+        clock=clock,
+        outbox_file_name=shard_plan.state_file_name(OUTBOX_FILE),
+        live_file_name=shard_plan.state_file_name(LIVE_MESSAGES_FILE),
+    )
+    ledger          = FireLedger(shard_plan.state_file_name(FIRE_LEDGER_FILE), clock=clock)
+    role_sync       = RoleSyncQueue(bot_instance, dispatcher.call_limited, registry)
+    dm_sender       = DirectMessageSender(
+        bot_instance,
+        dispatcher.call_limited,
+        workers=dm_workers,
+        file_name=shard_plan.state_file_name(CLOSED_DMS_FILE),
+        clock=clock,
+        outbox_file_name=shard_plan.state_file_name(DM_OUTBOX_FILE),
+    )
+    # 지표: 누적 통계는 수집 시점에 읽고, 포트가 지정된 경우에만 /metrics 엔드포인트를 연다
+    dispatcher.register_metrics(METRICS)
+    dm_sender.register_metrics(METRICS)
+    METRICS.gauge("alertbot_role_sync_pending", "역할 부여/회수 대기 사용자 수").set_function(lambda: len(role_sync))
+    metrics_server  = MetricsServer(METRICS, metrics_host, metrics_port) if metrics_port else None
+    
+    dispatcher_started: bool = False  # 중복 시작 방지용 플래그
+
+    # ----- 상태 파일 적재(로그인/게이트웨이 연결과 동시에) -----
+    startup: StartupProfile = getattr(bot_instance, "startup", None) or StartupProfile()
+    state_loaded: Optional[asyncio.Future] = None
+
+    def _load_state() -> None:
+        """워커 스레드에서 읽는 상태 파일: 길드 설정, 발송 길드의 구독 저장소, 발사 원장"""
+        registry.load()
+        for config in registry.routable():
+            registry.manager_for(config.guild_id)
+        ledger.load()
+
+    async def _load_state_timed() -> None:
+        with startup.phase("store_load"):
+            await asyncio.to_thread(_load_state)
+
+    def _state_loaded() -> asyncio.Future:
+        """적재 태스크(처음 부르면 시작). 로그인 전에 시작됐으면 on_ready 에서는 끝나기만 기다림"""
+        nonlocal state_loaded
+        if state_loaded is None:
+            state_loaded = asyncio.ensure_future(_load_state_timed())
+        return state_loaded
+
+    if isinstance(bot_instance, StartupTaskMixin):
+        bot_instance.add_startup_task(_state_loaded)
+
+    async def _stop_dispatcher() -> None:
+        await loop_monitor.stop()     # 멈춰 둔 부가 작업 재개(남은 삭제/역할 갱신 정리)
+        await scheduler.stop()
+        # 역할 갱신·DM·알림 큐는 하나의 종료 마감 안에서 동시에 비움(저장 몫은 남겨 둠)
+        drain = bot_instance.shutdown_remaining(SHUTDOWN_SAVE_RESERVE)
+        stops = []
+        if role_mode:
+            stops.append(role_sync.stop(drain_timeout=drain))
+        if dispatcher_started:
+            stops.append(dm_sender.stop(drain_timeout=drain))     # 남은 DM 은 DM 아웃박스에 남김, 차단 목록 영속화
+            stops.append(dispatcher.stop(drain_timeout=drain))    # 남은 잡은 아웃박스, 삭제 대기 목록 영속화
+        for result in await asyncio.gather(*stops, return_exceptions=True):
+            if isinstance(result, BaseException):
+                logging.error("종료 처리 실패", exc_info=result)
+        if dispatcher_started:
+            await ledger.stop()       # 미전송 청크는 '전송 중'으로 남아 재시작 시 이어서 전송
+        if metrics_server is not None:
+            await metrics_server.stop()
+
+    if isinstance(bot_instance, ShutdownHookMixin):
+        bot_instance.add_shutdown_hook(_stop_dispatcher)
+        bot_instance.add_shutdown_hook(registry.flush)
+    
+    # ------------- 공통 유틸 -------------
+
+    def _has_role(ctx: commands.Context, role_name: str) -> bool:
+        return any(role.name == role_name for role in getattr(ctx.author, "roles", []))
+
+    def _guild_channel(ctx: commands.Context, channel_id: int):
+        """명령을 실행한 길드 소속 채널만 허용(다른 길드 채널로의 라우팅 방지)"""
+        channel = bot_instance.get_channel(channel_id)
+        if channel is None or ctx.guild is None or getattr(channel, "guild", None) != ctx.guild:
+            return None
+        return channel
+
+    def _primary_guild() -> Optional[GuildConfig]:
+        """Config.json(DEFAULT_CHANNEL_ID 등)의 설정을 이관받은 기본 길드"""
+        return registry.find_by_subs_file(SUBSCRIBED_USERS_FILE)
+
+    def _sync_primary(settings: BotConfig) -> bool:
+        """Config.json 값을 기본 길드 설정에 반영(Config.json 이 기본 길드 설정의 원본). 바뀌었으면 True"""
+        primary = _primary_guild()
+        if primary is None:
+            return False
+        values  = {"debug_channel_id": settings.debug_channel_id, "retention_seconds": settings.message_retention_seconds}
+        channel = bot_instance.get_channel(settings.default_channel_id)
+        if getattr(getattr(channel, "guild", None), "id", None) == primary.guild_id:
+            values["channel_id"] = settings.default_channel_id
+        elif settings.default_channel_id != primary.channel_id:
+            logging.warning(
+                "DEFAULT_CHANNEL_ID(%s)가 기본 길드(ID=%s)의 채널이 아니어서 무시", settings.default_channel_id, primary.guild_id
+            )
+        changed = {name: value for name, value in values.items() if getattr(primary, name) != value}
+        if changed:
+            registry.update(primary.guild_id, **changed)
+        return bool(changed)
+
+    async def _write_back(guild_id: int, **values) -> None:
+        """기본 길드에서 명령으로 바꾼 값은 Config.json 에도 되써서 재시작/재적재 후에도 유지"""
+        primary = _primary_guild()
+        if config_loader is None or primary is None or primary.guild_id != guild_id:
+            return
+        try:
+            await config_loader.write_back(**values)
+        except Exception:
+            logging.exception("Config.json 되쓰기 실패(%s)", ", ".join(values))
+
+    async def _send_debug(text: str, guild_id: Optional[int] = None) -> None:
+        config   = registry.get(guild_id) if guild_id is not None else None
+        debug_id = (config.debug_channel_id if config else 0) or default_debug["channel_id"]
+        debug_ch = bot_instance.get_channel(debug_id)
+        if debug_ch:
+            # 알림과 같은 버킷/전역 예산을 공유(실패는 call_limited 가 로그로 남김)
+            await dispatcher.call_limited("send", debug_ch.id, lambda: debug_ch.send(text), "디버그 채널 전송")
+    
+    # ----- 이벤트 루프 상태 감시(지연 백분위, 블로킹 위치, 발사 창 부하 차단) -----
+    fire_guard = max([FIRE_GUARD_SECONDS] + [event.lead_seconds for event in schedule])
+
+    def _near_fire() -> bool:
+        """발사 창: 다음 발사가 fire_guard 초 안이거나(사전 준비 포함) 보낼 잡이 아직 남아 있음"""
+        if dispatcher.queue.qsize() or dispatcher.in_flight:
+            return True
+        now = scheduler.now()
+        return any((fire_at - now).total_seconds() <= fire_guard for fire_at in scheduler.next_fire_times().values())
+
+    loop_monitor    = LoopMonitor(clock=clock, near_fire=_near_fire, report=_send_debug)
+    loop_monitor.add_shed_target(dispatcher.expiry)   # 자동 삭제는 미뤄도 되는 작업
+    if role_mode:
+        loop_monitor.add_shed_target(role_sync)
+    loop_monitor.register_metrics(METRICS)
+
+    # ----- 샤드 프로세스 간 구독 상태 동기화 -----
+    @tasks.loop(seconds=SHARED_REFRESH_SECONDS, reconnect=True)
+    async def shared_state_refresh() -> None:
+        for manager in registry.managers().values():
+            try:
+                await manager.refresh()
+            except Exception:
+                logging.exception("공유 구독 상태 갱신 실패")
+
+    # ----- 스케줄러(절대 시각 기반) -----
+    def _alert_deadline(sub_type: str, fire_at: dt.datetime) -> float:
+        """알림이 의미 있는 마지막 시각(epoch): 발사 + deadline_seconds (예: 5분 전 알림은 정각까지)"""
+        return fire_at.timestamp() + events[sub_type].deadline_seconds
+
+    def _alert_jobs(record: FireRecord, indices: List[int]) -> List[MessageJob]:
+        """원장 기록의 청크들을 알림 잡 묶음으로 변환(전송 결과는 원장에 청크 단위로 반영)"""
+        fire_ts = dt.datetime.fromisoformat(record.fire_at).timestamp()
+
+        def on_result(index: int) -> Callable[[bool], None]:
+            def done(ok: bool) -> None:
+                ledger.mark(record.key, index, ok)
+                if ok:
+                    FIRE_TO_DELIVERY_SECONDS.observe(max(0.0, clock.time() - fire_ts), event=record.event)
+            return done
+
+        def live_key(index: int) -> Optional[str]:
+            return record.live_family if index == 0 else None   # 수정 모드: 0번 청크 = 상태 메시지
+
+        return [
+            MessageJob(
+                channel_id=record.channel_id,
+                content=record.chunks[i],
+                delete_after=record.delete_after,
+                priority=PRIORITY_ALERT,
+                deadline=record.deadline,
+                on_result=on_result(i),
+                key=f"{record.key}#{i}",   # 원장 재개와 아웃박스 복원이 겹쳐도 청크당 1회만 적재
+                live_key=live_key(i),
+            )
+            for i in indices
+        ]
+
+    # ----- 사전 렌더링(발사 lead_seconds 전에 페이로드 준비) -----
+    # (guild_id, sub_type) → (발사 시각, 준비된 페이로드, 준비 시점 구독 버전)
+    prepared: Dict[Tuple[int, str], Tuple[dt.datetime, PreparedAlert, int]] = {}
+
+    def _edit_mode() -> bool:
+        return alert_message_mode == MESSAGE_MODE_EDIT
+
+    def _mention_header(sub_type: str, fire_at: dt.datetime) -> str:
+        """멘션 청크 머리글: 기본은 알림 헤더, 수정 모드는 짧은 한 줄(본문은 상태 메시지에 있음)"""
+        if _edit_mode():
+            return f"🔔 **{events[sub_type].label}**\n"
+        return events[sub_type].render_header(fire_at)
+
+    def _render_alert(guild_id: int, sub_type: str, fire_at: dt.datetime) -> PreparedAlert:
+        manager = registry.manager_for(guild_id)
+        return PreparedAlert(_mention_header(sub_type, fire_at), manager.channel_recipients(sub_type))
+
+    async def _ensure_roles(guild_id: int) -> None:
+        if await role_sync.ensure_roles(guild_id, {**labels, ALL_TYPE: "전체"}):
+            logging.info("관리 역할 준비 완료(길드 ID=%s)", guild_id)
+
+    def _role_ids(guild_id: int, sub_type: str) -> Optional[List[int]]:
+        return role_sync.role_ids_for(guild_id, sub_type, ALL_TYPE) if role_mode else None
+
+    def _prepare_alert(sub_type: str, fire_at: dt.datetime) -> None:
+        """발사 lead_seconds 전에 길드별 멘션 청크를 미리 만들어 둔다(역할 멘션 길드는 준비할 것이 없음)"""
+        for config in registry.routable():
+            if _role_ids(config.guild_id, sub_type) is not None:
+                continue
+            alert = _render_alert(config.guild_id, sub_type, fire_at)
+            prepared[(config.guild_id, sub_type)] = (fire_at, alert, registry.manager_for(config.guild_id).version)
+        logging.info("알림 사전 렌더링 완료(%s, %s, 길드 %d곳)", sub_type, fire_at.strftime("%H:%M"), len(registry.routable()))
+
+    def _take_payload(guild_id: int, sub_type: str, fire_at: dt.datetime) -> List[str]:
+        """준비된 페이로드에 이후 구독 변경분만 패치해서 반환(없으면 즉시 렌더링)"""
+        role_ids = _role_ids(guild_id, sub_type)
+        if role_ids is not None:
+            return render_role_mentions(_mention_header(sub_type, fire_at), role_ids)
+        entry = prepared.pop((guild_id, sub_type), None)
+        if entry is not None and entry[0] == fire_at:
+            _, alert, version = entry
+            manager = registry.manager_for(guild_id)
+            changed = manager.changes_since(version)
+            if changed is not None:
+                for user_id in changed:
+                    alert.set_member(user_id, manager.is_channel_recipient(user_id, sub_type))
+                return alert.render()
+        return _render_alert(guild_id, sub_type, fire_at).render()
+
+    def _guild_record(config: GuildConfig, sub_type: str, fire_at: dt.datetime) -> FireRecord:
+        chunks = _take_payload(config.guild_id, sub_type, fire_at)
+        if not _edit_mode():
+            return FireRecord.create(
+                sub_type,
+                fire_at,
+                guild_id=config.guild_id,
+                channel_id=config.channel_id,
+                delete_after=config.retention_seconds,
+                deadline=_alert_deadline(sub_type, fire_at),
+                chunks=chunks,
+            )
+        # 수정 모드: [상태 메시지(수정)] + 멘션이 있을 때만 짧게 사는 멘션 메시지
+        if chunks == [_mention_header(sub_type, fire_at) + "\n"]:
+            chunks = []
+        status = render_live_status(events[sub_type].render_header(fire_at), fire_at)
+        return FireRecord.create(
+            sub_type,
+            fire_at,
+            guild_id=config.guild_id,
+            channel_id=config.channel_id,
+            delete_after=min(config.retention_seconds or PING_RETENTION_SECONDS, PING_RETENTION_SECONDS),
+            deadline=_alert_deadline(sub_type, fire_at),
+            chunks=[status] + chunks,
+            live_family=events[sub_type].live_family,
+        )
+
+    async def _fan_out_dm(sub_type: str, fire_at: dt.datetime, guild_ids: List[int]) -> None:
+        """DM 선호 구독자에게 헤더만 DM 으로 전송(여러 길드에서 구독해도 1번)"""
+        user_ids: set = set()
+        for guild_id in guild_ids:
+            user_ids.update(registry.manager_for(guild_id).dm_recipients(sub_type))
+        if not user_ids:
+            return
+        queued = await dm_sender.deliver(sorted(user_ids), events[sub_type].render_header(fire_at), _alert_deadline(sub_type, fire_at))
+        logging.info("DM 알림 적재(%s): %d명 (차단 캐시 제외 %d명)", sub_type, queued, len(user_ids) - queued)
+
+    async def _fire_alert(sub_type: str, fire_at: dt.datetime, lateness: float) -> None:
+        try:
+            targets = [
+                c for c in registry.routable()
+                if bot_instance.get_guild(c.guild_id) is not None and not ledger.has(sub_type, fire_at, c.guild_id)
+            ]
+            if not targets:
+                logging.info("발사 대상 길드 없음(%s, %s)", sub_type, fire_at.strftime("%m-%d %H:%M"))
+                return
+            # 모든 길드 슬롯을 디스크 쓰기 1회로 선점
+            records = await ledger.claim_many([_guild_record(c, sub_type, fire_at) for c in targets])
+            batches = [_alert_jobs(r, list(range(len(r.chunks)))) for r in records]
+            # 길드별 청크를 라운드로빈으로 섞어 적재 → 모든 길드의 첫 청크가 먼저 나가고,
+            # 한 채널의 버킷 대기가 다른 길드 전송을 막지 않음(워커들이 길드 간 병렬 전송)
+            jobs = [job for row in itertools.zip_longest(*batches) for job in row if job is not None]
+            await dispatcher.enqueue_many(jobs)
+            await _fan_out_dm(sub_type, fire_at, [r.guild_id for r in records])
+        except Exception as e:
+            logging.exception("스케줄러 처리 중 예외: %s", e)
+            await _send_debug(f"❌ 스케줄러 오류: {e}")
+
+    scheduler = AlertScheduler(
+        events=schedule,
+        on_fire=_fire_alert,
+        on_prepare=_prepare_alert,
+        tz=KST,
+        clock=clock,
+    )
+    if fire_listener is not None:
+        scheduler.add_listener(fire_listener)
+
+    # ----- 설정 재적재(Config.json 변경 감시) -----
+    def _apply_schedule(new_schedule: List[EventSpec]) -> None:
+        """템플릿/시각/라벨/마감 변경은 즉시 반영. 이벤트 키 구성이 바뀌면 구독 비트 배치가 달라지므로 재시작 필요"""
+        if [event.key for event in new_schedule] != list(events):
+            logging.warning("ALERT_SCHEDULE 이벤트 키 구성이 바뀜 → 재시작 후 반영")
+            return
+        schedule[:] = new_schedule
+        events.update({event.key: event for event in new_schedule})
+        labels.update({event.key: event.label for event in new_schedule})
+        for manager in registry.managers().values():
+            manager.set_labels(labels)
+        prepared.clear()
+        scheduler.reschedule(new_schedule)
+
+    def _on_config_change(old: BotConfig, new: BotConfig, changed: Set[str]) -> None:
+        nonlocal test_role_name, initial_channel_id, debug_channel_id, message_retention_seconds, dispatch_concurrency
+        nonlocal alert_message_mode
+        test_role_name              = new.test_role_name
+        initial_channel_id          = new.default_channel_id
+        debug_channel_id            = new.debug_channel_id
+        message_retention_seconds   = new.message_retention_seconds
+        default_debug["channel_id"] = new.debug_channel_id
+        if changed & {"DEFAULT_CHANNEL_ID", "DEBUG_CHANNEL_ID", "MESSAGE_RETENTION_SECONDS"} and _sync_primary(new):
+            asyncio.create_task(registry.persist())
+        if "DISPATCH_CONCURRENCY" in changed:
+            dispatch_concurrency = new.dispatch_concurrency
+            dispatcher.set_concurrency(dispatch_concurrency)
+        if changed & {"ALERT_SCHEDULE", "ALERT_LEAD_SECONDS"}:
+            _apply_schedule(list(new.schedule))
+        if "ALERT_MESSAGE_MODE" in changed:
+            alert_message_mode = new.alert_message_mode
+            prepared.clear()    # 멘션 청크 머리글이 모드마다 다름
+            logging.info("알림 메시지 방식 변경: %s", alert_message_mode)
+        restart_keys = sorted(changed & set(RESTART_REQUIRED_KEYS))
+        if restart_keys:
+            logging.warning("재시작 후 반영되는 설정 변경: %s", ", ".join(restart_keys))
+
+    if config_loader is not None:
+        config_loader.add_listener(_on_config_change)
+
+    @tasks.loop(seconds=CONFIG_POLL_SECONDS, reconnect=True)
+    async def config_watch() -> None:
+        config_loader.reload()     # mtime 이 바뀐 경우에만 파싱
+
+    def _install_signal_handlers() -> None:
+        """SIGTERM(컨테이너 재배포 등)에도 close() 경로로 종료 → 큐 비우기/아웃박스·원장 저장"""
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(bot_instance.close()))
+        except (NotImplementedError, RuntimeError, ValueError):
+            logging.info("SIGTERM 핸들러 등록 불가(이 플랫폼/스레드) — 기본 종료 동작 사용")
+
+    # ----- 이벤트 -----
+    @bot_instance.event
+    async def on_ready():
+        nonlocal dispatcher_started
+        logging.info("%s 실행됨", bot_instance.user)
+        if not startup.finished:
+            gateway = startup.since("login")
+            if gateway is not None:
+                startup.record("gateway", gateway)
+            startup.mark("ready")
+        await _state_loaded()
+        # 디스패처는 이벤트 루프가 '실행 중'일 때 시작
+        # 단일 길드 시절 설정(DEFAULT_CHANNEL_ID + subscribed_users.json)을 해당 길드로 이관
+        legacy_channel = bot_instance.get_channel(initial_channel_id) if initial_channel_id else None
+        legacy_guild   = getattr(legacy_channel, "guild", None)
+        if legacy_guild is not None and registry.owns(legacy_guild.id):
+            registry.bootstrap(
+                legacy_guild.id,
+                channel_id=initial_channel_id,
+                debug_channel_id=debug_channel_id,
+                retention_seconds=message_retention_seconds,
+                subs_file=SUBSCRIBED_USERS_FILE,
+            )
+        if config_loader is not None:
+            _sync_primary(config_loader.snapshot)  # 꺼져 있는 동안 Config.json 을 고쳤어도 반영
+        for guild in bot_instance.guilds:
+            if registry.owns(guild.id):
+                registry.ensure(guild.id)
+        await registry.persist()
+
+        if not dispatcher_started:
+            _install_signal_handlers()
+            # 아웃박스의 미완료 잡이 먼저 복원되고, 아래 원장 재개 잡은 같은 멱등 키로 합쳐짐
+            dispatcher.start(worker_count=dispatch_concurrency)
+            dm_sender.start()
+            dispatcher_started = True
+            if metrics_server is not None:
+                try:
+                    await metrics_server.start()
+                except OSError:
+                    logging.exception("지표 엔드포인트 시작 실패(%s:%s) — 지표 수집 없이 계속", metrics_host, metrics_port)
+            # 재시작 전 끝내지 못한 알림 청크 이어서 전송(원장은 로그인과 함께 이미 적재됨)
+            for record, indices in ledger.resumable():
+                logging.info("미완료 알림 이어서 전송(%s, 청크 %d개)", record.key, len(indices))
+                await dispatcher.enqueue_many(_alert_jobs(record, indices))
+
+        logging.info("서비스 길드 %d곳(알림 채널 설정 %d곳)", len(registry), len(registry.routable()))
+        if not scheduler.is_running():
+            scheduler.start()
+        if clock.realtime and not loop_monitor.is_running():
+            # 시뮬레이션 시계는 처리 중 시간이 멈춰 있어 루프 지연이 의미 없음
+            loop_monitor.start()
+        if config_loader is not None and not config_watch.is_running():
+            config_watch.start()
+        if shard_plan.is_partial and not shared_state_refresh.is_running():
+            shared_state_refresh.start()
+        if role_mode:
+            role_sync.start()
+            for config in registry.routable():
+                registry.manager_for(config.guild_id)   # 리스너 등록
+                asyncio.create_task(_ensure_roles(config.guild_id))
+        if not startup.finished:
+            startup.record("ready", startup.since("ready") or 0.0)
+            startup.finish()
+            startup.log()     # --profile-startup 의 결과도 이 로그 1줄(종료 시 로거가 큐를 비움)
+            if startup.exit_after_ready:
+                await bot_instance.close()
+
+    # ------------- 명령어 -------------
+    @bot_instance.command(name="test_alert")
+    async def test_alert(ctx: commands.Context):
+        if not _has_role(ctx, test_role_name):
+            try:
+                msg = await ctx.send("😐 너 누구심?")
+                await asyncio.sleep(1)
+                await msg.delete()
+            except discord.Forbidden:
+                await ctx.send("❌ 권한이 없어 메시지를 삭제할 수 없습니다.")
+            except discord.HTTPException as e:
+                await ctx.send(f"❌ 메시지 삭제 중 오류가 발생했습니다: {e}")
+            except Exception as e:
+                await ctx.send("❌ 알 수 없는 오류가 발생했습니다.")
+                await _send_debug(f"test_alert 오류: {e}")
+            return
+        
+        await ctx.send("✅ 테스트 권한 확인 완료!")
+
+    @bot_instance.command(name="set_channel")
+    async def set_channel(ctx: commands.Context, new_channel_id: int):
+        if not _has_role(ctx, test_role_name):
+            await ctx.send("😐 너 누구심?")
+            return
+
+        if _guild_channel(ctx, new_channel_id) is None:
+            await ctx.send(f"채널 ID {new_channel_id}를 이 서버에서 찾을 수 없습니다.")
+            return
+
+        registry.update(ctx.guild.id, channel_id=int(new_channel_id))
+        await registry.persist()
+        await _write_back(ctx.guild.id, DEFAULT_CHANNEL_ID=int(new_channel_id))
+        if role_mode:
+            await _ensure_roles(ctx.guild.id)
+        await ctx.send(f"알림 채널 ID가 `{new_channel_id}`(으)로 변경되었습니다.")
+
+    @bot_instance.command(name="set_debug_channel")
+    async def set_debug_channel(ctx: commands.Context, new_channel_id: int):
+        if not _has_role(ctx, test_role_name):
+            await ctx.send("😐 너 누구심?")
+            return
+
+        if _guild_channel(ctx, new_channel_id) is None:
+            await ctx.send(f"채널 ID {new_channel_id}를 이 서버에서 찾을 수 없습니다.")
+            return
+
+        registry.update(ctx.guild.id, debug_channel_id=int(new_channel_id))
+        await registry.persist()
+        await _write_back(ctx.guild.id, DEBUG_CHANNEL_ID=int(new_channel_id))
+        await ctx.send(f"디버그 채널 ID가 `{new_channel_id}`(으)로 변경되었습니다.")
+
+    @bot_instance.command(name="set_retention_seconds")
+    async def set_retention_seconds(ctx: commands.Context, new_retention_seconds: int):
+        if not _has_role(ctx, test_role_name):
+            await ctx.send("😐 너 누구심?")
+            return
+
+        if new_retention_seconds < 0 or new_retention_seconds > MAX_RETENTION_SECONDS:
+            await ctx.send("❌ 0 ~ 21600(6h) 범위에서 설정하세요.")
+            return
+
+        if ctx.guild is None:
+            await ctx.send("❌ 서버 채널에서 실행하세요.")
+            return
+
+        registry.update(ctx.guild.id, retention_seconds=int(new_retention_seconds))
+        await registry.persist()
+        await _write_back(ctx.guild.id, MESSAGE_RETENTION_SECONDS=int(new_retention_seconds))
+        await ctx.send(f"알림 메시지 자동 삭제 시간을 `{new_retention_seconds}s`(으)로 변경했습니다.")
+
+    def _stats_text() -> str:
+        stats = dispatcher.stats
+        lines = [
+            "📊 **알림 봇 상태**",
+            f"- 대기열: 알림 {dispatcher.queue.qsize()} · DM {dm_sender.queue.qsize()} · 역할 {len(role_sync)} · 삭제 예정 {len(dispatcher.expiry)}",
+            f"- 전송: 성공 {stats.sent} · 수정 {stats.edited} · 실패 {stats.failed} · 마감 폐기 {stats.expired} · 429 {stats.rate_limited} · 5xx·네트워크 오류 {stats.server_errors}",
+            f"- API 전송 지연: {API_CALL_SECONDS.describe(route='send')}",
+        ]
+        for labels in FIRE_LATENESS_SECONDS.label_sets():
+            event = labels["event"]
+            lines.append(
+                f"- `{event}` 발사 지연 {FIRE_LATENESS_SECONDS.describe(event=event)} / "
+                f"전달 완료 {FIRE_TO_DELIVERY_SECONDS.describe(event=event)}"
+            )
+        lines += [
+            f"- 루프 지연: {loop_monitor.describe()} · 누적 {LOOP_LAG_SECONDS.describe()} · 블로킹 {loop_monitor.stalls}회",
+            f"- 구독 토글: {TOGGLE_SECONDS.describe()} · 저장: {SAVE_SECONDS.describe()}",
+            f"- DM: 성공 {dm_sender.stats.sent} · 실패 {dm_sender.stats.failed} · 차단 {dm_sender.stats.closed}",
+            f"- 스케줄 누락 {scheduler.missed}건 · 다음 발사 " + ", ".join(
+                f"{key} {fire_at.strftime('%H:%M')}" for key, fire_at in sorted(scheduler.next_fire_times().items())
+            ),
+        ]
+        return "\n".join(lines)
+
+    @bot_instance.command(name="stats")
+    async def stats(ctx: commands.Context):
+        if not _has_role(ctx, test_role_name):
+            await ctx.send("😐 너 누구심?")
+            return
+        await ctx.send(_stats_text())
+
+    @bot_instance.command(name="알림구독")
+    async def send_subscribe(ctx: commands.Context):
+        if not _has_role(ctx, test_role_name):
+            await ctx.send("😐 너 누구심?")
+        elif not ctx.author.id == 292505059806412801:
+            await ctx.send("😐 너 누구심?")
+
+        view  = SubscribeView(registry=registry, schedule=schedule)
+        embed = discord.Embed(
+            title="결계 & 정각 알리미 📢",
+            description=(
+                "버튼? 누르든 말든 네 맘대로 해~\n"
+                "두 번 누르면 해제? 뭐, 그딴 건 알아서 하라구!\n\n"
+                "결계 시간? 알려주긴 할 건데, 못 봤다고 찡찡대진 마.\n"
+                "귀찮게 굴지 마라, 알겠어?"
+            ),
+            color=discord.Color.dark_blue(),
+        )
+        embed.set_thumbnail(url="https://cdn.discordapp.com/attachments/your_thumbnail.png")
         await ctx.send(embed=embed, view=view)
\ No newline at end of file
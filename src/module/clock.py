@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import heapq
+import itertools
+import time
+
+from abc                    import (
+    ABC,
+    abstractmethod
+)
+from typing                 import (
+    Callable,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+SETTLE_ROUNDS: int          = 8         # 시뮬레이션: 이만큼 연속으로 조용한 루프 회전이면 '할 일 없음'으로 판단
+SETTLE_POLL_SECONDS: float  = 0.001     # 시뮬레이션: 외부 작업(스레드 등)이 남아 있을 때 실제로 기다리는 간격
+
+# --------------------------------------
+# 시계(시각/수면의 단일 출처)
+# --------------------------------------
+class Clock(ABC):
+    """
+    스케줄러·만료 타이머·레이트리밋·워치독이 함께 쓰는 시계 인터페이스.
+    - time()      : epoch 초(벽시계, 마감/발사 시각 비교용)
+    - monotonic() : 경과 시간 측정용(역행하지 않음)
+    - sleep()/wait(): 이 시계 기준으로 대기
+    realtime 이 False 면 실제 시간과 무관하게 흐르는 시계(루프 지연 감시 등 실시간 전용 기능은 끈다)
+    """
+    realtime: bool = True
+
+    @abstractmethod
+    def time(self) -> float:
+        ...
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        ...
+
+    def now(self, tz: Optional[dt.tzinfo] = None) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.time(), tz=tz or dt.timezone.utc)
+
+    @abstractmethod
+    async def sleep(self, seconds: float) -> None:
+        ...
+
+    @abstractmethod
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        """event 가 설정되거나 timeout 이 지날 때까지 대기. 설정됐으면 True"""
+
+class SystemClock(Clock):
+    """실제 시계(운영 기본값)"""
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def now(self, tz: Optional[dt.tzinfo] = None) -> dt.datetime:
+        return dt.datetime.now(tz=tz or dt.timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return event.is_set()
+
+SYSTEM_CLOCK = SystemClock()
+
+# 시뮬레이션 타이머: (깨어날 시각, 순번, 대기 future)
+SimTimer = Tuple[float, int, "asyncio.Future[None]"]
+
+class SimulatedClock(Clock):
+    """
+    이산 사건 시뮬레이션 시계. 시간은 스스로 흐르지 않고 run_until() 이 '다음 타이머 시각'으로 건너뛴다.
+    - 이벤트 루프에 할 일이 남아 있으면(연속 SETTLE_ROUNDS 회전 동안 타이머 등록/해제가 있거나 busy() 가 True)
+      건너뛰지 않음 → 발사·전송 처리가 끝난 뒤에만 시간이 흐름
+    - 모든 sleep 은 정확히 예정 시각에 깨어남 → 며칠~몇 주 스케줄을 수 초 만에 재생
+    - busy: asyncio 밖에서 진행 중인 작업(예: to_thread 파일 저장)을 알려 주는 콜백
+    """
+    realtime = False
+
+    def __init__(self, start: Union[dt.datetime, float], busy: Optional[Callable[[], bool]] = None) -> None:
+        self._now: float                = start.timestamp() if isinstance(start, dt.datetime) else float(start)
+        self._timers: List[SimTimer]    = []
+        self._seq                       = itertools.count()
+        self._activity: int             = 0     # 타이머 등록/깨움 횟수(조용한지 판정용)
+        self.busy                       = busy
+        self.steps: int                 = 0     # 시간 건너뛰기 횟수
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self._now + seconds, next(self._seq), waiter))
+        self._activity += 1
+        await waiter
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        if event.is_set():
+            return True
+        waiter  = asyncio.ensure_future(event.wait())
+        sleeper = asyncio.ensure_future(self.sleep(timeout))
+        try:
+            await asyncio.wait({waiter, sleeper}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (waiter, sleeper):
+                task.cancel()
+            await asyncio.gather(waiter, sleeper, return_exceptions=True)
+        return event.is_set()
+
+    def next_timer(self) -> Optional[float]:
+        """가장 이른 대기 시각(취소된 대기는 정리)"""
+        while self._timers and self._timers[0][2].done():
+            heapq.heappop(self._timers)
+        return self._timers[0][0] if self._timers else None
+
+    def advance_to(self, when: float) -> int:
+        """시각을 when 으로 옮기고 그때까지 만료된 대기를 깨운다. 깨운 수 반환"""
+        self._now = max(self._now, when)
+        woken = 0
+        while self._timers and self._timers[0][0] <= self._now:
+            _, _, waiter = heapq.heappop(self._timers)
+            if not waiter.done():
+                waiter.set_result(None)
+                woken += 1
+        self._activity += woken
+        return woken
+
+    async def settle(self) -> None:
+        """루프에 실행할 일이 없어질 때까지 양보"""
+        quiet = 0
+        while quiet < SETTLE_ROUNDS:
+            marker = self._activity
+            await asyncio.sleep(0)
+            if self.busy is not None and self.busy():
+                quiet = 0
+                await asyncio.sleep(SETTLE_POLL_SECONDS)
+                continue
+            quiet = quiet + 1 if marker == self._activity else 0
+
+    async def run_until(self, until: Union[dt.datetime, float]) -> int:
+        """until 까지 시간을 진행(다음 타이머로 건너뛰기 반복). 건너뛴 횟수 반환"""
+        end, steps = until.timestamp() if isinstance(until, dt.datetime) else float(until), 0
+        while True:
+            await self.settle()
+            when = self.next_timer()
+            if when is None or when > end:
+                self.advance_to(end)
+                await self.settle()
+                self.steps += steps
+                return steps
+            self.advance_to(when)
+            steps += 1
@@ -1,59 +1,367 @@
-import json
-from typing import Any, Dict, Optional
-
-class ConfigLoader:
-    """
-    Config.json 파일을 안전하게 읽어서 설정값을 반환하는 클래스
-
-    예시:
-        loader = ConfigLoader("/path/to/Config.json")
-        config = loader.load()
-        print(config["key"])
-    """
-    def __init__(self, config_path: str) -> None:
-        """
-        Args:
-            config_path (str): 읽을 Config.json 파일 경로
-        """
-        self.config_path = config_path
-
-    def load(self) -> Dict[str, Any]:
-        """
-        Config.json 파일을 읽어서 dict로 반환
-
-        Returns:
-            Dict[str, Any]: 설정값
-
-        Raises:
-            FileNotFoundError: 파일이 없을 때
-            json.JSONDecodeError: JSON 문법 오류
-        """
-        try:
-            with open(self.config_path, encoding="utf-8") as f:
-                config = json.load(f)
-            if not isinstance(config, dict):
-                raise ValueError("Config.json의 최상위 구조는 dict여야 합니다.")
-            return config
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {self.config_path}") from e
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"JSON 형식 오류: {e.msg}", e.doc, e.pos)
-        except Exception as e:
-            raise RuntimeError(f"설정 파일 로딩 실패: {e}") from e
-
-    def get(self, key: str, default: Optional[Any] = None) -> Any:
-        """
-        특정 키의 값을 반환. 없으면 default 반환
-
-        Args:
-            key (str): 조회할 키
-            default (Any, optional): 기본값
-
-        Returns:
-            Any: 설정값 또는 기본값
-        """
-        try:
-            config = self.load()
-            return config.get(key, default)
-        except Exception:
-            return default
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+
+from dataclasses            import (
+    dataclass,
+    fields
+)
+from json.decoder           import scanstring
+from typing                 import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple
+)
+from module.live_messages   import MESSAGE_MODES
+from module.logger          import (
+    LOG_FORMATS,
+    LOG_LEVELS
+)
+from module.metrics         import METRICS_HOST
+from module.schedule_table  import (
+    EventSpec,
+    load_schedule
+)
+from module.sharding        import (
+    ShardPlan,
+    parse_shard_plan
+)
+from module.user_store      import SUBSCRIPTION_BACKENDS
+
+# 멘션 방식: user = 구독자 개별 멘션, role = 구독 타입별 관리 역할 멘션(role_sync).
+# 설정 검증만을 위해 role_sync(→ discord)를 임포트하지 않도록 여기 둔다(시작 시 설정 로딩을 가볍게)
+MENTION_MODES: Tuple[str, ...]  = ("user", "role")
+CONFIG_POLL_SECONDS: float      = 5.0           # Config.json 변경(mtime) 확인 주기(초)
+MAX_RETENTION_SECONDS: int      = 3600 * 6      # 알림 자동 삭제 지연 상한(#set_retention_seconds 와 동일)
+# 실행 중에는 바꿀 수 없는 키(연결/저장소/샤드 배치가 바뀜) → 변경 시 경고만 남기고 재시작 때 반영
+RESTART_REQUIRED_KEYS: Tuple[str, ...] = (
+    "TOKEN", "SUBSCRIPTION_BACKEND", "SHARD_COUNT", "SHARD_IDS", "MENTION_MODE", "METRICS_PORT", "METRICS_HOST",
+    "LOG_FORMAT", "LOG_LEVEL",
+)
+
+# 설정 키 → BotConfig 필드
+CONFIG_KEYS: Dict[str, str] = {
+    "TOKEN"                     : "token",
+    "DEFAULT_CHANNEL_ID"        : "default_channel_id",
+    "DEBUG_CHANNEL_ID"          : "debug_channel_id",
+    "TEST_ROLE_NAME"            : "test_role_name",
+    "MESSAGE_RETENTION_SECONDS" : "message_retention_seconds",
+    "SUBSCRIPTION_BACKEND"      : "subscription_backend",
+    "ALERT_LEAD_SECONDS"        : "alert_lead_seconds",
+    "DISPATCH_CONCURRENCY"      : "dispatch_concurrency",
+    "MENTION_MODE"              : "mention_mode",
+    "ALERT_MESSAGE_MODE"        : "alert_message_mode",
+    "SHARD_COUNT"               : "shard_plan",
+    "SHARD_IDS"                 : "shard_plan",
+    "ALERT_SCHEDULE"            : "schedule",
+    "METRICS_PORT"              : "metrics_port",
+    "METRICS_HOST"              : "metrics_host",
+    "LOG_FORMAT"                : "log_format",
+    "LOG_LEVEL"                 : "log_level",
+}
+
+def _int_value(raw: Dict[str, Any], key: str, default: int, minimum: int = 0, maximum: Optional[int] = None) -> int:
+    value = raw.get(key, default)
+    if value is None:
+        value = default
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{key} 는 정수여야 합니다: {value!r}")
+    if value < minimum or (maximum is not None and value > maximum):
+        limit = f"{minimum} ~ {maximum}" if maximum is not None else f"{minimum} 이상"
+        raise ValueError(f"{key} 는 {limit} 범위여야 합니다: {value}")
+    return value
+
+def _str_value(raw: Dict[str, Any], key: str, default: str, choices: Optional[Tuple[str, ...]] = None) -> str:
+    value = raw.get(key, default)
+    if value is None:
+        value = default
+    if not isinstance(value, str):
+        raise ValueError(f"{key} 는 문자열이어야 합니다: {value!r}")
+    if choices is not None and value not in choices:
+        raise ValueError(f"{key} 는 {choices} 중 하나여야 합니다: {value!r}")
+    return value
+
+# --------------------------------------
+# 설정 스냅샷(파싱 + 검증 1회)
+# --------------------------------------
+@dataclass(frozen=True)
+class BotConfig:
+    """Config.json 을 한 번 파싱·검증한 불변 스냅샷. 재적재는 새 스냅샷으로 통째로 교체한다"""
+    token: str
+    default_channel_id: int         = 0
+    debug_channel_id: int           = 0
+    test_role_name: str             = ""
+    message_retention_seconds: int  = 600
+    subscription_backend: str       = "json"
+    alert_lead_seconds: int         = 60
+    dispatch_concurrency: int       = 8
+    mention_mode: str               = "user"
+    alert_message_mode: str         = "send"        # send = 발사마다 새 메시지, edit = 상태 메시지 수정
+    shard_plan: ShardPlan           = ShardPlan()
+    schedule: Tuple[EventSpec, ...] = ()
+    metrics_port: int               = 0             # 0 = /metrics 엔드포인트 끔
+    metrics_host: str               = METRICS_HOST
+    log_format: str                 = "text"        # text | json(한 줄 JSON, 구조화 필드 포함)
+    log_level: str                  = "INFO"
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "BotConfig":
+        """
+        Raises:
+            ValueError: 값의 형식/범위 오류(키 이름 포함)
+        """
+        token = _str_value(raw, "TOKEN", "")
+        if not token:
+            raise ValueError("TOKEN 이 비어 있습니다.")
+        alert_lead_seconds = _int_value(raw, "ALERT_LEAD_SECONDS", 60)
+        return cls(
+            token=token,
+            default_channel_id=_int_value(raw, "DEFAULT_CHANNEL_ID", 0),
+            debug_channel_id=_int_value(raw, "DEBUG_CHANNEL_ID", 0),
+            test_role_name=_str_value(raw, "TEST_ROLE_NAME", ""),
+            message_retention_seconds=_int_value(raw, "MESSAGE_RETENTION_SECONDS", 600, maximum=MAX_RETENTION_SECONDS),
+            subscription_backend=_str_value(raw, "SUBSCRIPTION_BACKEND", "json", SUBSCRIPTION_BACKENDS),
+            alert_lead_seconds=alert_lead_seconds,
+            dispatch_concurrency=_int_value(raw, "DISPATCH_CONCURRENCY", 8, minimum=1),
+            mention_mode=_str_value(raw, "MENTION_MODE", "user", MENTION_MODES),
+            alert_message_mode=_str_value(raw, "ALERT_MESSAGE_MODE", "send", MESSAGE_MODES),
+            shard_plan=parse_shard_plan(raw.get("SHARD_COUNT"), raw.get("SHARD_IDS")),
+            schedule=tuple(load_schedule(raw.get("ALERT_SCHEDULE"), alert_lead_seconds)),
+            metrics_port=_int_value(raw, "METRICS_PORT", 0, maximum=65535),
+            metrics_host=_str_value(raw, "METRICS_HOST", METRICS_HOST),
+            log_format=_str_value(raw, "LOG_FORMAT", "text", LOG_FORMATS),
+            log_level=_str_value(raw, "LOG_LEVEL", "INFO", LOG_LEVELS),
+        )
+
+    def changed_keys(self, other: "BotConfig") -> Set[str]:
+        """두 스냅샷 사이에 값이 바뀐 설정 키"""
+        changed_fields = {f.name for f in fields(self) if getattr(self, f.name) != getattr(other, f.name)}
+        return {key for key, name in CONFIG_KEYS.items() if name in changed_fields}
+
+# (이전 스냅샷, 새 스냅샷, 바뀐 설정 키) → None
+ConfigListener = Callable[[BotConfig, BotConfig, Set[str]], None]
+
+# --------------------------------------
+# 되쓰기(손으로 맞춘 정렬 유지)
+# --------------------------------------
+_WS = re.compile(r"\s*")
+
+def _top_level_spans(text: str) -> Dict[str, Tuple[int, int, int, int]]:
+    """최상위 객체의 키 → (키 따옴표 위치, 콜론 위치, 값 시작, 값 끝) 오프셋"""
+    decoder = json.JSONDecoder()
+    spans: Dict[str, Tuple[int, int, int, int]] = {}
+    i = _WS.match(text, 0).end()
+    if text[i:i + 1] != "{":
+        raise ValueError("Config.json의 최상위 구조는 dict여야 합니다.")
+    i = _WS.match(text, i + 1).end()
+    while text[i:i + 1] == '"':
+        quote       = i
+        key, i      = scanstring(text, i + 1)
+        colon       = _WS.match(text, i).end()
+        start       = _WS.match(text, colon + 1).end()
+        _, end      = decoder.raw_decode(text, start)
+        spans[key]  = (quote, colon, start, end)
+        i = _WS.match(text, end).end()
+        if text[i:i + 1] == ",":
+            i = _WS.match(text, i + 1).end()
+    return spans
+
+def patch_config_text(text: str, values: Dict[str, Any]) -> str:
+    """
+    Config.json 원문에서 values 의 최상위 키 값만 바꾼 텍스트를 반환(들여쓰기/정렬/키 순서 유지).
+    없는 키는 첫 키의 정렬을 따라 마지막에 추가.
+    """
+    spans = _top_level_spans(text)
+    for key in sorted((k for k in values if k in spans), key=lambda k: spans[k][2], reverse=True):
+        _, _, start, end = spans[key]
+        text = f"{text[:start]}{json.dumps(values[key], ensure_ascii=False)}{text[end:]}"
+    missing = [k for k in values if k not in spans]
+    if missing:
+        if spans:
+            quote, colon, start, _ = min(spans.values())
+            indent = text[text.rfind("\n", 0, quote) + 1:quote]
+            width, sep = colon - quote, text[colon + 1:start]
+        else:
+            indent, width, sep = "    ", 0, " "
+        lines = [
+            f"{indent}{json.dumps(k, ensure_ascii=False).ljust(width)}:{sep}{json.dumps(values[k], ensure_ascii=False)}"
+            for k in missing
+        ]
+        close = text.rindex("}")
+        body  = text[:close].rstrip()
+        glue  = "," if spans else ""
+        text  = f"{body}{glue}\n" + ",\n".join(lines) + f"\n{text[close:]}"
+    return text
+
+# --------------------------------------
+# 설정 로더(캐시 + mtime 감시 + 되쓰기)
+# --------------------------------------
+class ConfigLoader:
+    """
+    Config.json 파일을 안전하게 읽어서 설정값을 반환하는 클래스
+    - 파일은 처음 한 번만 파싱해 검증된 스냅샷(BotConfig)으로 보관 → get()/snapshot 은 파일 IO 없음
+    - reload(): 파일 mtime/크기가 바뀐 경우에만 다시 파싱, 검증을 통과하면 스냅샷을 원자적으로 교체하고
+      바뀐 키를 리스너에 통지(검증 실패 시 이전 설정 유지)
+    - write_back(): 명령어로 바꾼 값을 Config.json 에 원자적으로 되써서 재시작 후에도 유지
+
+    예시:
+        loader = ConfigLoader("/path/to/Config.json")
+        config = loader.snapshot
+        print(config.token, loader.get("TOKEN"))
+    """
+    def __init__(self, config_path: str) -> None:
+        """
+        Args:
+            config_path (str): 읽을 Config.json 파일 경로
+        """
+        self.config_path                        = config_path
+        self._raw: Optional[Dict[str, Any]]     = None
+        self._snapshot: Optional[BotConfig]     = None
+        self._stamp: Optional[Tuple[int, int]]  = None     # (mtime_ns, size)
+        self._listeners: List[ConfigListener]   = []
+        self._write_lock                        = asyncio.Lock()
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Config.json 파일을 읽어서 dict로 반환(캐시를 거치지 않음)
+
+        Returns:
+            Dict[str, Any]: 설정값
+
+        Raises:
+            FileNotFoundError: 파일이 없을 때
+            json.JSONDecodeError: JSON 문법 오류
+        """
+        try:
+            with open(self.config_path, encoding="utf-8") as f:
+                config = json.load(f)
+            if not isinstance(config, dict):
+                raise ValueError("Config.json의 최상위 구조는 dict여야 합니다.")
+            return config
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {self.config_path}") from e
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(f"JSON 형식 오류: {e.msg}", e.doc, e.pos)
+        except Exception as e:
+            raise RuntimeError(f"설정 파일 로딩 실패: {e}") from e
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        st = os.stat(self.config_path)
+        return st.st_mtime_ns, st.st_size
+
+    @property
+    def snapshot(self) -> BotConfig:
+        """
+        검증된 현재 설정(최초 접근 시 1회 파싱)
+
+        Raises:
+            FileNotFoundError / json.JSONDecodeError / RuntimeError / ValueError: 최초 적재 실패
+        """
+        if self._snapshot is None:
+            stamp = self._file_stamp()
+            raw   = self.load()
+            self._snapshot, self._raw, self._stamp = BotConfig.from_dict(raw), raw, stamp
+        return self._snapshot
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """
+        특정 키의 값을 반환. 없으면 default 반환(캐시된 원본에서 조회)
+
+        Args:
+            key (str): 조회할 키
+            default (Any, optional): 기본값
+
+        Returns:
+            Any: 설정값 또는 기본값
+        """
+        if self._raw is None:
+            try:
+                self._raw = self.load()
+            except Exception:
+                return default
+        return self._raw.get(key, default)
+
+    # ----- 변경 감시 -----
+    def add_listener(self, listener: ConfigListener) -> None:
+        self._listeners.append(listener)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        파일이 바뀌었으면 다시 파싱·검증해 스냅샷 교체.
+        Returns: 값이 바뀐 키가 있어 리스너에 통지했으면 True
+        """
+        try:
+            stamp = self._file_stamp()
+        except OSError as e:
+            logging.warning("설정 파일 확인 실패(이전 설정 유지): %s", e)
+            return False
+        if not force and stamp == self._stamp:
+            return False
+        self._stamp = stamp     # 잘못된 파일을 매 주기 다시 파싱하지 않도록 먼저 기록
+        try:
+            raw      = self.load()
+            snapshot = BotConfig.from_dict(raw)
+        except Exception as e:
+            logging.error("설정 재적재 실패(이전 설정 유지): %s", e)
+            return False
+        return self._apply(raw, snapshot)
+
+    def _apply(self, raw: Dict[str, Any], snapshot: BotConfig) -> bool:
+        previous                    = self._snapshot
+        self._raw, self._snapshot   = raw, snapshot
+        if previous is None:
+            return False
+        changed = snapshot.changed_keys(previous)
+        if not changed:
+            return False
+        logging.info("설정 변경 반영: %s", ", ".join(sorted(changed)))
+        for listener in list(self._listeners):
+            try:
+                listener(previous, snapshot, changed)
+            except Exception:
+                logging.exception("설정 변경 리스너 실패")
+        return True
+
+    # ----- 되쓰기 -----
+    def _write(self, values: Dict[str, Any]) -> Tuple[Dict[str, Any], BotConfig, Tuple[int, int]]:
+        """현재 파일에서 바뀐 키만 고쳐 검증 후 저장(fsync + 원자적 교체). (raw, 스냅샷, 파일 스탬프) 반환"""
+        with open(self.config_path, encoding="utf-8") as f:
+            text = f.read()
+        expected = {**json.loads(text), **values}
+        patched  = patch_config_text(text, values)
+        if json.loads(patched) != expected:
+            # 예상 밖의 원문 형식: 정렬을 포기하더라도 값은 정확히 저장
+            logging.warning("설정 파일 부분 갱신 실패 → 전체를 다시 씀(정렬 초기화)")
+            patched = json.dumps(expected, ensure_ascii=False, indent=4) + "\n"
+        snapshot = BotConfig.from_dict(expected)     # 검증 실패(ValueError) 시 파일은 그대로
+        tmp = f"{self.config_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(patched)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.config_path)
+        return expected, snapshot, self._file_stamp()
+
+    async def write_back(self, **values: Any) -> BotConfig:
+        """
+        설정 키 값을 바꿔 Config.json 에 원자적으로 저장하고 스냅샷에도 즉시 반영.
+        파일은 바뀐 키의 값 부분만 고쳐 씀 → 손으로 맞춘 정렬/키 순서/다른 키는 그대로.
+        예) await loader.write_back(DEFAULT_CHANNEL_ID=123)
+
+        Raises:
+            ValueError: 바꾼 결과가 검증을 통과하지 못할 때(파일은 그대로)
+            OSError: 파일 쓰기 실패
+        """
+        async with self._write_lock:    # 동시 명령이 서로의 변경을 덮어쓰지 않도록 직렬화
+            self.snapshot   # 최초 적재 보장
+            raw, snapshot, self._stamp = await asyncio.to_thread(self._write, values)  # 자기 쓰기로 인한 재적재 방지
+            self._apply(raw, snapshot)
+            return snapshot
@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+import uuid
+import discord
+
+from collections            import OrderedDict
+from dataclasses            import (
+    dataclass,
+    field
+)
+from discord.ext            import commands
+from typing                 import (
+    Any,
+    Callable,
+    List,
+    Dict,
+    Optional,
+    Tuple
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.expiry_engine   import (
+    MessageExpiryEngine,
+    PENDING_DELETIONS_FILE
+)
+from module.live_messages   import (
+    LIVE_MESSAGES_FILE,
+    LiveMessageStore
+)
+from module.metrics         import (
+    METRICS,
+    MetricsRegistry
+)
+from module.outbox          import (
+    OUTBOX_FILE,
+    MessageOutbox
+)
+from module.rate_limiter    import (
+    RouteRateLimiter,
+    parse_rate_limit,
+    jittered_backoff
+)
+
+# --------------------------------------
+# 메시지 디스패처(큐 + 세마포어 + 레이트리밋 + 재시도)
+# --------------------------------------
+# 숫자가 작을수록 먼저 처리
+PRIORITY_ALERT: int     = 0     # 시각이 중요한 알림
+PRIORITY_NORMAL: int    = 10    # 일반 메시지
+PRIORITY_LOW: int       = 20    # 정리/부가 작업
+
+SHUTDOWN_DRAIN_SECONDS: float   = 8.0       # 종료 시 큐를 비우는 예산(컨테이너 기본 종료 유예 10초 안)
+OUTBOX_FLUSH_SECONDS: float     = 1.0       # 완료 기록(done) 저장 디바운스
+COMPLETED_KEYS_MAX: int         = 10_000    # 최근 완료된 멱등 키 기억 개수(중복 적재 판정용)
+
+_GONE = object()  # 수정 호출 결과: 상태 메시지가 지워져 있음(404) → 새로 전송
+
+@dataclass
+class MessageJob:
+    channel_id: int
+    content: str
+    delete_after: Optional[int] = None  # 초
+    priority: int               = PRIORITY_NORMAL
+    deadline: Optional[float]   = None  # epoch 초(디스패처 clock 기준). 지나면 전송하지 않고 폐기
+    # 최종 결과 통지(True=전송 성공, False=실패/폐기). 발사 원장의 청크 상태 갱신용
+    on_result: Optional[Callable[[bool], None]] = field(default=None, repr=False, compare=False)
+    key: Optional[str]          = None  # 멱등 키(같은 키는 한 번만 적재/전송). 없으면 적재 시 자동 부여
+    live_key: Optional[str]     = None  # 상태 메시지 계열(설정 시 채널의 기존 상태 메시지를 수정, 없으면 새로 전송)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.deadline is not None and (time.time() if now is None else now) >= self.deadline
+
+    def to_row(self) -> Dict[str, Any]:
+        """아웃박스 기록용(결과 콜백 제외)"""
+        return {
+            "key": self.key, "channel_id": self.channel_id, "content": self.content,
+            "delete_after": self.delete_after, "priority": self.priority, "deadline": self.deadline,
+            "live_key": self.live_key,
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "MessageJob":
+        return cls(
+            channel_id=int(row["channel_id"]),
+            content=row["content"],
+            delete_after=row.get("delete_after"),
+            priority=int(row.get("priority", PRIORITY_NORMAL)),
+            deadline=row.get("deadline"),
+            key=row["key"],
+            live_key=row.get("live_key"),
+        )
+
+# 우선순위 큐 항목: (priority, deadline, 적재 순번, job) → 같은 우선순위면 마감 임박 순, 그다음 FIFO
+QueueEntry = Tuple[int, float, int, MessageJob]
+
+API_CALL_SECONDS = METRICS.histogram(
+    "alertbot_api_call_seconds", "레이트리밋 대기·재시도를 포함한 API 호출 1건의 소요 시간", ("route",)
+)
+
+@dataclass
+class DispatchStats:
+    """디스패처 누적 카운터"""
+    sent: int               = 0
+    edited: int             = 0     # 상태 메시지 수정(수정 모드)
+    failed: int             = 0
+    rate_limited: int       = 0     # 라이브러리 재시도 후에도 남은 429 횟수
+    server_errors: int      = 0     # 5xx 실패 + 네트워크 오류 재시도 횟수
+    expired: int            = 0     # 마감 초과로 폐기된 잡
+    rate_limit_wait: float  = 0.0   # 버킷/429 로 대기한 누적 시간(초)
+    by_route: Dict[str, int] = field(default_factory=dict)
+
+class MessageDispatcher:
+    """
+    큐 기반 메시지 전송기.
+    - 우선순위 큐: 항상 가장 급한(우선순위 → 마감 임박) 잡부터 처리
+    - 마감(deadline)이 지난 잡은 꺼내는 즉시/재시도 직전에 폐기하고 카운트
+    - concurrency 제한(세마포어)
+    - 채널/라우트별 슬라이딩 윈도 버킷(전송·삭제 예산 분리) + 전역 버킷
+    - 429/5xx: discord.py HTTPClient 가 내부에서 재시도 → 그 뒤 올라온 오류는 재시도하지 않음(429 는 버킷만 잠금)
+    - 네트워크 오류(라이브러리가 재시도하지 않음): 지터 지수 백오프 재시도(최대 3회)
+    - delete_after 가 설정된 경우 만료 엔진(MessageExpiryEngine)에 등록 → 일괄/영속 삭제
+    - 잡마다 최종 결과를 on_result 로 통지(정지로 취소된 잡은 통지하지 않음 → 재시작 시 이어서 전송)
+    - 아웃박스(MessageOutbox): 적재 전에 디스크에 기록, 최종 결과가 나면 완료 기록 → 최소 1회 전송.
+      같은 멱등 키는 한 번만 적재(원장 재개/아웃박스 복원이 겹쳐도 중복 전송 없음)
+    - stop(): SHUTDOWN_DRAIN_SECONDS 안에서 큐를 비우고, 남은 잡은 아웃박스에 남겨 다음 start() 때 재전송
+      (마감이 지난 잡은 복원 시 폐기)
+    - live_key 가 있는 잡: 채널 × 계열의 상태 메시지를 수정("edit" 라우트). 기록이 없거나 지워졌으면(404)
+      새로 보내고 ID 를 LiveMessageStore 에 저장. 상태 메시지는 자동 삭제하지 않음
+    """
+    MAX_ATTEMPTS: int           = 3     # 네트워크 오류 재시도 한도
+
+    def __init__(
+            self,
+            bot: commands.Bot,
+            concurrency: int = 2,
+            limiter: Optional[RouteRateLimiter] = None,
+            expiry_file_name: str = PENDING_DELETIONS_FILE,
+            clock: Clock = SYSTEM_CLOCK,
+            outbox_file_name: Optional[str] = OUTBOX_FILE,
+            live_file_name: str = LIVE_MESSAGES_FILE
+    ) -> None:
+        self.bot                                = bot
+        self.clock: Clock                       = clock
+        self.queue: asyncio.PriorityQueue[QueueEntry] = asyncio.PriorityQueue()
+        self.limiter: RouteRateLimiter          = limiter or RouteRateLimiter(clock=clock)
+        self.stats: DispatchStats               = DispatchStats()
+        self._sem                               = asyncio.Semaphore(concurrency)
+        self._workers: List[asyncio.Task]       = []
+        self._stopped                           = asyncio.Event()
+        self._seq                               = itertools.count()
+        self.in_flight: int                     = 0     # 큐에서 꺼내 처리 중인 잡(버킷 대기 포함)
+        self.expiry: MessageExpiryEngine        = MessageExpiryEngine(bot, self.call_limited, expiry_file_name, clock=clock)
+        self.outbox: Optional[MessageOutbox]    = MessageOutbox(outbox_file_name) if outbox_file_name else None
+        self._jobs: Dict[str, MessageJob]       = {}    # 적재됐지만 최종 결과가 안 난 잡(멱등 키 → 잡)
+        self._completed: "OrderedDict[str, bool]" = OrderedDict()
+        self._done_keys: List[str]              = []    # 아웃박스에 아직 기록하지 않은 완료 키
+        self._outbox_gate                       = asyncio.Lock()    # put 과 압축(스냅샷 ~ 교체)을 한 줄로 세움
+        self._flush_task: Optional[asyncio.Task] = None
+        self.live: LiveMessageStore             = LiveMessageStore(live_file_name)
+
+    def start(self, worker_count: int = 2) -> None:
+        # 이전 실행에서 끝내지 못한 잡을 워커보다 먼저 큐에 복원
+        self.live.load()
+        self._replay_outbox()
+        for _ in range(worker_count):
+            self._workers.append(asyncio.create_task(self._worker()))
+        # 재시작 전 남아 있던 삭제 예정 메시지 복원 후 만료 엔진 가동
+        self.expiry.load()
+        self.expiry.start()
+
+    def set_concurrency(self, concurrency: int) -> None:
+        """실행 중 동시 전송 수 변경(설정 재적재). 진행 중인 전송은 이전 세마포어로 끝까지 처리"""
+        self._sem = asyncio.Semaphore(concurrency)
+        if self._workers:
+            for _ in range(concurrency - len(self._workers)):
+                self._workers.append(asyncio.create_task(self._worker()))
+        logging.info("디스패처 동시 전송 수 변경: %d", concurrency)
+
+    def register_metrics(self, registry: MetricsRegistry = METRICS) -> None:
+        """누적 통계(DispatchStats)와 큐/삭제 대기 길이를 수집 시점에 읽어 가도록 등록"""
+        stats = self.stats
+        registry.gauge("alertbot_queue_depth", "전송 대기 중인 메시지 잡 수").set_function(self.queue.qsize)
+        registry.gauge("alertbot_dispatch_in_flight", "워커가 처리 중인 잡 수(레이트리밋 대기 포함)").set_function(
+            lambda: self.in_flight
+        )
+        registry.gauge("alertbot_pending_deletions", "자동 삭제 대기 메시지 수").set_function(lambda: len(self.expiry))
+        registry.counter("alertbot_messages_total", "메시지 잡 최종 결과", ("result",)).set_function(lambda: {
+            ("sent",): stats.sent, ("edited",): stats.edited, ("failed",): stats.failed, ("expired",): stats.expired,
+        })
+        registry.counter("alertbot_rate_limited_total", "429 응답 수").set_function(lambda: stats.rate_limited)
+        registry.counter("alertbot_server_errors_total", "5xx 실패 + 네트워크 오류 재시도 수").set_function(lambda: stats.server_errors)
+        registry.counter(
+            "alertbot_rate_limit_wait_seconds_total", "토큰 버킷/429 로 대기한 누적 시간"
+        ).set_function(lambda: stats.rate_limit_wait)
+        registry.counter("alertbot_api_calls_total", "라우트별 API 호출 시도 수", ("route",)).set_function(
+            lambda: {(route,): n for route, n in stats.by_route.items()}
+        )
+        registry.counter("alertbot_messages_deleted_total", "자동 삭제한 메시지 수").set_function(lambda: self.expiry.deleted)
+
+    async def stop(self, drain_timeout: float = SHUTDOWN_DRAIN_SECONDS) -> None:
+        """drain_timeout 안에서 남은 잡을 처리한 뒤 정지. 못 보낸 잡은 아웃박스에 남겨 다음 시작 때 재전송"""
+        if drain_timeout > 0 and self._workers and (self.queue.qsize() or self.in_flight):
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logging.warning("종료 예산(%.1fs) 안에 보내지 못한 잡 %d건 → 아웃박스에 보관", drain_timeout, len(self._jobs))
+        self._stopped.set()
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self.outbox is not None:
+            await self._flush_outbox(compact=True)
+            self.outbox.close()
+        await self.live.flush()
+        await self.expiry.stop()
+
+    # ----- 아웃박스(영속 큐) -----
+    def _replay_outbox(self) -> None:
+        """아웃박스의 미완료 잡 복원(마감이 지난 잡은 폐기)"""
+        if self.outbox is None:
+            return
+        try:
+            rows = self.outbox.load()
+        except Exception:
+            logging.exception("아웃박스 복원 실패(무시하고 새로 시작)")
+            return
+        now, restored = self.clock.time(), 0
+        for row in rows:
+            job = MessageJob.from_row(row)
+            if job.is_expired(now):
+                self.stats.expired += 1
+                self._complete(job, False)
+                continue
+            self._jobs[job.key] = job
+            self.queue.put_nowait(self._entry(job))
+            restored += 1
+        if rows:
+            logging.info("아웃박스 복원: 재전송 %d건, 마감 초과 폐기 %d건", restored, len(rows) - restored)
+
+    def _admit(self, job: MessageJob) -> bool:
+        """
+        멱등 키 확인 후 미완료 잡으로 등록. 이미 적재/완료된 키면 False
+        (복원된 잡에는 새 잡의 결과 콜백을 연결하고, 이미 끝난 키는 기억해 둔 결과를 바로 통지)
+        """
+        if job.key is None:
+            job.key = uuid.uuid4().hex
+        pending = self._jobs.get(job.key)
+        if pending is not None:
+            if pending.on_result is None:
+                pending.on_result = job.on_result
+            return False
+        if job.key in self._completed:
+            self._notify(job, self._completed[job.key])
+            return False
+        self._jobs[job.key] = job
+        return True
+
+    def _complete(self, job: MessageJob, ok: bool) -> None:
+        if job.key is None:
+            return
+        self._jobs.pop(job.key, None)
+        self._completed[job.key] = ok
+        if len(self._completed) > COMPLETED_KEYS_MAX:
+            self._completed.popitem(last=False)
+        if self.outbox is not None:
+            self._done_keys.append(job.key)
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """완료 기록이 몰려도 저장은 1초에 한 번(디바운스)"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+
+        async def flush_soon() -> None:
+            await asyncio.sleep(OUTBOX_FLUSH_SECONDS)
+            await self._flush_outbox()
+
+        self._flush_task = asyncio.create_task(flush_soon())
+
+    async def _flush_outbox(self, compact: bool = False) -> None:
+        async with self._outbox_gate:
+            keys, self._done_keys = self._done_keys, []
+            try:
+                await asyncio.to_thread(self.outbox.done_many, keys)
+                if compact or self.outbox.needs_compaction:
+                    # 스냅샷은 게이트 안에서 뜸 → 그 뒤 적재분의 put 은 교체가 끝난 새 파일에 붙음
+                    await asyncio.to_thread(self.outbox.compact, [job.to_row() for job in self._jobs.values()])
+            except Exception:
+                logging.exception("아웃박스 저장 실패")
+
+    def _entry(self, job: MessageJob) -> QueueEntry:
+        deadline = job.deadline if job.deadline is not None else math.inf
+        return (job.priority, deadline, next(self._seq), job)
+
+    async def enqueue(self, job: MessageJob) -> None:
+        await self.enqueue_many([job])
+
+    async def enqueue_many(self, jobs: List[MessageJob]) -> None:
+        """
+        분할된 알림 청크를 한 묶음으로 연속 적재(순번이 연속이라 같은 우선순위 안에서 순서 유지).
+        아웃박스 기록(fsync 1회)이 끝난 뒤 큐에 넣는다 → 적재된 잡은 크래시 후에도 재전송
+        """
+        admitted = [job for job in jobs if self._admit(job)]
+        if not admitted:
+            return
+        if self.outbox is not None:
+            async with self._outbox_gate:
+                ok = await asyncio.to_thread(self.outbox.put_many, [j.to_row() for j in admitted])
+            if not ok:
+                logging.warning("아웃박스 기록 실패(%d건) — 메모리 큐로만 전송", len(admitted))
+        for job in admitted:
+            self.queue.put_nowait(self._entry(job))
+
+    @staticmethod
+    def _notify(job: MessageJob, ok: bool) -> None:
+        if job.on_result is None:
+            return
+        try:
+            job.on_result(ok)
+        except Exception:
+            logging.exception("전송 결과 콜백 실패")
+
+    def _finish(self, job: MessageJob, ok: bool) -> None:
+        self._notify(job, ok)
+        self._complete(job, ok)
+
+    def _drop_expired(self, job: MessageJob, stage: str) -> bool:
+        now = self.clock.time()
+        if not job.is_expired(now):
+            return False
+        self.stats.expired += 1
+        logging.warning(
+            "마감 초과 잡 폐기(%s, 채널 ID=%s, 우선순위=%d, 초과 %.1fs) 누적 폐기=%d",
+            stage, job.channel_id, job.priority, now - job.deadline, self.stats.expired,
+            extra={"event": "job_expired", "job_id": job.key, "channel_id": job.channel_id},
+        )
+        return True
+
+    async def _worker(self) -> None:
+        while not self._stopped.is_set():
+            _, _, _, job = await self.queue.get()
+            self.in_flight += 1
+            try:
+                if self._drop_expired(job, "대기열"):
+                    self._finish(job, False)
+                    continue
+                async with self._sem:
+                    ok = await self._send_job(job)
+                self._finish(job, ok)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception("메시지 전송 작업 실패: %s", e)
+                self._finish(job, False)
+            finally:
+                self.in_flight -= 1
+                self.queue.task_done()
+
+    async def call_limited(self, route: str, channel_id: int, call, what: str, job: Optional[MessageJob] = None):
+        """
+        레이트리밋을 지키며 API 호출 1건을 수행한다(공개 API).
+        역할 동기화·DM 전송·만료 엔진도 이 메서드를 받아 써서 디스패처와 같은 버킷/전역 예산을 공유한다.
+        Returns: 호출 결과, 최종 실패(또는 마감 초과) 시 None
+        """
+        started = self.clock.monotonic()
+        try:
+            return await self._call_with_retries(route, channel_id, call, what, job)
+        finally:
+            API_CALL_SECONDS.observe(self.clock.monotonic() - started, route=route)
+
+    async def _call_with_retries(self, route: str, channel_id: int, call, what: str, job: Optional[MessageJob]):
+        # 429/5xx(500·502·504·524) 재시도는 discord.py HTTPClient 가 이미 수행(429 는 retry_after 대기, 최대 5회)
+        # → 여기까지 올라온 HTTP 오류는 라이브러리가 포기한 것이므로 버킷만 맞추고 다시 시도하지 않는다.
+        # 라이브러리가 재시도하지 않는 네트워크 오류(연결 끊김/타임아웃 등)만 지터 백오프로 재시도
+        attempt = 0
+        # 구조화 로그 필드(JSON 출력용)
+        fields = {"route": route, "channel_id": channel_id, "job_id": job.key if job is not None else None}
+        while True:
+            self.stats.rate_limit_wait += await self.limiter.acquire(route, channel_id)
+            if job is not None and self._drop_expired(job, "전송 직전"):
+                return None
+            self.stats.by_route[route] = self.stats.by_route.get(route, 0) + 1
+            try:
+                return await call()
+            except discord.Forbidden:
+                logging.error("%s 권한 없음(채널 ID=%s)", what, channel_id, extra={"event": "api_forbidden", **fields})
+                return None
+            except discord.NotFound:
+                logging.warning("%s 대상 없음(채널 ID=%s)", what, channel_id, extra={"event": "api_not_found", **fields})
+                return None
+            except (discord.HTTPException, discord.RateLimited) as e:
+                status = getattr(e, "status", 429)
+                info   = parse_rate_limit(e)
+                if status == 429:
+                    # 같은 버킷의 다음 호출이 다시 429 를 맞지 않도록 retry_after 만큼 잠금
+                    self.stats.rate_limited += 1
+                    wait = self.limiter.on_rate_limited(route, channel_id, info)
+                    logging.error("%s 429 — 라이브러리 재시도 소진, 포기(버킷 %.2fs 잠금, global=%s)",
+                                  what, wait, info.is_global, extra={"event": "api_failed", **fields})
+                    return None
+                self.limiter.on_response(route, channel_id, info)
+                if status >= 500:
+                    self.stats.server_errors += 1
+                logging.error("%s 실패(HTTP %s, 재시도 안 함): %s", what, status, e,
+                              extra={"event": "api_failed", "attempts": attempt + 1, **fields})
+                return None
+            except Exception as e:
+                attempt += 1
+                self.stats.server_errors += 1
+                logging.warning("%s 네트워크/예상치 못한 오류(%s) 시도 %d/%d", what, e, attempt, self.MAX_ATTEMPTS,
+                                extra={"event": "api_retry", "attempts": attempt, **fields})
+            if attempt >= self.MAX_ATTEMPTS:
+                return None
+            await self.clock.sleep(jittered_backoff(attempt))
+
+    async def _send_job(self, job: MessageJob) -> bool:
+        channel = self.bot.get_channel(job.channel_id)
+        if channel is None:
+            logging.warning("채널(ID=%s)을 찾지 못해 전송 스킵", job.channel_id)
+            return False
+
+        started = self.clock.monotonic()
+        if job.live_key is not None:
+            msg = await self._send_live(channel, job)
+        else:
+            msg = await self.call_limited(
+                "send", job.channel_id, lambda: channel.send(job.content), "메시지 전송", job
+            )
+            if msg is not None:
+                self.stats.sent += 1
+        if msg is None:
+            if not job.is_expired(self.clock.time()):
+                self.stats.failed += 1
+            return False
+        if job.delete_after and job.delete_after > 0 and job.live_key is None:
+            self.expiry.schedule(msg.channel.id, msg.id, job.delete_after)
+        logging.info("메시지 전송 성공", extra={
+            "event": "sent", "job_id": job.key, "channel_id": job.channel_id,
+            "latency_ms": round((self.clock.monotonic() - started) * 1000, 1),
+        })
+        return True
+
+    async def _send_live(self, channel, job: MessageJob):
+        """상태 메시지 수정(없거나 지워졌으면 새로 전송 후 ID 기록). 결과 메시지, 실패 시 None"""
+        message_id = self.live.get(job.channel_id, job.live_key)
+        if message_id is not None:
+            async def edit():
+                try:
+                    return await channel.get_partial_message(message_id).edit(content=job.content)
+                except discord.NotFound:
+                    return _GONE
+
+            msg = await self.call_limited("edit", job.channel_id, edit, "상태 메시지 수정", job)
+            if msg is not _GONE:
+                if msg is not None:
+                    self.stats.edited += 1
+                return msg
+            logging.info("상태 메시지(ID=%s)가 지워짐 → 새로 전송(채널 ID=%s)", message_id, job.channel_id)
+            self.live.forget(job.channel_id, job.live_key)
+
+        msg = await self.call_limited(
+            "send", job.channel_id, lambda: channel.send(job.content), "상태 메시지 전송", job
+        )
+        if msg is not None:
+            self.stats.sent += 1
+            self.live.set(job.channel_id, job.live_key, msg.id)
+        return msg
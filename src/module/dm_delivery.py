@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+import discord
+
+from collections            import OrderedDict
+from dataclasses            import dataclass
+from pathlib                import Path
+from typing                 import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.metrics         import (
+    METRICS,
+    MetricsRegistry
+)
+from module.outbox          import MessageOutbox
+from module.utils           import get_state_dir
+
+CLOSED_DMS_FILE: str            = "closed_dms.json"
+DM_OUTBOX_FILE: str             = "dm_outbox.jsonl"     # 적재했지만 아직 결과가 안 난 DM(재시작 시 재전송)
+DM_OUTBOX_FLUSH_SECONDS: float  = 1.0                   # 완료 기록(done) 저장 디바운스
+DM_WORKERS: int                 = 16                    # 동시 DM 전송 수(전역 버킷이 실제 속도를 제한)
+DM_CHANNEL_CACHE_SIZE: int      = 50_000                # user_id → DM 채널 캐시 최대 개수
+CLOSED_DM_TTL: float            = 24 * 3600             # DM 차단 사용자 재시도 유예(초)
+
+# (route, key, call, 설명) → 결과 | None  (MessageDispatcher.call_limited 와 동일 시그니처)
+LimitedCaller = Callable[..., Awaitable[object]]
+
+_CLOSED = object()  # 전송 호출 결과: 사용자가 DM 을 막아 둠(50007)
+
+@dataclass
+class DmJob:
+    user_id: int
+    content: str
+    deadline: Optional[float] = None    # epoch 초, 지나면 전송하지 않음
+    key: Optional[str]        = None    # 아웃박스 키(적재 시 자동 부여)
+
+    def is_expired(self, now: float) -> bool:
+        return self.deadline is not None and now >= self.deadline
+
+    def to_row(self) -> Dict[str, Any]:
+        return {"key": self.key, "user_id": self.user_id, "content": self.content, "deadline": self.deadline}
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "DmJob":
+        return cls(int(row["user_id"]), row["content"], row.get("deadline"), str(row["key"]))
+
+@dataclass
+class DmStats:
+    sent: int           = 0
+    failed: int         = 0
+    closed: int         = 0     # 이번에 새로 차단 확인된 사용자
+    skipped_closed: int = 0     # 차단 캐시로 건너뛴 전송
+    expired: int        = 0
+
+# --------------------------------------
+# DM 알림 전송기
+# --------------------------------------
+class DirectMessageSender:
+    """
+    DM 선호 구독자에게 알림을 보내는 전용 경로.
+    - 고정 크기 워커 풀(DM_WORKERS)이 큐를 소비 → 수천 명도 메모리/태스크 수 일정
+    - DM 채널 캐시(LRU): 채널 생성(open) API 는 사용자당 최초 1회
+    - DM 차단 사용자(403/50007)는 TTL 동안 기억해 매 알림마다 재시도하지 않음(config/closed_dms.json 영속)
+    - 모든 API 호출은 디스패처의 레이트리밋 호출기를 그대로 사용(전송은 채널별 "send", 채널 생성은 "dm_open")
+    - 아웃박스(MessageOutbox, config/dm_outbox.jsonl): 디스패처와 같은 put/done 기록 → 크래시 후에도 재전송(최소 1회)
+      deliver() 는 put 기록(fsync) 뒤에 큐에 넣고, 전송 성공/최종 실패/마감 폐기 시 done 기록
+      start() 는 미완료 DM 을 복원하고 파일을 그것만 남도록 압축, stop() 은 drain_timeout 안에서 큐를 비운 뒤 압축
+    """
+    def __init__(
+            self,
+            bot,
+            caller: LimitedCaller,
+            workers: int = DM_WORKERS,
+            file_name: str = CLOSED_DMS_FILE,
+            clock: Clock = SYSTEM_CLOCK,
+            outbox_file_name: Optional[str] = DM_OUTBOX_FILE
+    ) -> None:
+        self.bot                                    = bot
+        self.clock: Clock                           = clock
+        self._caller                                = caller
+        self.worker_count: int                      = workers
+        self._path: Path                            = get_state_dir() / file_name
+        self.queue: asyncio.Queue[DmJob]            = asyncio.Queue()
+        self._workers: List[asyncio.Task]           = []
+        self.outbox: Optional[MessageOutbox]        = MessageOutbox(outbox_file_name) if outbox_file_name else None
+        self._jobs: Dict[str, DmJob]                = {}    # 적재됐지만 결과가 안 난 DM(대기 + 전송 중)
+        self._done_keys: List[str]                  = []    # 아웃박스에 아직 기록하지 않은 완료 키
+        self._outbox_gate                           = asyncio.Lock()    # put 과 압축(스냅샷 ~ 교체)을 한 줄로 세움
+        self._flush_task: Optional[asyncio.Task]    = None
+        self._channels: "OrderedDict[int, object]"  = OrderedDict()
+        self._closed: Dict[int, float]              = {}    # user_id → 재시도 허용 시각(epoch)
+        self._closed_dirty: bool                    = False
+        self.stats: DmStats                         = DmStats()
+
+    # ----- 수명주기 -----
+    def start(self) -> None:
+        self._load_closed()
+        self._replay_outbox()
+        for _ in range(self.worker_count - len(self._workers)):
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def stop(self, drain_timeout: float = 0.0) -> None:
+        """drain_timeout 안에서 남은 DM 을 보낸 뒤 정지. 못 보낸 DM 은 아웃박스에 남겨 다음 시작 때 재전송"""
+        if drain_timeout > 0 and self._workers and self._jobs:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self._jobs:
+            logging.warning("DM %d건을 보내지 못하고 종료%s", len(self._jobs), " → 아웃박스에 보관" if self.outbox else "")
+        if self.outbox is not None:
+            await self._flush_outbox(compact=True)
+            self.outbox.close()
+        await self._save_closed()
+
+    # ----- 공개 API -----
+    async def deliver(self, user_ids: Iterable[int], content: str, deadline: Optional[float] = None) -> int:
+        """
+        사용자들에게 같은 본문을 DM 으로 보내도록 적재. 적재한 건수 반환(차단 캐시 사용자 제외).
+        아웃박스 기록(fsync 1회)이 끝난 뒤 큐에 넣는다 → 적재된 DM 은 크래시 후에도 재전송
+        """
+        now, jobs = self.clock.time(), []
+        for user_id in user_ids:
+            if self._closed.get(user_id, 0.0) > now:
+                self.stats.skipped_closed += 1
+                continue
+            job = DmJob(user_id, content, deadline, uuid.uuid4().hex)
+            self._jobs[job.key] = job
+            jobs.append(job)
+        if not jobs:
+            return 0
+        if self.outbox is not None:
+            async with self._outbox_gate:
+                ok = await asyncio.to_thread(self.outbox.put_many, [job.to_row() for job in jobs])
+            if not ok:
+                logging.warning("DM 아웃박스 기록 실패(%d건) — 메모리 큐로만 전송", len(jobs))
+        for job in jobs:
+            self.queue.put_nowait(job)
+        return len(jobs)
+
+    def register_metrics(self, registry: MetricsRegistry = METRICS) -> None:
+        stats = self.stats
+        registry.gauge("alertbot_dm_queue_depth", "전송 대기 중인 DM 수").set_function(self.queue.qsize)
+        registry.counter("alertbot_dm_total", "DM 전송 결과", ("result",)).set_function(lambda: {
+            ("sent",): stats.sent, ("failed",): stats.failed, ("closed",): stats.closed,
+            ("skipped_closed",): stats.skipped_closed, ("expired",): stats.expired,
+        })
+
+    def is_closed(self, user_id: int) -> bool:
+        return self._closed.get(user_id, 0.0) > self.clock.time()
+
+    # ----- 아웃박스(영속 큐) -----
+    def _replay_outbox(self) -> None:
+        """아웃박스의 미완료 DM 복원(마감이 지난 DM 은 폐기) 후 파일을 복원분만 남도록 압축"""
+        if self.outbox is None:
+            return
+        try:
+            rows = self.outbox.load()
+        except Exception:
+            logging.exception("DM 아웃박스 복원 실패(무시하고 새로 시작)")
+            return
+        now = self.clock.time()
+        for row in rows:
+            job = DmJob.from_row(row)
+            if job.is_expired(now):
+                self.stats.expired += 1
+                continue
+            self._jobs[job.key] = job
+            self.queue.put_nowait(job)
+        # 지난 실행의 done 기록·마감 지난 DM 을 걷어 냄(워커 시작 전이라 끼어드는 기록 없음)
+        self.outbox.compact([job.to_row() for job in self._jobs.values()])
+        if rows:
+            logging.info("DM 아웃박스 복원: 재전송 %d건, 마감 초과 폐기 %d건", len(self._jobs), len(rows) - len(self._jobs))
+
+    def _complete(self, job: DmJob) -> None:
+        self._jobs.pop(job.key, None)
+        if self.outbox is not None:
+            self._done_keys.append(job.key)
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """완료 기록이 몰려도 저장은 1초에 한 번(디바운스)"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+
+        async def flush_soon() -> None:
+            await asyncio.sleep(DM_OUTBOX_FLUSH_SECONDS)
+            await self._flush_outbox()
+
+        self._flush_task = asyncio.create_task(flush_soon())
+
+    async def _flush_outbox(self, compact: bool = False) -> None:
+        async with self._outbox_gate:
+            keys, self._done_keys = self._done_keys, []
+            try:
+                await asyncio.to_thread(self.outbox.done_many, keys)
+                if compact or self.outbox.needs_compaction:
+                    # 스냅샷은 게이트 안에서 뜸 → 그 뒤 적재분의 put 은 교체가 끝난 새 파일에 붙음
+                    await asyncio.to_thread(self.outbox.compact, [job.to_row() for job in self._jobs.values()])
+            except Exception:
+                logging.exception("DM 아웃박스 저장 실패")
+
+    # ----- 차단 캐시 영속화 -----
+    def _load_closed(self) -> None:
+        if not self._path.exists():
+            return
+        try:
+            with self._path.open("r", encoding="utf-8") as f:
+                rows = json.load(f)
+            now = self.clock.time()
+            self._closed = {int(u): float(t) for u, t in rows.items() if float(t) > now}
+        except Exception:
+            logging.exception("DM 차단 목록 복원 실패(무시)")
+
+    def _save(self, rows: Dict[str, float]) -> None:
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(rows, f)
+        os.replace(tmp, self._path)
+
+    async def _save_closed(self) -> None:
+        if not self._closed_dirty:
+            return
+        now  = self.clock.time()
+        rows = {str(u): t for u, t in self._closed.items() if t > now}
+        self._closed_dirty = False
+        try:
+            await asyncio.to_thread(self._save, rows)
+        except Exception:
+            logging.exception("DM 차단 목록 저장 실패")
+
+    def _mark_closed(self, user_id: int) -> None:
+        self._closed[user_id] = self.clock.time() + CLOSED_DM_TTL
+        self._channels.pop(user_id, None)
+        self._closed_dirty = True
+        self.stats.closed += 1
+
+    # ----- 내부 -----
+    async def _worker(self) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._send(job)
+            except Exception:
+                self.stats.failed += 1
+                logging.exception("DM 전송 작업 실패(user ID=%s)", job.user_id)
+            finally:
+                self.queue.task_done()
+            self._complete(job)     # 취소(종료)로 끊긴 DM 은 완료 기록 없이 남아 다음 시작 때 재전송
+            if self.queue.empty() and self._closed_dirty:
+                await self._save_closed()
+
+    async def _dm_channel(self, user_id: int):
+        channel = self._channels.get(user_id)
+        if channel is not None:
+            self._channels.move_to_end(user_id)
+            return channel
+        channel = await self._caller(
+            "dm_open", 0, lambda: self.bot.create_dm(discord.Object(id=user_id)), "DM 채널 생성"
+        )
+        if channel is None:
+            return None
+        self._channels[user_id] = channel
+        if len(self._channels) > DM_CHANNEL_CACHE_SIZE:
+            self._channels.popitem(last=False)
+        return channel
+
+    async def _send(self, job: DmJob) -> None:
+        if job.is_expired(self.clock.time()):
+            self.stats.expired += 1
+            return
+        channel = await self._dm_channel(job.user_id)
+        if channel is None:
+            self.stats.failed += 1
+            return
+
+        async def call():
+            try:
+                await channel.send(job.content)
+            except discord.Forbidden:
+                return _CLOSED
+            return True
+
+        result = await self._caller("send", channel.id, call, "DM 전송")
+        if result is _CLOSED:
+            self._mark_closed(job.user_id)
+            logging.info("DM 차단 사용자(user ID=%s) → %.0fh 동안 건너뜀", job.user_id, CLOSED_DM_TTL / 3600)
+        elif result:
+            self.stats.sent += 1
+        else:
+            self.stats.failed += 1
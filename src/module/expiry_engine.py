@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import discord
+
+from dataclasses            import dataclass
+from pathlib                import Path
+from typing                 import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.utils           import get_state_dir
+
+PENDING_DELETIONS_FILE: str     = "pending_deletions.json"
+
+BULK_DELETE_MAX: int            = 100                       # 디스코드 bulk-delete 1회 최대 개수
+BULK_DELETE_MAX_AGE: float      = 14 * 24 * 3600 - 60       # 14일 초과 메시지는 bulk-delete 불가(여유 1분)
+DISCORD_EPOCH_MS: int           = 1420070400000
+
+# (route, channel_id, call, 설명) → 결과 | None  (MessageDispatcher.call_limited 와 동일 시그니처)
+LimitedCaller = Callable[..., Awaitable[object]]
+
+def snowflake_created_at(message_id: int) -> float:
+    """스노플레이크 ID에서 생성 시각(epoch 초) 추출"""
+    return ((message_id >> 22) + DISCORD_EPOCH_MS) / 1000.0
+
+@dataclass(order=True, frozen=True)
+class PendingDeletion:
+    expire_at: float    # epoch 초
+    channel_id: int
+    message_id: int
+
+# --------------------------------------
+# 메시지 만료(자동 삭제) 엔진
+# --------------------------------------
+class MessageExpiryEngine:
+    """
+    메시지마다 sleep 태스크를 띄우는 대신, 단일 타이머 힙으로 만료를 관리한다.
+    - 가장 이른 만료 시각까지 한 번만 대기 → 만료된 것 + batch_window 안에 만료될 것을 한꺼번에 처리
+    - 채널별로 묶어 2개 이상이면 bulk-delete(최대 100개), 14일 초과/단건은 개별 삭제
+    - 대기 목록은 config/pending_deletions.json 에 저장 → 재시작 후 load() 로 이어서 삭제
+      (삭제 중인 배치는 채널 단위로 끝날 때까지 저장 대상에 남음 → stop() 이 도중에 끊어도 유실 없음)
+    - pause()/resume(): 발사 창 부하 차단(LoopMonitor) 동안 삭제를 미룸(만료된 것은 재개 후 한꺼번에)
+    """
+    def __init__(
+            self,
+            bot,
+            caller: LimitedCaller,
+            file_name: str = PENDING_DELETIONS_FILE,
+            batch_window: float = 2.0,
+            clock: Clock = SYSTEM_CLOCK
+    ) -> None:
+        self.bot                                = bot
+        self.clock: Clock                       = clock
+        self._caller                            = caller
+        self._path: Path                        = get_state_dir() / file_name
+        self.batch_window: float                = batch_window
+        self._heap: List[PendingDeletion]       = []
+        self._batch: Dict[int, List[PendingDeletion]] = {}  # 힙에서 꺼내 삭제 중인 배치(채널 → 항목), 끝나야 비움
+        self._wake                              = asyncio.Event()
+        self._resumed                           = asyncio.Event()
+        self._resumed.set()
+        self._task: Optional[asyncio.Task]      = None
+        self._save_task: Optional[asyncio.Task] = None
+        self._io_lock                           = threading.Lock()   # 디바운스 저장(워커 스레드)과 종료 시 저장이 겹칠 수 있음
+        self._no_bulk: Set[int]                 = set()     # bulk-delete 권한이 없는 채널
+        self.deleted: int                       = 0
+        self.api_calls: int                     = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    # ----- 영속화 -----
+    def load(self) -> int:
+        """저장된 대기 목록 복원. 복원한 개수 반환"""
+        if not self._path.exists():
+            return 0
+        try:
+            with self._path.open("r", encoding="utf-8") as f:
+                rows = json.load(f)
+            self._heap = [PendingDeletion(float(e), int(c), int(m)) for e, c, m in rows]
+            heapq.heapify(self._heap)
+            self._wake.set()
+            logging.info("삭제 대기 메시지 %d건 복원", len(self._heap))
+            return len(self._heap)
+        except Exception:
+            logging.exception("삭제 대기 목록 복원 실패(무시하고 새로 시작)")
+            return 0
+
+    def _save(self, rows: List[List[float]]) -> None:
+        with self._io_lock:
+            tmp = self._path.with_name(self._path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(rows, f)
+            os.replace(tmp, self._path)
+
+    def _rows(self) -> List[List[float]]:
+        # 삭제 중인 배치도 저장 → 도중에 끊겨도(종료/크래시) 재시작 후 이어서 삭제
+        pending = itertools.chain(self._heap, *self._batch.values())
+        return [[p.expire_at, p.channel_id, p.message_id] for p in pending]
+
+    def _schedule_save(self) -> None:
+        """변경이 몰려도 저장은 1초에 한 번(디바운스)"""
+        if self._save_task is not None and not self._save_task.done():
+            return
+
+        async def save_soon() -> None:
+            await asyncio.sleep(1.0)
+            try:
+                await asyncio.to_thread(self._save, self._rows())
+            except Exception:
+                logging.exception("삭제 대기 목록 저장 실패")
+
+        self._save_task = asyncio.create_task(save_soon())
+
+    # ----- 공개 API -----
+    def schedule(self, channel_id: int, message_id: int, after_seconds: float) -> None:
+        item = PendingDeletion(self.clock.time() + after_seconds, channel_id, message_id)
+        is_earliest = not self._heap or item < self._heap[0]
+        heapq.heappush(self._heap, item)
+        if is_earliest:
+            self._wake.set()
+        self._schedule_save()
+
+    def pause(self) -> None:
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        # 삭제 도중 취소된 배치는 힙으로 되돌림(이미 지운 메시지는 재시작 후 404 로 건너뜀)
+        for items in self._batch.values():
+            for item in items:
+                heapq.heappush(self._heap, item)
+        self._batch = {}
+        if self._save_task is not None:
+            self._save_task.cancel()
+        try:
+            await asyncio.to_thread(self._save, self._rows())
+        except Exception:
+            logging.exception("삭제 대기 목록 저장 실패(종료 시)")
+
+    # ----- 내부 -----
+    async def _run(self) -> None:
+        while True:
+            if not self._heap:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            delay = self._heap[0].expire_at - self.clock.time()
+            if delay > 0:
+                self._wake.clear()
+                await self.clock.wait(self._wake, delay)
+                continue
+            if self.paused:
+                await self._resumed.wait()
+                continue
+
+            horizon = self.clock.time() + self.batch_window
+            while self._heap and self._heap[0].expire_at <= horizon:
+                item = heapq.heappop(self._heap)
+                self._batch.setdefault(item.channel_id, []).append(item)
+            for channel_id in list(self._batch):
+                try:
+                    await self._delete_channel_batch(channel_id, [item.message_id for item in self._batch[channel_id]])
+                except Exception:
+                    logging.exception("만료 메시지 삭제 중 예외(채널 ID=%s)", channel_id)
+                del self._batch[channel_id]     # 채널 배치가 끝난 뒤에만 대기 목록에서 뺌
+            self._schedule_save()
+
+    async def _delete_channel_batch(self, channel_id: int, message_ids: List[int]) -> None:
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            logging.warning("채널(ID=%s)을 찾지 못해 만료 메시지 %d건 삭제 포기", channel_id, len(message_ids))
+            return
+
+        now     = self.clock.time()
+        bulk, singles = [], []
+        for m in message_ids:
+            eligible = channel_id not in self._no_bulk and now - snowflake_created_at(m) < BULK_DELETE_MAX_AGE
+            (bulk if eligible else singles).append(m)
+
+        for i in range(0, len(bulk), BULK_DELETE_MAX):
+            chunk = bulk[i:i + BULK_DELETE_MAX]
+            if len(chunk) < 2:
+                singles.extend(chunk)
+                continue
+            if not await self._bulk_delete(channel, chunk):
+                singles.extend(chunk)
+
+        for message_id in singles:
+            self.api_calls += 1
+            ok = await self._caller(
+                "delete", channel_id, self._single_delete_call(channel, message_id), "메시지 삭제"
+            )
+            if ok:
+                self.deleted += 1
+
+    async def _bulk_delete(self, channel, message_ids: List[int]) -> bool:
+        async def call() -> bool:
+            try:
+                await channel.delete_messages([discord.Object(id=m) for m in message_ids])
+            except discord.Forbidden:
+                # Manage Messages 권한 없음 → 이 채널은 앞으로 개별 삭제
+                self._no_bulk.add(channel.id)
+                logging.warning("bulk-delete 권한 없음(채널 ID=%s) → 개별 삭제로 전환", channel.id)
+                return False
+            return True
+
+        self.api_calls += 1
+        ok = await self._caller("delete", channel.id, call, "메시지 일괄 삭제")
+        if ok:
+            self.deleted += len(message_ids)
+        return bool(ok)
+
+    @staticmethod
+    def _single_delete_call(channel, message_id: int):
+        async def call() -> bool:
+            await channel.get_partial_message(message_id).delete()
+            return True
+        return call
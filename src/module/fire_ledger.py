@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import logging
+import os
+import threading
+import time
+
+from dataclasses            import (
+    dataclass,
+    field
+)
+from pathlib                import Path
+from typing                 import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    TextIO,
+    Tuple
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.utils           import get_state_dir
+
+FIRE_LEDGER_FILE: str           = "fire_ledger.jsonl"
+LEDGER_RETENTION_SECONDS: float = 48 * 3600     # 완료된 기록 보관 기간
+LEDGER_COMPACT_THRESHOLD: int   = 1000          # 추가 레코드가 이만큼 쌓이면 살아 있는 기록만 남겨 다시 씀
+
+# 원장 로그 레코드
+OP_CLAIM: str   = "claim"   # 슬롯 선점(기록 전체). 같은 키는 처음 것만 유효
+OP_MARK: str    = "mark"    # 청크 1개의 전송 결과
+OP_EXPIRE: str  = "expire"  # 재시작 시 마감이 지나 포기
+
+# 발사(슬롯) 상태
+STATUS_SENDING: str     = "sending"     # 청크 전송 중(재시작 시 이어서 전송)
+STATUS_DELIVERED: str   = "delivered"   # 모든 청크 전송 성공
+STATUS_PARTIAL: str     = "partial"     # 일부 청크 실패/마감 초과
+STATUS_EXPIRED: str     = "expired"     # 재시작 시점에 이미 마감이 지나 포기
+
+# 청크 상태
+CHUNK_PENDING: str      = "pending"
+CHUNK_SENT: str         = "sent"
+CHUNK_FAILED: str       = "failed"
+
+def slot_key(event_key: str, fire_at: dt.datetime, guild_id: int = 0) -> str:
+    """(길드, 이벤트, 발사 시각) → 기록 키. 예: 1234:minute_5_before@2025-08-01T12:55+09:00"""
+    return f"{guild_id}:{event_key}@{fire_at.isoformat(timespec='minutes')}"
+
+@dataclass
+class FireRecord:
+    """발사 1회(길드 × 이벤트 × 시각 슬롯)의 전송 기록"""
+    event: str
+    fire_at: str                        # ISO 8601
+    channel_id: int
+    delete_after: Optional[int]
+    deadline: float                     # epoch 초
+    chunks: List[str]                   # 본문(완료되면 비워서 파일 크기 유지)
+    states: List[str]                   # 청크별 상태
+    status: str                         = STATUS_SENDING
+    updated: float                      = field(default_factory=time.time)
+    guild_id: int                       = 0
+    live_family: Optional[str]          = None  # 수정 모드: 0번 청크는 이 계열의 상태 메시지(수정), 나머지는 멘션 전용
+
+    @classmethod
+    def create(
+            cls,
+            event_key: str,
+            fire_at: dt.datetime,
+            guild_id: int,
+            channel_id: int,
+            delete_after: Optional[int],
+            deadline: float,
+            chunks: List[str],
+            live_family: Optional[str] = None
+    ) -> "FireRecord":
+        return cls(
+            event=event_key,
+            fire_at=fire_at.isoformat(timespec="minutes"),
+            channel_id=channel_id,
+            delete_after=delete_after,
+            deadline=deadline,
+            chunks=list(chunks),
+            states=[CHUNK_PENDING] * len(chunks),
+            guild_id=guild_id,
+            live_family=live_family,
+        )
+
+    @property
+    def key(self) -> str:
+        return f"{self.guild_id}:{self.event}@{self.fire_at}"
+
+    def pending_indices(self) -> List[int]:
+        return [i for i, s in enumerate(self.states) if s == CHUNK_PENDING]
+
+    def to_row(self) -> Dict[str, Any]:
+        return self.__dict__.copy()
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "FireRecord":
+        return cls(**row)
+
+# --------------------------------------
+# 발사 원장(재시작 안전한 중복/누락 방지)
+# --------------------------------------
+class FireLedger:
+    """
+    알림 발사를 (길드, 이벤트, 시각 슬롯) 단위로 기록하는 영속 원장(추가 전용 JSONL).
+    - claim_many(): 확인 + 기록을 await 없이 한 번에 수행 → 같은 슬롯은 한 번만 발사(재시작 후 따라잡기 포함)
+      선점한 기록만 claim 레코드로 추가하고 fsync 한 뒤 전송(발사마다 원장 전체를 다시 쓰지 않음)
+    - mark(): 청크별 전송 결과를 mark 레코드로 모아 두었다가 1초 디바운스로 추가(fsync 없음)
+    - resumable(): 재시작 시 아직 마감 전인 '전송 중' 슬롯의 미전송 청크를 돌려줌
+      (전송 직후 결과 기록 전에 죽으면 해당 청크는 한 번 더 나갈 수 있음: 최소 1회 전송)
+    - 추가 레코드가 compact_threshold 개 쌓이면 다음 디바운스 저장(또는 종료) 때 보관 기간 안의 기록만 담은
+      파일로 원자적 교체
+    - 파일 쓰기는 모두 _write_gate 로 한 줄로 세워 워커 스레드에서 수행 → 압축 스냅샷과 추가가 엇갈리지 않음
+    - 마지막 줄이 잘린 경우(쓰기 도중 크래시) 해당 줄부터 무시하고 파일도 그 앞까지 잘라 냄
+    """
+    def __init__(
+            self,
+            file_name: str = FIRE_LEDGER_FILE,
+            clock: Clock = SYSTEM_CLOCK,
+            compact_threshold: int = LEDGER_COMPACT_THRESHOLD,
+            fsync: bool = True
+    ) -> None:
+        self._path: Path                        = get_state_dir() / file_name
+        self.clock: Clock                       = clock
+        self.compact_threshold: int             = compact_threshold
+        self._fsync: bool                       = fsync
+        self._records: Dict[str, FireRecord]    = {}
+        self._unwritten: List[str]              = []     # 아직 파일에 쓰지 않은 mark/expire 레코드
+        self._appended: int                     = 0      # 마지막 압축 이후 파일에 쌓인 레코드 수
+        self._save_task: Optional[asyncio.Task] = None
+        self._write_gate                        = asyncio.Lock()     # 추가/압축 순서 보장(이벤트 루프 쪽)
+        self._io_lock                           = threading.Lock()   # 파일 핸들 보호(워커 스레드 쪽)
+        self._fh: Optional[TextIO]              = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # ----- 복원 -----
+    def load(self) -> int:
+        """저장된 원장 복원(시작 시 워커 스레드에서 호출). 복원한 기록 수 반환"""
+        legacy = self._path.with_suffix(".json")
+        try:
+            if self._path.exists():
+                self._appended = self._replay()
+            elif legacy.exists():
+                # 이전 형식(JSON 배열 전체 저장) → 다음 저장 때 JSONL 로 압축
+                with legacy.open("r", encoding="utf-8") as f:
+                    rows = json.load(f)
+                self._records  = {r.key: r for r in (FireRecord.from_row(row) for row in rows)}
+                self._appended = self.compact_threshold
+        except Exception:
+            logging.exception("발사 원장 복원 실패(무시하고 새로 시작)")
+            self._records = {}
+            return 0
+        if self._records:
+            logging.info("발사 원장 %d건 복원", len(self._records))
+        return len(self._records)
+
+    def _replay(self) -> int:
+        applied = 0
+        good    = 0     # 마지막으로 온전히 적용한 줄 끝의 바이트 오프셋
+        with self._path.open("rb") as f:
+            for line_no, line in enumerate(f, start=1):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("개행 없는 마지막 줄")
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError, IndexError):
+                    logging.warning("발사 원장 손상 레코드 무시(%s:%d) — 이후 꼬리 폐기", self._path.name, line_no)
+                    break
+                applied += 1
+                good    += len(line)
+            size = f.seek(0, os.SEEK_END)
+        if good < size:
+            with self._path.open("r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        return applied
+
+    def _apply(self, row: Dict[str, Any]) -> None:
+        op = row.pop("op")
+        if op == OP_CLAIM:
+            record = FireRecord.from_row(row)
+            self._records.setdefault(record.key, record)
+        elif op == OP_MARK:
+            record = self._records.get(row["key"])
+            if record is not None:
+                self._set_state(record, int(row["i"]), bool(row["ok"]), float(row["at"]))
+        elif op == OP_EXPIRE:
+            record = self._records.get(row["key"])
+            if record is not None and record.status == STATUS_SENDING:
+                self._expire(record, float(row["at"]))
+
+    # ----- 상태 전이(실행 중/재생 공용) -----
+    @staticmethod
+    def _set_state(record: FireRecord, index: int, ok: bool, now: float) -> bool:
+        if record.states[index] != CHUNK_PENDING:
+            return False
+        record.states[index] = CHUNK_SENT if ok else CHUNK_FAILED
+        record.updated       = now
+        if not record.pending_indices():
+            record.status = STATUS_DELIVERED if all(s == CHUNK_SENT for s in record.states) else STATUS_PARTIAL
+            record.chunks = []
+        return True
+
+    @staticmethod
+    def _expire(record: FireRecord, now: float) -> None:
+        record.status  = STATUS_EXPIRED
+        record.chunks  = []
+        record.updated = now
+
+    # ----- 기록(워커 스레드) -----
+    def _append(self, lines: List[str], fsync: bool) -> None:
+        with self._io_lock:
+            if self._fh is None:
+                self._fh = self._path.open("a", encoding="utf-8")
+            self._fh.writelines(lines)
+            self._fh.flush()
+            if fsync:
+                os.fsync(self._fh.fileno())
+
+    def _compact(self, rows: List[Dict[str, Any]]) -> None:
+        lines = [json.dumps({"op": OP_CLAIM, **row}, ensure_ascii=False) + "\n" for row in rows]
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            tmp = self._path.with_name(self._path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                f.writelines(lines)
+                f.flush()
+                if self._fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp, self._path)
+            self._path.with_suffix(".json").unlink(missing_ok=True)     # 이전 형식 파일
+
+    # ----- 기록(이벤트 루프) -----
+    def _snapshot(self) -> List[Dict[str, Any]]:
+        """보관 기간이 지난 완료 기록은 정리하고, 스레드에서 직렬화할 사본을 뜬다"""
+        cutoff = self.clock.time() - LEDGER_RETENTION_SECONDS
+        for key in [k for k, r in self._records.items() if r.status != STATUS_SENDING and r.updated < cutoff]:
+            del self._records[key]
+        return [{**r.to_row(), "chunks": list(r.chunks), "states": list(r.states)} for r in self._records.values()]
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._appended + len(self._unwritten) >= self.compact_threshold
+
+    async def _write(self, lines: Optional[List[str]] = None, fsync: bool = False, compact: bool = False) -> None:
+        """밀린 mark/expire 레코드와 lines 를 순서대로 추가. compact 면 대신 살아 있는 기록만 남겨 다시 씀"""
+        async with self._write_gate:
+            batch, self._unwritten = self._unwritten + (lines or []), []
+            if compact:
+                # 스냅샷은 메모리 상태 그대로라 batch 도 이미 반영돼 있음
+                await asyncio.to_thread(self._compact, self._snapshot())
+                self._appended = 0
+            elif batch:
+                await asyncio.to_thread(self._append, batch, fsync)
+                self._appended += len(batch)
+
+    def _schedule_save(self) -> None:
+        """청크 결과가 몰려도 기록은 1초에 한 번(디바운스)"""
+        if self._save_task is not None and not self._save_task.done():
+            return
+
+        async def save_soon() -> None:
+            await asyncio.sleep(1.0)
+            try:
+                await self._write(compact=self.needs_compaction)
+            except Exception:
+                logging.exception("발사 원장 저장 실패")
+
+        self._save_task = asyncio.create_task(save_soon())
+
+    async def stop(self) -> None:
+        if self._save_task is not None:
+            self._save_task.cancel()
+        try:
+            await self._write(compact=True)
+        except Exception:
+            logging.exception("발사 원장 저장 실패(종료 시)")
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ----- 공개 API -----
+    def has(self, event_key: str, fire_at: dt.datetime, guild_id: int = 0) -> bool:
+        return slot_key(event_key, fire_at, guild_id) in self._records
+
+    async def claim_many(self, records: List[FireRecord]) -> List[FireRecord]:
+        """
+        슬롯들을 선점하고 선점한 기록만 디스크에 한 번에 추가한다.
+        Returns: 실제로 선점한 기록(이미 발사된 슬롯은 제외)
+        """
+        claimed = [r for r in records if r.key not in self._records]
+        for record in claimed:
+            record.updated            = self.clock.time()
+            self._records[record.key] = record   # 여기까지 await 없음 → 확인/선점이 원자적
+        if claimed:
+            lines = [json.dumps({"op": OP_CLAIM, **r.to_row()}, ensure_ascii=False) + "\n" for r in claimed]
+            try:
+                await self._write(lines, fsync=self._fsync)
+            except Exception:
+                logging.exception("발사 원장 저장 실패(%d건) — 전송은 계속", len(claimed))
+            if self.needs_compaction:
+                self._schedule_save()   # 압축은 발사 경로 밖(디바운스 저장)에서
+        return claimed
+
+    async def claim(self, record: FireRecord) -> Optional[FireRecord]:
+        claimed = await self.claim_many([record])
+        return claimed[0] if claimed else None
+
+    def mark(self, key: str, index: int, ok: bool) -> None:
+        """청크 1개의 전송 결과 반영. 모든 청크가 끝나면 슬롯 상태 확정"""
+        record = self._records.get(key)
+        now    = self.clock.time()
+        if record is None or not self._set_state(record, index, ok, now):
+            return
+        if record.status != STATUS_SENDING:
+            logging.info("알림 전송 완료(%s): %s", key, record.status)
+        self._unwritten.append(json.dumps({"op": OP_MARK, "key": key, "i": index, "ok": ok, "at": now}) + "\n")
+        self._schedule_save()
+
+    def resumable(self, now: Optional[float] = None) -> List[Tuple[FireRecord, List[int]]]:
+        """
+        재시작 시 이어서 보낼 (기록, 미전송 청크 인덱스) 목록.
+        마감이 지난 '전송 중' 기록은 expired 로 확정한다.
+        """
+        now = self.clock.time() if now is None else now
+        result: List[Tuple[FireRecord, List[int]]] = []
+        for record in self._records.values():
+            if record.status != STATUS_SENDING:
+                continue
+            if record.deadline <= now:
+                self._expire(record, now)
+                self._unwritten.append(json.dumps({"op": OP_EXPIRE, "key": record.key, "at": now}) + "\n")
+                logging.warning("미완료 알림(%s)은 마감이 지나 재전송 포기", record.key)
+                continue
+            result.append((record, record.pending_indices()))
+        if self._unwritten:
+            self._schedule_save()
+        return result
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+
+from dataclasses            import (
+    asdict,
+    dataclass,
+    field
+)
+from pathlib                import Path
+from typing                 import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set
+)
+from module.subscription_manager import SubscriptionManager
+from module.utils           import get_state_dir
+
+GUILDS_DIR: str                 = "guilds"                              # 길드별 설정 파일(<길드ID>.json)
+LEGACY_GUILDS_FILE: str         = "guilds.json"                         # 단일 파일 시절 설정(1회 이관)
+GUILD_SUBS_FILE_TEMPLATE: str   = "subscribed_users.{guild_id}.json"   # 길드별 구독 네임스페이스
+
+# (길드 ID, 구독 파일명) → 매니저 (백엔드/스케줄/리스너 주입은 호출자가 결정)
+ManagerFactory = Callable[[int, str], SubscriptionManager]
+# 길드 ID → 이 프로세스 담당 여부(샤드 배치)
+OwnsGuild      = Callable[[int], bool]
+
+@dataclass
+class GuildConfig:
+    """길드 1곳의 알림 라우팅 설정"""
+    guild_id: int
+    channel_id: int         = 0     # 운영(알림) 채널, 0 = 미설정(발사 대상 제외)
+    debug_channel_id: int   = 0     # 0 = 전역 디버그 채널 사용
+    retention_seconds: int  = 600   # 알림 자동 삭제 지연(초)
+    subs_file: str          = ""    # 구독 저장 파일명(네임스페이스)
+    role_ids: Dict[str, int] = field(default_factory=dict)  # 역할 멘션 모드: 구독 타입 → 관리 역할 ID
+
+    def __post_init__(self) -> None:
+        if not self.subs_file:
+            self.subs_file = GUILD_SUBS_FILE_TEMPLATE.format(guild_id=self.guild_id)
+
+# --------------------------------------
+# 길드 레지스트리(길드별 채널/보존시간/구독 네임스페이스)
+# --------------------------------------
+class GuildRegistry:
+    """
+    한 프로세스가 여러 길드를 서비스하기 위한 길드 ID 색인 설정 + 구독 매니저 묶음.
+    - 설정은 길드마다 config/guilds/<길드ID>.json 에 원자적으로 저장(바뀐 길드만 다시 씀)
+      → 샤드를 나눠 맡은 여러 프로세스가 서로의 길드 설정을 덮어쓰지 않음
+    - owns 로 이 프로세스가 담당하는 길드만 적재/발사 대상으로 삼음
+    - 구독 매니저는 길드마다 별도 파일(subs_file)로 분리, 처음 필요할 때 생성
+    - 단일 길드 시절 설정(DEFAULT_CHANNEL_ID, subscribed_users.json)은 bootstrap() 으로 첫 길드에 이관
+    """
+    def __init__(self, manager_factory: ManagerFactory, owns: Optional[OwnsGuild] = None) -> None:
+        self._factory                                   = manager_factory
+        self._owns: OwnsGuild                           = owns or (lambda guild_id: True)
+        self._dir: Path                                 = get_state_dir() / GUILDS_DIR
+        self._configs: Dict[int, GuildConfig]           = {}
+        self._managers: Dict[int, SubscriptionManager]  = {}
+        self._dirty: Set[int]                           = set()
+        self._manager_lock                              = threading.Lock()   # 시작 시 워커 스레드 적재와 명령 처리가 겹칠 때
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._configs
+
+    # ----- 영속화 -----
+    def load(self) -> int:
+        """담당 길드 설정 복원. 복원한 개수 반환"""
+        rows: List[dict] = []
+        try:
+            if self._dir.exists():
+                for path in self._dir.glob("*.json"):
+                    with path.open("r", encoding="utf-8") as f:
+                        rows.append(json.load(f))
+            legacy = get_state_dir() / LEGACY_GUILDS_FILE
+            if not rows and legacy.exists():
+                with legacy.open("r", encoding="utf-8") as f:
+                    rows = json.load(f)
+                self._dirty.update(int(row["guild_id"]) for row in rows)
+        except Exception:
+            logging.exception("길드 설정 복원 실패(무시하고 새로 시작)")
+            return 0
+        self._configs = {
+            int(row["guild_id"]): GuildConfig(**row) for row in rows if self._owns(int(row["guild_id"]))
+        }
+        self._dirty &= set(self._configs)
+        logging.info("길드 설정 %d건 복원", len(self._configs))
+        return len(self._configs)
+
+    def _save(self, rows: List[dict]) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        for row in rows:
+            path = self._dir / f"{row['guild_id']}.json"
+            tmp  = path.with_name(path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(row, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+
+    async def persist(self) -> None:
+        """바뀐 길드 설정만 저장"""
+        if not self._dirty:
+            return
+        rows        = [asdict(self._configs[g]) for g in self._dirty if g in self._configs]
+        self._dirty = set()
+        try:
+            await asyncio.to_thread(self._save, rows)
+        except Exception:
+            self._dirty.update(row["guild_id"] for row in rows)
+            logging.exception("길드 설정 저장 실패")
+
+    # ----- 설정 -----
+    def get(self, guild_id: int) -> Optional[GuildConfig]:
+        return self._configs.get(guild_id)
+
+    def owns(self, guild_id: int) -> bool:
+        return self._owns(guild_id)
+
+    def ensure(self, guild_id: int) -> GuildConfig:
+        config = self._configs.get(guild_id)
+        if config is None:
+            config = self._configs[guild_id] = GuildConfig(guild_id=guild_id)
+            self._dirty.add(guild_id)
+        return config
+
+    def bootstrap(self, guild_id: int, channel_id: int, debug_channel_id: int, retention_seconds: int, subs_file: str) -> bool:
+        """기존 단일 길드 설정을 해당 길드 항목으로 등록(이미 있으면 그대로). 등록했으면 True"""
+        if guild_id in self._configs:
+            return False
+        self._configs[guild_id] = GuildConfig(
+            guild_id=guild_id,
+            channel_id=channel_id,
+            debug_channel_id=debug_channel_id,
+            retention_seconds=retention_seconds,
+            subs_file=subs_file,
+        )
+        self._dirty.add(guild_id)
+        logging.info("기존 단일 길드 설정을 길드(ID=%s)로 이관", guild_id)
+        return True
+
+    def update(self, guild_id: int, **fields) -> GuildConfig:
+        config = self.ensure(guild_id)
+        for name, value in fields.items():
+            if not hasattr(config, name) or name in ("guild_id", "subs_file"):
+                raise AttributeError(f"변경할 수 없는 길드 설정: {name}")
+            setattr(config, name, value)
+        self._dirty.add(guild_id)
+        return config
+
+    def find_by_subs_file(self, subs_file: str) -> Optional[GuildConfig]:
+        """구독 파일명으로 길드 설정 조회(단일 길드 시절 설정을 이관받은 길드 찾기용)"""
+        return next((c for c in self._configs.values() if c.subs_file == subs_file), None)
+
+    def routable(self) -> List[GuildConfig]:
+        """알림 채널이 설정된 담당 길드 목록(발사 대상)"""
+        return [c for c in self._configs.values() if c.channel_id and self._owns(c.guild_id)]
+
+    # ----- 구독 네임스페이스 -----
+    def manager_for(self, guild_id: int) -> SubscriptionManager:
+        manager = self._managers.get(guild_id)
+        if manager is None:
+            with self._manager_lock:
+                manager = self._managers.get(guild_id)
+                if manager is None:
+                    manager = self._managers[guild_id] = self._factory(guild_id, self.ensure(guild_id).subs_file)
+        return manager
+
+    def managers(self) -> Dict[int, SubscriptionManager]:
+        return dict(self._managers)
+
+    async def flush(self) -> None:
+        """종료 시 호출: 모든 길드 매니저의 남은 변경 저장 + 설정 저장"""
+        await asyncio.gather(*(m.flush() for m in self._managers.values()), return_exceptions=True)
+        await self.persist()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+
+from pathlib                import Path
+from typing                 import (
+    Dict,
+    Optional
+)
+from module.utils           import get_state_dir
+
+LIVE_MESSAGES_FILE: str         = "live_messages.json"
+
+# 알림 메시지 방식
+MESSAGE_MODE_SEND: str          = "send"    # 발사마다 새 메시지 전송 → 보존 시간 뒤 삭제(기존 방식)
+MESSAGE_MODE_EDIT: str          = "edit"    # 채널 × 이벤트 계열마다 상태 메시지 1개를 수정 + 짧게 사는 멘션 메시지
+MESSAGE_MODES                   = (MESSAGE_MODE_SEND, MESSAGE_MODE_EDIT)
+
+PING_RETENTION_SECONDS: int     = 60        # 수정 모드의 멘션 전용 메시지 보존 시간(초)
+LIVE_STATUS_FOOTER: str         = "> 마지막 알림: {time} (KST)\n"
+
+def render_live_status(header: str, fire_at) -> str:
+    """상태 메시지 본문: 헤더 + 마지막 갱신 시각(같은 헤더가 반복돼도 갱신 여부가 보이도록)"""
+    return header + LIVE_STATUS_FOOTER.format(time=fire_at.strftime("%m-%d %H:%M"))
+
+# --------------------------------------
+# 상태 메시지 ID 기록(수정 모드)
+# --------------------------------------
+class LiveMessageStore:
+    """
+    (채널, 이벤트 계열) → 상태 메시지 ID. config/live_messages.json 에 보관해 재시작 후에도 같은 메시지를 수정.
+    - 바뀔 때는 새 메시지를 보냈을 때뿐(처음 또는 누가 지웠을 때) → 변경 즉시 원자적 저장
+    """
+    def __init__(self, file_name: str = LIVE_MESSAGES_FILE) -> None:
+        self._path: Path                        = get_state_dir() / file_name
+        self._ids: Dict[str, int]               = {}
+        self._save_task: Optional[asyncio.Task] = None
+        self._dirty: bool                       = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _key(channel_id: int, family: str) -> str:
+        return f"{channel_id}:{family}"
+
+    def load(self) -> int:
+        if not self._path.exists():
+            return 0
+        try:
+            with self._path.open("r", encoding="utf-8") as f:
+                self._ids = {str(k): int(v) for k, v in json.load(f).items()}
+            logging.info("상태 메시지 %d개 복원", len(self._ids))
+        except Exception:
+            logging.exception("상태 메시지 목록 복원 실패(새 메시지로 시작)")
+        return len(self._ids)
+
+    def get(self, channel_id: int, family: str) -> Optional[int]:
+        return self._ids.get(self._key(channel_id, family))
+
+    def set(self, channel_id: int, family: str, message_id: int) -> None:
+        self._ids[self._key(channel_id, family)] = message_id
+        self._schedule_save()
+
+    def forget(self, channel_id: int, family: str) -> None:
+        if self._ids.pop(self._key(channel_id, family), None) is not None:
+            self._schedule_save()
+
+    # ----- 영속화 -----
+    def _save(self, rows: Dict[str, int]) -> None:
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(rows, f)
+        os.replace(tmp, self._path)
+
+    def _schedule_save(self) -> None:
+        self._dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return
+
+        async def save() -> None:
+            while self._dirty:
+                self._dirty = False
+                try:
+                    await asyncio.to_thread(self._save, dict(self._ids))
+                except Exception:
+                    logging.exception("상태 메시지 목록 저장 실패")
+
+        self._save_task = asyncio.create_task(save())
+
+    async def flush(self) -> None:
+        if self._save_task is not None:
+            await asyncio.gather(self._save_task, return_exceptions=True)
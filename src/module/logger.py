@@ -1,8 +1,205 @@
-# module/logger.py
-import logging
-
-def setup_logger() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s"
-    )
+# module/logger.py
+import atexit
+import datetime as dt
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+
+from logging.handlers       import (
+    QueueHandler,
+    QueueListener
+)
+from typing                 import (
+    Dict,
+    Optional,
+    TextIO,
+    Tuple
+)
+from module.metrics         import METRICS
+
+LOG_FORMAT: str                 = "%(asctime)s [%(levelname)s] %(message)s"
+LOG_FORMATS: Tuple[str, ...]    = ("text", "json")
+LOG_LEVELS: Tuple[str, ...]     = ("DEBUG", "INFO", "WARNING", "ERROR")
+LOG_QUEUE_SIZE: int             = 10_000    # 출력이 막혀도 메모리는 이만큼만 사용(넘치면 버리고 개수만 셈)
+SAMPLE_WINDOW_SECONDS: float    = 60.0      # 같은 경고 템플릿은 창마다
+SAMPLE_BURST: int               = 5         # 이만큼만 출력, 나머지는 생략 건수로 요약
+STOP_TIMEOUT_SECONDS: float     = 2.0       # 종료 시 남은 로그를 쓰며 기다리는 상한(출력이 막혀 있어도 종료)
+
+# extra= 로 넘기면 JSON 출력에 그대로 실리는 구조화 필드(event = 로그 종류, alert = 알림 이벤트 키)
+LOG_FIELDS: Tuple[str, ...] = (
+    "event", "alert", "job_id", "channel_id", "guild_id", "route", "attempts", "latency_ms", "lateness_ms",
+    "suppressed",
+)
+
+# --------------------------------------
+# 포매터
+# --------------------------------------
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON: ts/level/logger/msg + 구조화 필드(LOG_FIELDS) + 예외(exc)"""
+    def format(self, record: logging.LogRecord) -> str:
+        row = {
+            "ts": dt.datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for name in LOG_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                row[name] = value
+        if record.exc_info:
+            row["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            row["exc"] = record.exc_text
+        return json.dumps(row, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """기존 텍스트 포맷 + 생략 건수 꼬리표"""
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", None)
+        return f"{text} (같은 로그 {suppressed}건 생략)" if suppressed else text
+
+# --------------------------------------
+# 반복 경고 샘플링
+# --------------------------------------
+class RateLimitFilter(logging.Filter):
+    """
+    WARNING 이상을 (로거, 레벨, 메시지 템플릿) 단위로 창(window)마다 burst 건만 통과시킨다.
+    - 인자만 다른 재시도 경고(예: '%s 네트워크/예상치 못한 오류(%s) 시도 %d/%d')는 같은 템플릿 → 한 묶음
+    - 생략한 건수는 다음에 통과하는 같은 템플릿 로그의 suppressed 필드로 보고
+    - 호출 스레드(이벤트 루프, to_thread 워커)에서 실행되므로 잠금으로 보호
+    """
+    def __init__(self, window: float = SAMPLE_WINDOW_SECONDS, burst: int = SAMPLE_BURST) -> None:
+        super().__init__()
+        self.window: float                                  = window
+        self.burst: int                                     = burst
+        self._lock                                          = threading.Lock()
+        self._slots: Dict[Tuple[str, int, str], list]       = {}    # 키 → [창 시작, 통과 수, 생략 수]
+        self.suppressed: int                                = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        key, now = (record.name, record.levelno, str(record.msg)), time.monotonic()
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None or now - slot[0] >= self.window:
+                dropped = slot[2] if slot is not None else 0
+                self._slots[key] = slot = [now, 0, 0]
+                if dropped:
+                    record.suppressed = dropped
+            if slot[1] >= self.burst:
+                slot[2] += 1
+                self.suppressed += 1
+                return False
+            slot[1] += 1
+            if len(self._slots) > 1024:    # 오래된 템플릿 정리(메시지에 값을 직접 넣는 로그 대비)
+                self._slots = {k: v for k, v in self._slots.items() if now - v[0] < self.window}
+        return True
+
+# --------------------------------------
+# 큐 핸들러(이벤트 루프 스레드에서는 큐에 넣기만)
+# --------------------------------------
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    레코드를 큐에 넣기만 하는 핸들러. 포맷/쓰기는 QueueListener 스레드에서.
+    - prepare(): 메시지 인자만 지금 합치고(이후 객체가 바뀌어도 그 시점 값), 예외 트레이스백 포맷은 리스너 스레드로 미룸
+    - 큐가 가득 차면(stderr 가 막힘 등) 기다리지 않고 버린 뒤 건수만 센다
+    """
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg      = record.getMessage()
+        record.args     = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class BoundedQueueListener(QueueListener):
+    """stop() 이 막힌 출력/가득 찬 큐 때문에 종료를 붙잡지 않도록 센티널 적재와 합류에 시한을 둔다"""
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        try:
+            self.queue.put(self._sentinel, timeout=STOP_TIMEOUT_SECONDS)
+        except queue.Full:
+            pass
+        self._thread.join(STOP_TIMEOUT_SECONDS)
+        self._thread = None
+
+# 현재 설치된 파이프라인(재설정 시 교체)
+_listener: Optional[BoundedQueueListener]       = None
+_handler: Optional[NonBlockingQueueHandler]     = None
+_sampler: Optional[RateLimitFilter]             = None
+_retired: Dict[str, int]                        = {"dropped": 0, "suppressed": 0}  # 교체된 파이프라인의 누적값
+
+def stop_logger() -> None:
+    """리스너를 멈추고 큐에 남은 로그를 모두 쓴다(종료 시 atexit 로도 호출)"""
+    global _listener, _handler, _sampler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _retired["dropped"] += _handler.dropped
+        _handler = None
+    if _sampler is not None:
+        _retired["suppressed"] += _sampler.suppressed
+        _sampler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def setup_logger(
+        level: str = "INFO",
+        fmt: str = "text",
+        stream: Optional[TextIO] = None,
+        sample_window: float = SAMPLE_WINDOW_SECONDS,
+        sample_burst: int = SAMPLE_BURST
+) -> QueueListener:
+    """
+    루트 로거를 큐 기반 파이프라인으로 구성한다(다시 호출하면 이전 구성을 정리하고 교체).
+    - 호출 스레드: 샘플링 필터 → 큐에 넣기(블로킹 없음)
+    - 리스너 스레드: 포맷(text | json, 트레이스백 포함) → stream(기본 stderr)에 쓰기
+    """
+    global _listener, _handler, _sampler
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"로그 형식은 {LOG_FORMATS} 중 하나여야 합니다: {fmt!r}")
+    stop_logger()
+
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(LOG_FORMAT))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(LOG_QUEUE_SIZE)
+    _handler  = NonBlockingQueueHandler(log_queue)
+    _sampler  = RateLimitFilter(sample_window, sample_burst)
+    _handler.addFilter(_sampler)
+    _listener = BoundedQueueListener(log_queue, writer, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):   # basicConfig 등으로 붙은 기존 핸들러 제거
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(level)
+    _listener.start()
+    return _listener
+
+def dropped_records() -> int:
+    """큐가 가득 차 버린 로그 수"""
+    return _retired["dropped"] + (_handler.dropped if _handler is not None else 0)
+
+def suppressed_records() -> int:
+    """반복 경고 샘플링으로 생략한 로그 수"""
+    return _retired["suppressed"] + (_sampler.suppressed if _sampler is not None else 0)
+
+METRICS.counter("alertbot_log_dropped_total", "로그 큐가 가득 차 버린 레코드 수").set_function(dropped_records)
+METRICS.counter("alertbot_log_suppressed_total", "반복 경고 샘플링으로 생략한 레코드 수").set_function(suppressed_records)
+
+atexit.register(stop_logger)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from collections            import deque
+from dataclasses            import dataclass
+from pathlib                import Path
+from typing                 import (
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Protocol
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.metrics         import (
+    METRICS,
+    MetricsRegistry,
+    format_seconds
+)
+
+LAG_SAMPLE_SECONDS: float       = 1.0       # 지연 측정 주기(이상적 간격)
+LAG_WINDOW_SAMPLES: int         = 300       # 최근 백분위 계산 구간(5분)
+LAG_WARN_SECONDS: float         = 2.0       # 이 이상이면 경고 로그 + 보고 대상
+STALL_SECONDS: float            = 0.5       # 루프가 이만큼 응답하지 않으면 그 순간의 스택을 기록
+STALL_POLL_SECONDS: float       = 0.1       # 감시 스레드의 응답 확인 주기
+SHED_LAG_SECONDS: float         = 0.25      # 발사 전후 최근 지연이 이 이상이면 부가 작업 일시 중지
+SHED_RECENT_SAMPLES: int        = 5         # 부하 판정에 쓰는 최근 표본 수(최댓값 기준)
+SHED_RECOVER_SAMPLES: int       = 10        # 이만큼 연속으로 지연이 낮아야 재개(발사 창을 벗어나면 즉시)
+FIRE_GUARD_SECONDS: float       = 60.0      # 다음 발사까지 이 시간 이내면 '발사 창'
+REPORT_INTERVAL_SECONDS: float  = 600.0     # 디버그 채널 보고 최소 간격(그동안의 사건은 모아서 1건으로)
+REPORT_TOP_STALLS: int          = 3         # 보고에 싣는 블로킹 위치 수
+
+LOOP_LAG_SECONDS = METRICS.histogram(
+    "alertbot_event_loop_lag_seconds", "워치독 1초 주기 대비 이벤트 루프 지연",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0),
+)
+
+_SOURCE_ROOT: Path = Path(__file__).resolve().parent.parent   # 봇 소스 루트(스택에서 우리 코드 위치를 고를 때)
+
+class Pausable(Protocol):
+    """부하 차단 대상(만료 삭제 엔진, 역할 동기화 큐 등)"""
+    def pause(self) -> None: ...
+    def resume(self) -> None: ...
+
+@dataclass
+class Stall:
+    """루프가 STALL_SECONDS 이상 응답하지 않은 구간 1건"""
+    seconds: float      # 응답이 돌아올 때까지 걸린 시간
+    where: str          # 그 동안 루프 스레드가 실행 중이던 위치(우리 코드 프레임 ← 가장 안쪽 프레임)
+
+# --------------------------------------
+# 블로킹 감지(별도 스레드)
+# --------------------------------------
+class StallDetector:
+    """
+    루프에 주기적으로 콜백을 넣고(call_soon_threadsafe) 응답을 기다리는 감시 스레드.
+    - STALL_SECONDS 안에 응답이 없으면 루프 스레드의 현재 스택을 떠서 '무엇이 막고 있는지' 기록
+    - asyncio 디버그 모드(slow_callback_duration)와 달리 평소 비용이 거의 없어 운영에서도 켜 둔다
+    - start() 는 루프 스레드에서 호출(그 스레드의 스택을 본다)
+    """
+    def __init__(
+            self,
+            loop: asyncio.AbstractEventLoop,
+            threshold: float = STALL_SECONDS,
+            poll: float = STALL_POLL_SECONDS
+    ) -> None:
+        self.threshold: float                       = threshold
+        self.poll: float                            = poll
+        self._loop                                  = loop
+        self._loop_thread: int                      = threading.get_ident()
+        self._stop                                  = threading.Event()
+        self._lock                                  = threading.Lock()
+        self._stalls: List[Stall]                   = []
+        self._thread: Optional[threading.Thread]    = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._loop_thread = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="loop-stall-detector", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.threshold + self.poll)
+            self._thread = None
+
+    def drain(self) -> List[Stall]:
+        """감지한 구간을 꺼내 감(루프 스레드에서 호출)"""
+        with self._lock:
+            stalls, self._stalls = self._stalls, []
+        return stalls
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            answered = threading.Event()
+            sent     = time.monotonic()
+            try:
+                self._loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:    # 루프 종료
+                return
+            if not answered.wait(self.threshold):
+                where = self._where()
+                while not answered.wait(self.poll):
+                    if self._stop.is_set():
+                        return
+                with self._lock:
+                    self._stalls.append(Stall(time.monotonic() - sent, where))
+            self._stop.wait(self.poll)
+
+    def _where(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return "?"
+        stack = traceback.extract_stack(frame)
+        if not stack:
+            return "?"
+        ours  = [f for f in stack if _is_ours(f.filename)]
+        parts = [_describe(ours[-1])] if ours else []
+        if not ours or ours[-1] is not stack[-1]:
+            parts.append(_describe(stack[-1]))
+        return " ← ".join(parts)
+
+def _is_ours(filename: str) -> bool:
+    path = os.path.abspath(filename)
+    return path.startswith(str(_SOURCE_ROOT)) and "site-packages" not in path
+
+def _describe(frame: traceback.FrameSummary) -> str:
+    path = Path(frame.filename)
+    try:
+        name = path.resolve().relative_to(_SOURCE_ROOT).as_posix()
+    except ValueError:
+        name = "/".join(path.parts[-2:])
+    return f"{name}:{frame.lineno} {frame.name}"
+
+# --------------------------------------
+# 루프 상태 감시 + 부하 차단
+# --------------------------------------
+class LoopMonitor:
+    """
+    이벤트 루프 지연 감시(기존 1초 워치독 대체).
+    - 매 주기 지연 = 실제 간격 - 1초 → 누적 히스토그램 + 최근 LAG_WINDOW_SAMPLES 표본 백분위(p50/p95/p99/max)
+    - StallDetector: 루프를 막은 코루틴/콜백 위치를 스택으로 기록, 위치별로 묶어 집계
+    - 부하 차단: 발사 창(near_fire)에서 최근 지연이 SHED_LAG_SECONDS 이상이면 등록된 부가 작업
+      (메시지 자동 삭제, 역할 동기화)을 멈추고, 지연이 가라앉거나 창을 벗어나면 재개 → 알림 정시성 우선
+    - 보고: 경고 지연/블로킹/부하 차단을 모아 REPORT_INTERVAL_SECONDS 에 한 번 report 콜백(디버그 채널)으로 전송
+      (별도 태스크로 보내 전송 시간이 지연 표본에 섞이지 않음, 봇은 디스패처의 레이트리밋 경로로 전송)
+    """
+    def __init__(
+            self,
+            clock: Clock = SYSTEM_CLOCK,
+            near_fire: Optional[Callable[[], bool]] = None,
+            report: Optional[Callable[[str], Awaitable[None]]] = None,
+            interval: float = LAG_SAMPLE_SECONDS,
+            window: int = LAG_WINDOW_SAMPLES,
+            report_interval: float = REPORT_INTERVAL_SECONDS
+    ) -> None:
+        self.clock: Clock                               = clock
+        self.interval: float                            = interval
+        self.report_interval: float                     = report_interval
+        self._near_fire                                 = near_fire or (lambda: False)
+        self._report                                    = report
+        self._recent: Deque[float]                      = deque(maxlen=window)
+        self._targets: List[Pausable]                   = []
+        self._task: Optional[asyncio.Task]              = None
+        self._report_task: Optional[asyncio.Task]       = None  # 보고 전송(측정 루프와 분리)
+        self._detector: Optional[StallDetector]         = None
+        self.shedding: bool                             = False
+        self._shed_since: Optional[float]               = None
+        self._calm: int                                 = 0
+        # 누적 카운터(지표) + 다음 보고까지 모은 사건
+        self.stalls: int                                = 0
+        self.sheds: int                                 = 0
+        self.shed_seconds: float                        = 0.0
+        self._pending_stalls: Dict[str, List[float]]    = {}    # 위치 → [횟수, 최대 초]
+        self._pending_warns: int                        = 0
+        self._pending_max: float                        = 0.0
+        self._pending_sheds: int                        = 0
+        self._last_report: Optional[float]              = None
+
+    def add_shed_target(self, target: Pausable) -> None:
+        self._targets.append(target)
+
+    # ----- 수명주기 -----
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        if self.clock.realtime:
+            # 시뮬레이션 시계는 처리 중 시간이 멈춰 있어 블로킹 감지가 의미 없음
+            self._detector = StallDetector(asyncio.get_running_loop())
+            self._detector.start()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._report_task is not None:
+            self._report_task.cancel()
+            await asyncio.gather(self._report_task, return_exceptions=True)
+            self._report_task = None
+        if self._detector is not None:
+            await asyncio.to_thread(self._detector.stop)
+            self._detector = None
+        self._set_shedding(False)
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ----- 측정 -----
+    def percentiles(self) -> Dict[str, float]:
+        """최근 구간 지연 p50/p95/p99/max(초). 표본이 없으면 빈 dict"""
+        if not self._recent:
+            return {}
+        ordered = sorted(self._recent)
+        last    = len(ordered) - 1
+        return {
+            "p50": ordered[round(last * 0.50)],
+            "p95": ordered[round(last * 0.95)],
+            "p99": ordered[round(last * 0.99)],
+            "max": ordered[-1],
+        }
+
+    def describe(self) -> str:
+        """#stats 표시용 최근 구간 요약"""
+        p = self.percentiles()
+        if not p:
+            return "관측 없음"
+        text = " · ".join(f"{name} {format_seconds(value)}" for name, value in p.items())
+        return f"{text} (최근 {len(self._recent) * self.interval:.0f}s)" + (" · 부하 차단 중" if self.shedding else "")
+
+    def register_metrics(self, registry: MetricsRegistry = METRICS) -> None:
+        registry.gauge("alertbot_event_loop_lag_recent_seconds", "최근 구간 이벤트 루프 지연 백분위", ("quantile",)).set_function(
+            lambda: {(name,): value for name, value in self.percentiles().items()}
+        )
+        registry.counter("alertbot_event_loop_stalls_total", "루프가 응답하지 않은 구간(블로킹) 수").set_function(lambda: self.stalls)
+        registry.gauge("alertbot_load_shedding", "부하 차단 중 여부(1=부가 작업 중지)").set_function(lambda: float(self.shedding))
+        registry.counter("alertbot_load_shed_seconds_total", "부하 차단으로 부가 작업을 멈춘 누적 시간").set_function(
+            lambda: self.shed_seconds + (self.clock.monotonic() - self._shed_since if self._shed_since is not None else 0.0)
+        )
+
+    def observe(self, lag: float) -> None:
+        """지연 표본 1개 반영 + 부하 차단 판정"""
+        lag = max(0.0, lag)
+        LOOP_LAG_SECONDS.observe(lag)
+        self._recent.append(lag)
+        if lag > LAG_WARN_SECONDS:
+            logging.warning("이벤트 루프 지연 감지: %.3fs", lag, extra={"event": "loop_lag", "latency_ms": round(lag * 1000)})
+            self._pending_warns += 1
+        self._pending_max = max(self._pending_max, lag)
+
+        recent = max(itertools.islice(reversed(self._recent), SHED_RECENT_SAMPLES))
+        if not self._near_fire():
+            self._calm = 0
+            self._set_shedding(False)
+        elif recent >= SHED_LAG_SECONDS:
+            self._calm = 0
+            self._set_shedding(True)
+        elif self.shedding:
+            self._calm += 1
+            if self._calm >= SHED_RECOVER_SAMPLES:
+                self._set_shedding(False)
+
+    def record_stalls(self, stalls: List[Stall]) -> None:
+        for stall in stalls:
+            self.stalls += 1
+            slot = self._pending_stalls.setdefault(stall.where, [0, 0.0])
+            slot[0] += 1
+            slot[1]  = max(slot[1], stall.seconds)
+            logging.warning("이벤트 루프 블로킹 %.3fs: %s", stall.seconds, stall.where,
+                            extra={"event": "loop_stall", "latency_ms": round(stall.seconds * 1000)})
+
+    # ----- 내부 -----
+    def _set_shedding(self, on: bool) -> None:
+        if on == self.shedding:
+            return
+        self.shedding = on
+        now = self.clock.monotonic()
+        for target in self._targets:
+            try:
+                if on:
+                    target.pause()
+                else:
+                    target.resume()
+            except Exception:
+                logging.exception("부하 차단 대상 %s 실패", "중지" if on else "재개")
+        if on:
+            self.sheds += 1
+            self._pending_sheds += 1
+            self._shed_since = now
+            logging.warning("발사 창 루프 지연 → 부가 작업(자동 삭제/역할 동기화) 일시 중지", extra={"event": "load_shed"})
+        else:
+            self.shed_seconds += now - (self._shed_since or now)
+            self._shed_since = None
+            logging.info("부가 작업 재개", extra={"event": "load_shed_end"})
+
+    async def _run(self) -> None:
+        last = self.clock.monotonic()
+        while True:
+            await self.clock.sleep(self.interval)
+            self.observe(self.clock.monotonic() - last - self.interval)
+            if self._detector is not None:
+                self.record_stalls(self._detector.drain())
+            if self._due():
+                # 보고 전송(레이트리밋 대기 포함)은 별도 태스크 → 전송 시간이 다음 지연 표본에 섞이지 않음
+                self._report_task = asyncio.create_task(self._send_report(self._take_report()))
+            last = self.clock.monotonic()
+
+    def _due(self) -> bool:
+        if self._report is None or not (self._pending_warns or self._pending_stalls or self._pending_sheds):
+            return False
+        if self.shedding:   # 발사 창에서는 보고 메시지도 미룸
+            return False
+        if self._report_task is not None and not self._report_task.done():
+            return False
+        return self._last_report is None or self.clock.monotonic() - self._last_report >= self.report_interval
+
+    def summary(self) -> str:
+        """보고 본문(마지막 보고 이후 모은 사건)"""
+        lines = [f"⚠️ **이벤트 루프 상태** — 최근 지연 {self.describe()}"]
+        if self._pending_warns:
+            lines.append(f"- {format_seconds(LAG_WARN_SECONDS)} 초과 지연 {self._pending_warns}회 (최대 {format_seconds(self._pending_max)})")
+        if self._pending_stalls:
+            total = sum(int(n) for n, _ in self._pending_stalls.values())
+            lines.append(f"- 블로킹 {total}회, 위치별:")
+            top = sorted(self._pending_stalls.items(), key=lambda item: (-item[1][0], -item[1][1]))[:REPORT_TOP_STALLS]
+            lines += [f"  · `{where}` {int(n)}회, 최대 {format_seconds(worst)}" for where, (n, worst) in top]
+        if self._pending_sheds:
+            lines.append(f"- 발사 창 부하 차단 {self._pending_sheds}회 (누적 {self.shed_seconds:.0f}s)")
+        return "\n".join(lines)
+
+    def _take_report(self) -> str:
+        """보고 본문을 만들고 모은 사건을 비움(다음 보고는 이 시점부터 다시 모음)"""
+        text = self.summary()
+        self._last_report                                   = self.clock.monotonic()
+        self._pending_stalls                                = {}
+        self._pending_warns, self._pending_max, self._pending_sheds = 0, 0.0, 0
+        return text
+
+    async def _send_report(self, text: str) -> None:
+        try:
+            await self._report(text)
+        except Exception:
+            logging.exception("루프 상태 보고 실패")
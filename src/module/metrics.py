@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import math
+
+from typing                 import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union
+)
+
+# 히스토그램 기본 버킷(초): 수 ms 의 API 호출부터 수십 초의 레이트리밋 대기까지
+DEFAULT_BUCKETS: Tuple[float, ...]  = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_HOST: str                   = "127.0.0.1"   # 기본은 로컬에서만 수집(외부 공개 시 명시적으로 지정)
+METRICS_READ_TIMEOUT: float         = 5.0           # /metrics 요청 헤더 수신 제한(초)
+
+LabelKey = Tuple[str, ...]
+# 콜백 지표: 값 1개 또는 {라벨 값 튜플: 값}
+MetricFunction = Callable[[], Union[float, Dict[LabelKey, float]]]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def format_seconds(value: Optional[float]) -> str:
+    """#stats 표시용: 1초 미만은 ms, 이상은 s"""
+    if value is None:
+        return "-"
+    return f"{value * 1000:.0f}ms" if value < 1.0 else f"{value:.2f}s"
+
+# --------------------------------------
+# 지표 타입(카운터/게이지/히스토그램)
+# --------------------------------------
+class _Metric:
+    kind: str = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name: str                      = name
+        self.help: str                      = help
+        self.labelnames: Tuple[str, ...]    = tuple(labelnames)
+        self._fn: Optional[MetricFunction]  = None
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 라벨 불일치: {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _labels(self, key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key)) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def set_function(self, fn: MetricFunction) -> None:
+        """값을 보관하지 않고 수집 시점에 읽어 옴(디스패처 통계 등 기존 카운터 재사용)"""
+        self._fn = fn
+
+    def samples(self) -> Dict[LabelKey, float]:
+        if self._fn is None:
+            return dict(self._values)
+        value = self._fn()
+        return dict(value) if isinstance(value, dict) else {(): float(value)}
+
+    def value(self, **labels) -> Optional[float]:
+        return self.samples().get(self._key(labels))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self.samples().items()):
+            lines.append(f"{self.name}{self._labels(key)} {_format_value(value)}")
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = float(value)
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts: List[int]  = [0] * size    # 버킷별(비누적) 개수, 마지막은 +Inf
+        self.sum: float         = 0.0
+        self.count: int         = 0
+
+class Histogram(_Metric):
+    """
+    고정 버킷 히스토그램. 관측은 O(log 버킷 수), 백분위는 버킷 경계 사이 선형 보간
+    (Prometheus histogram_quantile 과 같은 방식 → 버킷 폭만큼의 오차)
+    """
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            help: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets: Tuple[float, ...]             = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key    = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.sum   += value
+        series.count += 1
+
+    def label_sets(self) -> List[Dict[str, str]]:
+        return [dict(zip(self.labelnames, key)) for key in sorted(self._series)]
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """q(0~1) 백분위 추정치. 관측이 없으면 None"""
+        series = self._series.get(self._key(labels))
+        if series is None or series.count == 0:
+            return None
+        rank, seen = q * series.count, 0
+        for i, n in enumerate(series.counts):
+            if n and seen + n >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]     # +Inf 버킷: 마지막 경계로 하한 보고
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                return lower + (self.buckets[i] - lower) * max(0.0, rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def describe(self, **labels) -> str:
+        """#stats 표시용 요약: p50 · p99 (n=관측 수)"""
+        n = self.count(**labels)
+        if not n:
+            return "관측 없음"
+        return f"p50 {format_seconds(self.quantile(0.5, **labels))} · p99 {format_seconds(self.quantile(0.99, **labels))} (n={n})"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), series.counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{self._labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {series.count}")
+        return lines
+
+# --------------------------------------
+# 지표 레지스트리
+# --------------------------------------
+class MetricsRegistry:
+    """
+    프로세스 내 지표 모음. 같은 이름으로 다시 요청하면 기존 지표를 돌려준다(모듈 재사용/재설정 안전).
+    render() 는 Prometheus 텍스트 형식(0.0.4)
+    """
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"지표 {name} 이(가) 다른 타입({metric.kind})으로 이미 등록됨")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+            self,
+            name: str,
+            help: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            try:
+                lines.extend(self._metrics[name].render())
+            except Exception:
+                logging.exception("지표 수집 실패(%s)", name)
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()   # 기본 레지스트리(각 모듈이 자기 지표를 여기에 등록)
+
+# --------------------------------------
+# /metrics HTTP 엔드포인트(선택)
+# --------------------------------------
+class MetricsServer:
+    """
+    GET /metrics 만 응답하는 최소 HTTP 서버(asyncio 스트림, 추가 의존성 없음).
+    기본 바인드는 127.0.0.1 → 같은 호스트의 Prometheus/에이전트만 수집
+    """
+    def __init__(self, registry: MetricsRegistry = METRICS, host: str = METRICS_HOST, port: int = 0) -> None:
+        self.registry                           = registry
+        self.host: str                          = host
+        self.port: int                          = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        if self._server is not None:
+            return
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logging.info("지표 엔드포인트 시작: http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=METRICS_READ_TIMEOUT)
+            while True:     # 헤더는 읽고 버림
+                line = await asyncio.wait_for(reader.readline(), timeout=METRICS_READ_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.registry.render().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception:
+            logging.exception("지표 요청 처리 실패")
+        finally:
+            writer.close()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+
+from pathlib                import Path
+from typing                 import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TextIO
+)
+from module.utils           import get_state_dir
+
+OUTBOX_FILE: str                = "outbox.jsonl"
+OUTBOX_COMPACT_THRESHOLD: int   = 1000      # 완료 기록이 이만큼 쌓이면 미완료 잡만 남겨 다시 씀
+
+OP_PUT: str     = "put"     # 잡 적재(전송 전에 디스크에 먼저 기록)
+OP_DONE: str    = "done"    # 최종 결과 확정(성공/실패/마감 폐기)
+
+# --------------------------------------
+# 메시지 잡 아웃박스(디스크 기반, 최소 1회 전송)
+# --------------------------------------
+class MessageOutbox:
+    """
+    MessageJob 을 전송 전에 추가 전용 로그(JSONL)에 기록하는 저장소.
+    - put 레코드 = 잡 전체(키 포함), done 레코드 = 키만 → 재생하면 '아직 끝나지 않은 잡'만 남음
+    - 같은 키의 put 이 여러 번 있어도 마지막 것만 유효(멱등 재생), 모르는 키의 done 은 무시
+    - put 은 fsync 후 반환(적재가 끝났으면 크래시 후에도 남아 있음), done 은 fsync 없이 추가
+      → done 이 유실되면 재시작 시 한 번 더 전송될 수 있음(최소 1회)
+    - compact(): 미완료 잡만 담은 새 파일로 원자적 교체
+    - 마지막 줄이 잘린 경우(쓰기 도중 크래시) 해당 줄부터 무시하고 파일도 그 앞까지 잘라 냄
+    """
+    def __init__(
+            self,
+            file_name: str = OUTBOX_FILE,
+            compact_threshold: int = OUTBOX_COMPACT_THRESHOLD,
+            fsync: bool = True
+    ) -> None:
+        self.path: Path                 = get_state_dir() / file_name
+        self.compact_threshold: int     = compact_threshold
+        self._fsync: bool               = fsync
+        self._io_lock                   = threading.Lock()   # append/compact 는 워커 스레드에서 호출됨
+        self._fh: Optional[TextIO]      = None
+        self._done_records: int         = 0                  # 마지막 압축 이후 쌓인 done 레코드 수
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._done_records >= self.compact_threshold
+
+    # ----- 복원 -----
+    def load(self) -> List[Dict[str, Any]]:
+        """미완료 잡 레코드(처음 적재된 순서)"""
+        pending: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return []
+        good = 0    # 마지막으로 온전히 읽은 줄 끝의 바이트 오프셋
+        with self.path.open("rb") as f:
+            for line_no, line in enumerate(f, start=1):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("개행 없는 마지막 줄")
+                    record = json.loads(line)
+                    op, key = record.pop("op"), str(record["key"])
+                except (ValueError, KeyError, TypeError):
+                    logging.warning("아웃박스 손상 레코드 무시(%s:%d) — 이후 꼬리 폐기", self.path.name, line_no)
+                    break
+                good += len(line)
+                if op == OP_PUT:
+                    pending[key] = record
+                elif op == OP_DONE:
+                    pending.pop(key, None)
+                    self._done_records += 1
+            size = f.seek(0, os.SEEK_END)
+        if good < size:
+            # 잘린 꼬리 뒤에 새 레코드가 붙어 함께 버려지지 않도록 잘라 냄
+            with self.path.open("r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        return list(pending.values())
+
+    # ----- 기록 -----
+    def _append(self, lines: List[str], fsync: bool) -> bool:
+        try:
+            with self._io_lock:
+                if self._fh is None:
+                    self._fh = self.path.open("a", encoding="utf-8")
+                self._fh.writelines(lines)
+                self._fh.flush()
+                if fsync:
+                    os.fsync(self._fh.fileno())
+            return True
+        except Exception:
+            logging.exception("아웃박스 기록 실패")
+            return False
+
+    def put_many(self, rows: Iterable[Dict[str, Any]]) -> bool:
+        lines = [json.dumps({"op": OP_PUT, **row}, ensure_ascii=False) + "\n" for row in rows]
+        return self._append(lines, self._fsync) if lines else True
+
+    def done_many(self, keys: Iterable[str]) -> bool:
+        lines = [json.dumps({"op": OP_DONE, "key": key}, ensure_ascii=False) + "\n" for key in keys]
+        if not lines:
+            return True
+        ok = self._append(lines, False)
+        if ok:
+            self._done_records += len(lines)
+        return ok
+
+    # ----- 압축 -----
+    def compact(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        미완료 잡(rows)만 남긴 파일로 교체한다.
+        호출자는 스냅샷을 뜬 시점부터 교체가 끝날 때까지 put_many 가 끼어들지 않게 직렬화해야 한다
+        (그 사이 put 이 옛 파일에 붙으면 교체와 함께 사라짐 → 디스패처는 _outbox_gate 로 묶음).
+        스냅샷 이후의 done 은 빠져도 재시작 때 한 번 더 보낼 뿐이다(최소 1회).
+        """
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with self._io_lock:
+                if self._fh is not None:
+                    self._fh.close()
+                    self._fh = None
+                with tmp.open("w", encoding="utf-8") as f:
+                    f.writelines(json.dumps({"op": OP_PUT, **row}, ensure_ascii=False) + "\n" for row in rows)
+                    f.flush()
+                    if self._fsync:
+                        os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self._done_records = 0
+            return True
+        except Exception:
+            logging.exception("아웃박스 압축 실패(기존 파일 유지)")
+            return False
+
+    def close(self) -> None:
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
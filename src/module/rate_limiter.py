@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+from dataclasses            import dataclass
+from collections            import deque
+from typing                 import (
+    Deque,
+    Dict,
+    Optional,
+    Tuple
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+
+# --------------------------------------
+# 라우트별 기본 예산(디스코드 문서 기준 보수적 값)
+# --------------------------------------
+# route → (창 안 최대 요청 수, 창 길이 초): 어느 창 길이 구간에서도 요청 수를 넘지 않음
+DEFAULT_ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "send":   (5, 5.0),     # 채널당 메시지 전송 5회/5초
+    "delete": (5, 5.0),     # 채널당 메시지 삭제 예산은 전송과 분리
+    "edit":   (5, 5.0),     # 채널당 상태 메시지 수정(수정 모드, 전송과 별도 버킷)
+    "role":   (5, 5.0),     # 길드당 멤버 역할 추가/제거·역할 생성(키=길드 ID)
+    "dm_open": (50, 2.0),   # DM 채널 생성(키=0, 봇 전체, 사용자당 최초 1회)
+}
+GLOBAL_LIMIT: Tuple[int, float] = (50, 1.0)  # 봇 전역 50회/초
+# 요청 시각은 자리를 잡은 순간 기록하지만 서버는 도착 시각으로 센다 → 지연 편차만큼 창을 늘려 잡음
+WINDOW_SLACK_SECONDS: float     = 0.1
+
+# --------------------------------------
+# 슬라이딩 윈도 버킷
+# --------------------------------------
+class WindowBucket:
+    """
+    비동기 슬라이딩 윈도 버킷: 최근 window 초 안의 요청이 limit 개를 넘지 않게 한다.
+    - acquire(): 가장 오래된 요청이 창을 벗어날 때까지 정확히 필요한 만큼만 대기
+    - block_for(): 429 의 retry_after 만큼 버킷 전체를 잠금
+    - sync(): 응답 헤더(remaining/reset_after)로 로컬 추정치를 서버 값에 맞춤
+    """
+    def __init__(self, limit: int, window: float, clock: Clock = SYSTEM_CLOCK) -> None:
+        self.limit: int             = limit
+        self.window: float          = window
+        self.clock: Clock           = clock
+        self._sent: Deque[float]    = deque()      # 창 안 요청 시각(monotonic), 오래된 순
+        self._blocked_until: float  = 0.0
+        self._lock                  = asyncio.Lock()   # 대기 순서(FIFO) 보장
+
+    def _expire(self, now: float) -> None:
+        while self._sent and now - self._sent[0] >= self.window + WINDOW_SLACK_SECONDS:
+            self._sent.popleft()
+
+    def delay_until_available(self, now: Optional[float] = None) -> float:
+        now = self.clock.monotonic() if now is None else now
+        self._expire(now)
+        wait = max(0.0, self._blocked_until - now)
+        if len(self._sent) >= self.limit:
+            wait = max(wait, self._sent[0] + self.window + WINDOW_SLACK_SECONDS - now)
+        return wait
+
+    async def acquire(self) -> float:
+        """요청 1건 자리 확보. 실제로 대기한 시간(초)을 반환"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = self.delay_until_available()
+                if delay <= 0.0:
+                    self._sent.append(self.clock.monotonic())
+                    return waited
+                await self.clock.sleep(delay)
+                waited += delay
+
+    def block_for(self, seconds: float) -> None:
+        now                 = self.clock.monotonic()
+        self._blocked_until = max(self._blocked_until, now + max(0.0, seconds))
+
+    def sync(self, remaining: Optional[int], reset_after: Optional[float]) -> None:
+        if remaining is None:
+            return
+        now = self.clock.monotonic()
+        self._expire(now)
+        # 서버가 남았다고 한 수보다 로컬 여유가 크면 지금 시각의 요청으로 채워 여유를 줄임
+        for _ in range(self.limit - len(self._sent) - max(0, remaining)):
+            self._sent.append(now)
+        if remaining <= 0 and reset_after:
+            self.block_for(reset_after)
+
+# --------------------------------------
+# 레이트리밋 정보 파싱(discord.HTTPException / discord.RateLimited 공용)
+# --------------------------------------
+@dataclass
+class RateLimitInfo:
+    retry_after: Optional[float]    = None   # 429: 서버가 요구한 대기(초)
+    remaining: Optional[int]        = None   # X-RateLimit-Remaining
+    reset_after: Optional[float]    = None   # X-RateLimit-Reset-After
+    is_global: bool                 = False  # X-RateLimit-Global / scope=global
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_rate_limit(exc: BaseException) -> RateLimitInfo:
+    """
+    예외에서 레이트리밋 정보를 추출한다.
+    - discord.RateLimited.retry_after
+    - HTTPException.response.headers 의 Retry-After / X-RateLimit-*
+    """
+    info    = RateLimitInfo(retry_after=_to_float(getattr(exc, "retry_after", None)))
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    if info.retry_after is None:
+        info.retry_after = _to_float(headers.get("Retry-After")) or _to_float(headers.get("X-RateLimit-Reset-After"))
+    remaining = _to_float(headers.get("X-RateLimit-Remaining"))
+    info.remaining   = int(remaining) if remaining is not None else None
+    info.reset_after = _to_float(headers.get("X-RateLimit-Reset-After"))
+    info.is_global   = (
+        str(headers.get("X-RateLimit-Global", "")).lower() == "true"
+        or headers.get("X-RateLimit-Scope") == "global"
+    )
+    return info
+
+def jittered_backoff(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    'full jitter' 지수 백오프: U(0, min(cap, base·2^(attempt-1))).
+    네트워크 오류(연결 끊김/타임아웃) 재시도 전용 — 429/5xx 는 discord.py HTTPClient 가 이미 재시도
+    """
+    return random.uniform(0.0, min(cap, base * (2 ** max(0, attempt - 1))))
+
+# --------------------------------------
+# 라우트/채널별 리미터
+# --------------------------------------
+class RouteRateLimiter:
+    """
+    (route, channel_id) 단위 슬라이딩 윈도 버킷 + 봇 전역 버킷.
+    - route 별로 예산 분리(전송/삭제가 서로의 예산을 잠식하지 않음)
+    - 429 수신 시 retry_after 만큼 정확히 해당 버킷(또는 전역)을 잠금
+    """
+    def __init__(
+            self,
+            route_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+            global_limit: Tuple[int, float] = GLOBAL_LIMIT,
+            clock: Clock = SYSTEM_CLOCK
+    ) -> None:
+        self._route_limits                                  = dict(route_limits or DEFAULT_ROUTE_LIMITS)
+        self._buckets: Dict[Tuple[str, int], WindowBucket]  = {}
+        self.clock: Clock                                   = clock
+        self._global                                        = WindowBucket(*global_limit, clock=clock)
+
+    def bucket(self, route: str, channel_id: int) -> WindowBucket:
+        key = (route, channel_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limit, window = self._route_limits.get(route, DEFAULT_ROUTE_LIMITS["send"])
+            bucket = self._buckets[key] = WindowBucket(limit, window, clock=self.clock)
+        return bucket
+
+    async def acquire(self, route: str, channel_id: int) -> float:
+        """라우트 버킷 → 전역 버킷 순으로 자리 확보. 총 대기 시간(초) 반환"""
+        waited  = await self.bucket(route, channel_id).acquire()
+        waited += await self._global.acquire()
+        return waited
+
+    def on_rate_limited(self, route: str, channel_id: int, info: RateLimitInfo) -> float:
+        """429 처리: 서버가 요구한 시간만큼 버킷 잠금. 잠근 시간(초) 반환"""
+        retry_after = info.retry_after if info.retry_after is not None else 1.0
+        target = self._global if info.is_global else self.bucket(route, channel_id)
+        target.block_for(retry_after)
+        return retry_after
+
+    def on_response(self, route: str, channel_id: int, info: RateLimitInfo) -> None:
+        """헤더가 있는 응답/예외에서 남은 예산을 동기화"""
+        self.bucket(route, channel_id).sync(info.remaining, info.reset_after)
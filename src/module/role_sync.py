@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import discord
+
+from typing                 import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple
+)
+from module.guild_registry  import GuildRegistry
+from module.subscription_manager import DM_PREF
+
+ROLE_NAME_TEMPLATE: str         = "{label} 알림"        # 관리 역할 이름
+ROLE_SYNC_INTERVAL: float       = 1.0                   # 연속 토글을 모으는 시간(초)
+ROLE_SYNC_DRAIN_SECONDS: float  = 5.0                   # 종료 시 남은 갱신 처리 예산(초)
+
+# (route, key, call, 설명) → 결과 | None  (MessageDispatcher.call_limited 와 동일 시그니처)
+LimitedCaller = Callable[..., Awaitable[object]]
+
+def render_role_mentions(header: str, role_ids: List[int]) -> List[str]:
+    """역할 멘션 모드 알림 본문: 구독자 수와 무관하게 메시지 1개"""
+    return [f"{header}{' '.join(f'<@&{role_id}>' for role_id in role_ids)}\n"]
+
+# --------------------------------------
+# 구독 ↔ 관리 역할 동기화 큐
+# --------------------------------------
+class RoleSyncQueue:
+    """
+    역할 멘션 모드에서 구독 타입(all 포함)마다 길드의 관리 역할 1개를 두고 구독 상태를 역할로 반영한다.
+    - submit(): 바뀐 타입을 (길드, 사용자) 단위로 병합 → 처리 시점의 구독 상태로 최종 결과만 API 호출
+    - DM 선호 사용자는 역할을 갖지 않음(채널 멘션 + DM 이중 알림 방지): DM 을 켜면 가진 관리 역할을 모두 회수,
+      끄면 구독 중인 타입의 역할을 다시 부여
+    - 역할 추가/제거는 멱등 API(PUT/DELETE) 1회씩, 길드별 "role" 버킷으로 레이트리밋
+    - ensure_roles(): 없는 역할을 만들고(멘션 가능) ID 를 길드 설정에 저장, 새로 만든 역할은 기존 구독자로 채움
+    - pause()/resume(): 발사 창 부하 차단(LoopMonitor) 동안 역할 갱신을 미룸(토글은 계속 병합)
+    """
+    def __init__(
+            self,
+            bot,
+            caller: LimitedCaller,
+            registry: GuildRegistry,
+            flush_interval: float = ROLE_SYNC_INTERVAL
+    ) -> None:
+        self.bot                                            = bot
+        self._caller                                        = caller
+        self._registry                                      = registry
+        self.flush_interval: float                          = flush_interval
+        self._pending: Dict[Tuple[int, int], Set[str]]      = {}
+        self._wake                                          = asyncio.Event()
+        self._resumed                                       = asyncio.Event()
+        self._resumed.set()
+        self._task: Optional[asyncio.Task]                  = None
+        self.applied: int                                   = 0
+        self.failed: int                                    = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    # ----- 공개 API -----
+    def submit(self, guild_id: int, user_id: int, changes: Dict[str, bool]) -> None:
+        self._pending.setdefault((guild_id, user_id), set()).update(changes)
+        self._wake.set()
+
+    def listener_for(self, guild_id: int) -> Callable[[int, Dict[str, bool]], None]:
+        """SubscriptionManager.add_listener 에 넘길 길드 전용 콜백"""
+        return lambda user_id, changes: self.submit(guild_id, user_id, changes)
+
+    def role_ids_for(self, guild_id: int, sub_type: str, all_type: str) -> Optional[List[int]]:
+        """알림에 멘션할 역할(sub_type + all). 역할이 준비되지 않았으면 None(사용자 멘션으로 대체)"""
+        config = self._registry.get(guild_id)
+        if config is None:
+            return None
+        ids = [config.role_ids.get(sub_type), config.role_ids.get(all_type)]
+        if not all(ids):
+            return None
+        return ids
+
+    async def ensure_roles(self, guild_id: int, labels: Dict[str, str]) -> bool:
+        """
+        labels(구독 타입 → 표시 이름)의 관리 역할을 준비한다.
+        Returns: 모든 역할이 준비되면 True
+        """
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return False
+        config   = self._registry.ensure(guild_id)
+        role_ids = dict(config.role_ids)
+        created: List[str] = []
+        for sub_type, label in labels.items():
+            role_id = role_ids.get(sub_type)
+            if role_id and guild.get_role(role_id) is not None:
+                continue
+            name = ROLE_NAME_TEMPLATE.format(label=label)
+            role = await self._caller(
+                "role", guild_id,
+                lambda name=name: guild.create_role(name=name, mentionable=True, reason="알림 구독 역할"),
+                "관리 역할 생성",
+            )
+            if role is None:
+                logging.error("관리 역할 생성 실패(길드 ID=%s, %s) → 사용자 멘션 유지", guild_id, name)
+                continue
+            role_ids[sub_type] = role.id
+            created.append(sub_type)
+        if role_ids != config.role_ids:
+            self._registry.update(guild_id, role_ids=role_ids)
+            await self._registry.persist()
+        if created:
+            self._backfill(guild_id, created)
+        return all(role_ids.get(t) for t in labels)
+
+    def _backfill(self, guild_id: int, sub_types: List[str]) -> None:
+        """새로 만든 역할을 현재 구독자에게 부여하도록 큐에 적재"""
+        manager = self._registry.manager_for(guild_id)
+        count   = 0
+        for sub_type in sub_types:
+            for user_id in manager.subscribers_of(sub_type):
+                self.submit(guild_id, user_id, {sub_type: True})
+                count += 1
+        if count:
+            logging.info("관리 역할 초기 부여 %d건 대기(길드 ID=%s)", count, guild_id)
+
+    def pause(self) -> None:
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    # ----- 수명주기 -----
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, drain_timeout: float = ROLE_SYNC_DRAIN_SECONDS) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.resume()
+        if self._pending and drain_timeout > 0:
+            try:
+                await asyncio.wait_for(self._drain(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logging.warning("역할 갱신 %d건을 처리하지 못하고 종료", len(self._pending))
+
+    # ----- 내부 -----
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(self.flush_interval)   # 연속 클릭 병합
+            self._wake.clear()
+            await self._resumed.wait()
+            await self._drain()
+
+    async def _drain(self) -> None:
+        while self._pending:
+            await self._resumed.wait()
+            (guild_id, user_id), changed = next(iter(self._pending.items()))
+            del self._pending[(guild_id, user_id)]
+            config = self._registry.get(guild_id)
+            if config is None:
+                continue
+            manager = self._registry.manager_for(guild_id)
+            current = set(manager.types_of(user_id))
+            if DM_PREF in changed:
+                # 수신 방식 전환: 구독 중인 모든 타입의 역할을 다시 맞춤
+                changed = changed | current
+            wants_role = DM_PREF not in current
+            for sub_type in changed - {DM_PREF}:
+                role_id = config.role_ids.get(sub_type)
+                if not role_id:
+                    continue
+                await self._apply(guild_id, user_id, role_id, wants_role and sub_type in current)
+
+    async def _apply(self, guild_id: int, user_id: int, role_id: int, subscribed: bool) -> None:
+        http = self.bot.http
+        if subscribed:
+            call, what = (lambda: http.add_role(guild_id, user_id, role_id, reason="알림 구독")), "역할 부여"
+        else:
+            call, what = (lambda: http.remove_role(guild_id, user_id, role_id, reason="알림 구독 해제")), "역할 회수"
+        ok = await self._caller("role", guild_id, self._ok(call), what)
+        if ok:
+            self.applied += 1
+        else:
+            self.failed += 1
+
+    @staticmethod
+    def _ok(call):
+        async def wrapped() -> bool:
+            await call()
+            return True
+        return wrapped
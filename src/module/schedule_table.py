@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from dataclasses            import dataclass
+from typing                 import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+from module.alert_service   import (
+    DISCORD_MESSAGE_LIMIT,
+    HOURLY_5MIN_TEMPLATE,
+    HOURLY_3MIN_TEMPLATE,
+    HOURLY_CHECK_TEMPLATE,
+    render_header
+)
+
+ALL_HOURS: Tuple[int, ...]      = tuple(range(24))
+ALL_WEEKDAYS: Tuple[int, ...]   = tuple(range(7))       # 월=0 … 일=6
+DEFAULT_EMOJI: str              = "<emoji_37:1400881330769756243>"
+BUTTON_STYLES: Tuple[str, ...]  = ("primary", "secondary", "success", "danger")
+
+# --------------------------------------
+# 이벤트 정의(선언형 스케줄 1행)
+# --------------------------------------
+@dataclass(frozen=True)
+class EventSpec:
+    """
+    Config.json 의 ALERT_SCHEDULE 한 항목.
+    - key              : 구독 타입 키(버튼 custom_id, 저장소 키)
+    - minutes/hours/weekdays : cron 과 같은 발사 시각 집합(KST)
+    - template         : 헤더 템플릿({hour}, {minute}, {next_hour}, {label})
+    - lead_seconds     : 사전 렌더링 시점(발사 몇 초 전)
+    - deadline_seconds : 발사 후 이 시간이 지나면 전송하지 않음
+    - family           : 수정 모드에서 상태 메시지를 함께 쓰는 이벤트 묶음(없으면 key 단독)
+    """
+    key: str
+    label: str
+    template: str
+    minutes: Tuple[int, ...]
+    hours: Tuple[int, ...]          = ALL_HOURS
+    weekdays: Tuple[int, ...]       = ALL_WEEKDAYS
+    lead_seconds: float             = 60.0
+    deadline_seconds: float         = 300.0
+    emoji: Optional[str]            = None
+    style: str                      = "primary"
+    family: Optional[str]           = None
+
+    @property
+    def live_family(self) -> str:
+        """수정 모드의 상태 메시지 계열"""
+        return self.family or self.key
+
+    def next_fire_after(self, after: dt.datetime) -> dt.datetime:
+        """after 보다 엄격히 늦은 첫 발사 시각(after 와 같은 tz)"""
+        hour_start = after.replace(minute=0, second=0, microsecond=0)
+        for offset in range(8 * 24):    # 최대 1주 + 여유
+            base = hour_start + dt.timedelta(hours=offset)
+            if base.hour not in self.hours or base.weekday() not in self.weekdays:
+                continue
+            for minute in self.minutes:
+                fire_at = base.replace(minute=minute)
+                if fire_at > after:
+                    return fire_at
+        raise ValueError(f"발사 시각을 찾을 수 없습니다: {self.key}")
+
+    def render_header(self, fire_at: dt.datetime) -> str:
+        return render_header(self.template, fire_at, self.label)
+
+# 기존 결계 알림(55/57/00분)과 동일한 기본 스케줄
+DEFAULT_SCHEDULE: List[EventSpec] = [
+    EventSpec(key="minute_5_before", label="정각 5분 전", template=HOURLY_5MIN_TEMPLATE,
+              minutes=(55,), deadline_seconds=300, emoji=DEFAULT_EMOJI, family="hourly"),
+    EventSpec(key="minute_3_before", label="정각 3분 전", template=HOURLY_3MIN_TEMPLATE,
+              minutes=(57,), deadline_seconds=180, emoji=DEFAULT_EMOJI, family="hourly"),
+    EventSpec(key="on_time",         label="정각",        template=HOURLY_CHECK_TEMPLATE,
+              minutes=(0,),  deadline_seconds=300, emoji="🔔", family="hourly"),
+]
+
+# --------------------------------------
+# 로딩/검증
+# --------------------------------------
+def _int_set(value: Any, name: str, lo: int, hi: int, default: Tuple[int, ...]) -> Tuple[int, ...]:
+    """정수 / 정수 리스트 / "*" 를 정렬된 튜플로 변환"""
+    if value is None or value == "*":
+        return default
+    values = [value] if isinstance(value, int) else list(value)
+    if not values or any(not isinstance(v, int) or not lo <= v <= hi for v in values):
+        raise ValueError(f"{name} 는 {lo}~{hi} 범위의 정수(또는 리스트, '*')여야 합니다: {value!r}")
+    return tuple(sorted(set(values)))
+
+def _seconds(value: Any, name: str) -> float:
+    """0 이상의 초 값(음수면 스케줄러의 따라잡기/마감 판정이 조용히 어긋남)"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{name} 는 숫자(초)여야 합니다: {value!r}") from e
+    if not seconds >= 0:
+        raise ValueError(f"{name} 는 0 이상이어야 합니다: {value!r}")
+    return seconds
+
+def parse_event(raw: Dict[str, Any], default_lead_seconds: float = 60.0) -> EventSpec:
+    try:
+        key      = str(raw["key"])
+        template = str(raw["template"])
+    except KeyError as e:
+        raise ValueError(f"ALERT_SCHEDULE 항목에 필수 키 누락: {e}") from e
+    if key in ("all", "dm"):
+        raise ValueError(f"'{key}' 는 예약어(전체 구독/DM 전환)라 이벤트 key 로 쓸 수 없습니다.")
+    style = raw.get("style", "primary")
+    if style not in BUTTON_STYLES:
+        raise ValueError(f"style 은 {BUTTON_STYLES} 중 하나여야 합니다: {style!r}")
+    spec = EventSpec(
+        key              = key,
+        label            = str(raw.get("label", key)),
+        template         = template,
+        minutes          = _int_set(raw.get("minute"), "minute", 0, 59, (0,)),
+        hours            = _int_set(raw.get("hour"), "hour", 0, 23, ALL_HOURS),
+        weekdays         = _int_set(raw.get("weekday"), "weekday", 0, 6, ALL_WEEKDAYS),
+        lead_seconds     = _seconds(raw.get("lead_seconds", default_lead_seconds), f"'{key}' lead_seconds"),
+        deadline_seconds = _seconds(raw.get("deadline_seconds", 300), f"'{key}' deadline_seconds"),
+        emoji            = raw.get("emoji"),
+        style            = style,
+        family           = str(raw["family"]) if raw.get("family") else None,
+    )
+    # 템플릿 필드 오타와 길이 초과는 시작 시점에 잡는다(22:59 → 시/분/다음 시 모두 두 자리인 최장 렌더링)
+    try:
+        header = spec.render_header(dt.datetime(2000, 1, 1, 22, 59))
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(
+            f"'{key}' 템플릿 필드 오류({type(e).__name__}: {e}) — 쓸 수 있는 필드: {{hour}}, {{minute}}, {{next_hour}}, {{label}}"
+        ) from e
+    if len(header) + 1 > DISCORD_MESSAGE_LIMIT:
+        raise ValueError(
+            f"'{key}' 템플릿이 너무 깁니다(렌더링 {len(header)}자, 최대 {DISCORD_MESSAGE_LIMIT - 1}자)"
+        )
+    return spec
+
+def load_schedule(raw: Optional[List[Dict[str, Any]]], default_lead_seconds: float = 60.0) -> List[EventSpec]:
+    """
+    Config.json 의 ALERT_SCHEDULE 를 EventSpec 목록으로 변환.
+    - 값이 없으면 기본 결계 스케줄(lead_seconds 만 반영)
+    Raises: ValueError (형식 오류, key 중복 등)
+    """
+    if not raw:
+        return [
+            EventSpec(**{**spec.__dict__, "lead_seconds": float(default_lead_seconds)})
+            for spec in DEFAULT_SCHEDULE
+        ]
+    events = [parse_event(item, default_lead_seconds) for item in raw]
+    keys   = [e.key for e in events]
+    if len(keys) != len(set(keys)):
+        raise ValueError(f"ALERT_SCHEDULE key 중복: {keys}")
+    if len(events) > 23:
+        raise ValueError("ALERT_SCHEDULE 는 최대 23개(버튼 25개 - 전체 구독/DM 전환 2개)까지 지원합니다.")
+    return events
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import heapq
+import itertools
+import logging
+
+from dataclasses            import dataclass
+from typing                 import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple
+)
+from module.clock           import (
+    SYSTEM_CLOCK,
+    Clock
+)
+from module.metrics         import METRICS
+
+# 발사 콜백: (이벤트 키, 예정 발사 시각, 지연 초)
+FireCallback    = Callable[[str, dt.datetime, float], Awaitable[None]]
+# 사전 준비 콜백: (이벤트 키, 예정 발사 시각)
+PrepareCallback = Callable[[str, dt.datetime], None]
+
+MAX_SLEEP_SECONDS: float = 30.0     # 시스템 시계 변경/루프 정지를 감지하기 위한 최대 1회 수면
+
+FIRE_LATENESS_SECONDS = METRICS.histogram("alertbot_fire_lateness_seconds", "예정 시각 대비 발사 지연", ("event",))
+FIRE_MISSED           = METRICS.counter("alertbot_fire_missed_total", "허용치를 넘겨 누락된 발사 수", ("event",))
+
+@dataclass(frozen=True)
+class FireTrace:
+    """발사(또는 누락) 1건의 기록: 예정 시각, 실제 처리 시각(clock 기준), 지연"""
+    event: str
+    scheduled: dt.datetime
+    fired: dt.datetime
+    lateness: float
+    missed: bool = False
+
+# 발사 기록 리스너(시뮬레이션 재생 추적/모니터링)
+FireListener = Callable[[FireTrace], None]
+
+class ScheduledEvent(Protocol):
+    """스케줄러가 요구하는 이벤트 인터페이스(EventSpec 이 구현)"""
+    key: str
+    lead_seconds: float
+    deadline_seconds: float
+
+    def next_fire_after(self, after: dt.datetime) -> dt.datetime: ...
+
+# 힙 항목: (깨어날 시각, 순번, 종류("prepare"|"fire"), 이벤트 키, 예정 발사 시각)
+TimerEntry = Tuple[dt.datetime, int, str, str, dt.datetime]
+
+# --------------------------------------
+# 절대 시각 기반 알림 스케줄러(타이머 힙)
+# --------------------------------------
+class AlertScheduler:
+    """
+    매 분 폴링 대신 '다음 절대 발사 시각'까지 잠들었다가 깨어나는 스케줄러.
+    - 모든 이벤트의 다음 발사/사전 준비 시각을 하나의 min-heap 으로 관리 → 이벤트 수와 무관하게 루프 1개
+    - 깨어난 시점이 예정 시각보다 늦어도 허용치 이내면 즉시 따라잡아 발사, 넘으면 누락으로 기록
+      (허용치 = max(catchup_tolerance, 이벤트 deadline_seconds) → 재시작 직후에도 마감 전이면 발사.
+       같은 슬롯의 중복 발사는 on_fire 쪽 발사 원장이 막는다)
+    - 이벤트별 lead_seconds 전에 prepare 콜백 호출(사전 렌더링)
+    - 모든 발사의 지연(lateness)을 로그로 남김
+    - 시각/수면은 주입한 clock 기준(SimulatedClock 이면 며칠치 스케줄을 가속 재생)
+    """
+    def __init__(
+            self,
+            events: Sequence[ScheduledEvent],
+            on_fire: FireCallback,
+            on_prepare: Optional[PrepareCallback] = None,
+            tz: dt.tzinfo = dt.timezone.utc,
+            catchup_tolerance: float = 90.0,
+            clock: Clock = SYSTEM_CLOCK
+    ) -> None:
+        self.events: Dict[str, ScheduledEvent]      = {e.key: e for e in events}
+        self._on_fire                               = on_fire
+        self._on_prepare                            = on_prepare
+        self.tz                                     = tz
+        self.catchup_tolerance: float               = catchup_tolerance
+        self.clock: Clock                           = clock
+        self._heap: List[TimerEntry]                = []
+        self._seq                                   = itertools.count()
+        self._task: Optional[asyncio.Task]          = None
+        self.missed: int                            = 0
+        self._generation: int                       = 0     # reschedule() 마다 증가(이전 힙 기준 재등록 방지)
+        self._listeners: List[FireListener]         = []
+
+    def now(self) -> dt.datetime:
+        return self.clock.now(self.tz)
+
+    def add_listener(self, listener: FireListener) -> None:
+        """발사/누락마다 FireTrace 를 받는 콜백 등록(발사 콜백이 끝난 뒤 호출)"""
+        self._listeners.append(listener)
+
+    def _notify(self, trace: FireTrace) -> None:
+        for listener in self._listeners:
+            try:
+                listener(trace)
+            except Exception:
+                logging.exception("발사 기록 리스너 실패(%s)", trace.event)
+
+    def tolerance(self, event: ScheduledEvent) -> float:
+        return max(self.catchup_tolerance, event.deadline_seconds)
+
+    def next_fire_times(self) -> Dict[str, dt.datetime]:
+        """이벤트별 다음 예정 발사 시각(모니터링/명령어 표시용)"""
+        return {key: fire_at for _, _, kind, key, fire_at in self._heap if kind == "fire"}
+
+    # ----- 수명주기 -----
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        # 시작 직전 허용치 안에 지나간 발사는 따라잡기 대상으로 포함
+        now         = self.now()
+        self._heap  = []
+        for event in self.events.values():
+            horizon = now - dt.timedelta(seconds=self.tolerance(event))
+            self._push_fire(event, event.next_fire_after(horizon))
+        self._task = asyncio.create_task(self._run())
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def reschedule(self, events: Sequence[ScheduledEvent]) -> None:
+        """
+        이벤트 정의 교체(설정 재적재). 실행 중이면 지금 이후의 발사/사전 준비 시각으로 힙을 다시 만든다.
+        (이미 지난 슬롯은 다시 발사하지 않음)
+        """
+        self.events       = {e.key: e for e in events}
+        self._generation += 1
+        if not self.is_running():
+            return
+        now         = self.now()
+        self._heap  = []
+        for event in self.events.values():
+            self._push_fire(event, event.next_fire_after(now))
+        logging.info("알림 스케줄 재구성: %s", ", ".join(
+            f"{key}={fire_at.strftime('%H:%M')}" for key, fire_at in sorted(self.next_fire_times().items())
+        ))
+
+    # ----- 내부 -----
+    def _push_fire(self, event: ScheduledEvent, fire_at: dt.datetime) -> None:
+        heapq.heappush(self._heap, (fire_at, next(self._seq), "fire", event.key, fire_at))
+        if self._on_prepare is not None:
+            prepare_at = fire_at - dt.timedelta(seconds=event.lead_seconds)
+            heapq.heappush(self._heap, (prepare_at, next(self._seq), "prepare", event.key, fire_at))
+
+    async def _run(self) -> None:
+        while True:
+            if not self._heap:
+                logging.warning("스케줄에 등록된 이벤트가 없어 스케줄러 종료")
+                return
+            delay = (self._heap[0][0] - self.now()).total_seconds()
+            if delay > 0:
+                await self.clock.sleep(min(delay, MAX_SLEEP_SECONDS))
+                continue
+            _, _, kind, key, fire_at = heapq.heappop(self._heap)
+            if kind == "prepare":
+                self._prepare(key, fire_at)
+            else:
+                await self._fire(key, fire_at)
+
+    def _prepare(self, key: str, fire_at: dt.datetime) -> None:
+        if fire_at <= self.now():
+            return  # 이미 발사 시각이 지났으면 발사 시 즉시 렌더링
+        try:
+            self._on_prepare(key, fire_at)
+        except Exception:
+            logging.exception("알림 사전 준비 실패(%s)", key)
+
+    async def _fire(self, key: str, fire_at: dt.datetime) -> None:
+        event      = self.events[key]
+        generation = self._generation
+        tolerance  = self.tolerance(event)
+        now       = self.now()
+        lateness  = (now - fire_at).total_seconds()
+        if lateness <= tolerance:
+            FIRE_LATENESS_SECONDS.observe(max(0.0, lateness), event=key)
+            logging.info(
+                "알림 발사(%s, %s) 지연 %.1fms", key, fire_at.strftime("%m-%d %H:%M"), lateness * 1000,
+                extra={"event": "fire", "alert": key, "lateness_ms": round(lateness * 1000, 1)},
+            )
+            try:
+                await self._on_fire(key, fire_at, lateness)
+            except Exception:
+                logging.exception("알림 발사 콜백 실패(%s)", key)
+            self._notify(FireTrace(key, fire_at, now, lateness))
+        else:
+            self.missed += 1
+            FIRE_MISSED.inc(event=key)
+            logging.error(
+                "알림 누락(%s, %s): %.1fs 지연으로 허용치(%.0fs) 초과",
+                key, fire_at.strftime("%m-%d %H:%M"), lateness, tolerance,
+                extra={"event": "fire_missed", "alert": key, "lateness_ms": round(lateness * 1000, 1)},
+            )
+            self._notify(FireTrace(key, fire_at, now, lateness, missed=True))
+        if generation != self._generation:
+            return  # 발사 중 스케줄이 교체됨 → 다음 시각은 reschedule() 이 이미 등록
+        # 여러 번 밀렸어도 지난 발사는 한 번만 처리하고 다음 시각으로 이동
+        after = max(fire_at, now - dt.timedelta(seconds=tolerance))
+        self._push_fire(event, event.next_fire_after(after))
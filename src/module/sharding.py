@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses            import dataclass
+from pathlib                import PurePath
+from typing                 import (
+    Any,
+    Optional,
+    Tuple
+)
+
+def shard_id_for(guild_id: int, shard_count: int) -> int:
+    """디스코드 샤딩 공식: (guild_id >> 22) % shard_count"""
+    return (guild_id >> 22) % shard_count
+
+# --------------------------------------
+# 샤드 배치(프로세스가 담당하는 샤드 집합)
+# --------------------------------------
+@dataclass(frozen=True)
+class ShardPlan:
+    """
+    Config.json 의 SHARD_COUNT / SHARD_IDS.
+    - shard_count 없음            : 샤딩 안 함(commands.Bot, 연결 1개)
+    - shard_count 만 지정          : 한 프로세스가 모든 샤드 담당(AutoShardedBot)
+    - shard_count + shard_ids 지정 : 여러 프로세스가 샤드를 나눠 담당(is_partial)
+      → 프로세스별 상태 파일 분리(state_file_name), 구독 상태는 공유 SQLite 로 일관성 유지
+    """
+    shard_count: Optional[int]          = None
+    shard_ids: Optional[Tuple[int, ...]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.shard_count is not None
+
+    @property
+    def is_partial(self) -> bool:
+        return self.enabled and self.shard_ids is not None and len(self.shard_ids) < self.shard_count
+
+    def owns(self, guild_id: int) -> bool:
+        """이 프로세스가 해당 길드의 알림/설정을 담당하는지"""
+        if not self.is_partial:
+            return True
+        return shard_id_for(guild_id, self.shard_count) in self.shard_ids
+
+    def state_file_name(self, file_name: str) -> str:
+        """프로세스 전용 상태 파일명. 예: fire_ledger.jsonl → fire_ledger.shard-0-1.jsonl"""
+        if not self.is_partial:
+            return file_name
+        path = PurePath(file_name)
+        tag  = "-".join(str(i) for i in self.shard_ids)
+        return f"{path.stem}.shard-{tag}{path.suffix}"
+
+    def describe(self) -> str:
+        if not self.enabled:
+            return "샤딩 안 함"
+        ids = "전체" if self.shard_ids is None else ", ".join(map(str, self.shard_ids))
+        return f"샤드 {ids} / 총 {self.shard_count}"
+
+def parse_shard_plan(shard_count: Any = None, shard_ids: Any = None) -> ShardPlan:
+    """
+    설정값 검증 후 ShardPlan 생성.
+    Raises: ValueError (범위 밖/중복 샤드 ID, shard_count 없이 shard_ids 지정 등)
+    """
+    if shard_count in (None, 0):
+        if shard_ids:
+            raise ValueError("SHARD_IDS 는 SHARD_COUNT 와 함께 지정해야 합니다.")
+        return ShardPlan()
+    if not isinstance(shard_count, int) or shard_count < 1:
+        raise ValueError(f"SHARD_COUNT 는 1 이상의 정수여야 합니다: {shard_count!r}")
+    if shard_ids is None:
+        return ShardPlan(shard_count=shard_count)
+    ids = [shard_ids] if isinstance(shard_ids, int) else list(shard_ids)
+    if not ids or any(not isinstance(i, int) or not 0 <= i < shard_count for i in ids):
+        raise ValueError(f"SHARD_IDS 는 0~{shard_count - 1} 범위의 정수 리스트여야 합니다: {shard_ids!r}")
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"SHARD_IDS 중복: {shard_ids!r}")
+    return ShardPlan(shard_count=shard_count, shard_ids=tuple(sorted(ids)))
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from contextlib             import contextmanager
+from typing                 import (
+    Dict,
+    Iterator,
+    Optional
+)
+from module.metrics         import METRICS
+
+PROFILE_STARTUP_FLAG: str   = "--profile-startup"    # main.py 인자: 첫 on_ready 까지 단계별 시간을 로그로 남기고 종료
+
+# 보고 순서(없는 단계는 생략). store_load 는 login/gateway 와 동시에 진행
+STARTUP_PHASES = ("imports", "config", "bot_imports", "setup", "login", "store_load", "gateway", "ready")
+
+# --------------------------------------
+# 콜드 스타트 단계별 시간
+# --------------------------------------
+class StartupProfile:
+    """
+    프로세스 시작부터 첫 on_ready 처리 완료까지의 단계별 소요 시간.
+    - phase(): 순차 단계(with 블록), record(): 따로 잰 값(다른 단계와 동시에 진행된 작업 등)
+    - mark()/since(): 단계 경계 시점(예: 로그인 끝 → 첫 READY 까지 = gateway)
+    - finish(): 전체 시간 확정 + 지표(alertbot_startup_seconds) 노출, report() 로 한 줄 요약
+    - exit_after_ready: 보고 후 봇을 종료(--profile-startup, 배포 전 콜드 스타트 측정용)
+    """
+    def __init__(self, started: Optional[float] = None, exit_after_ready: bool = False) -> None:
+        self.started: float             = time.perf_counter() if started is None else started
+        self.exit_after_ready: bool     = exit_after_ready
+        self.phases: Dict[str, float]   = {}
+        self.total: Optional[float]     = None
+        self._marks: Dict[str, float]   = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - began)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = seconds
+
+    def mark(self, name: str) -> None:
+        self._marks[name] = time.perf_counter()
+
+    def since(self, name: str) -> Optional[float]:
+        """mark(name) 이후 경과 시간(표시가 없으면 None)"""
+        began = self._marks.get(name)
+        return time.perf_counter() - began if began is not None else None
+
+    @property
+    def finished(self) -> bool:
+        return self.total is not None
+
+    def finish(self) -> None:
+        self.total = time.perf_counter() - self.started
+        METRICS.gauge("alertbot_startup_seconds", "콜드 스타트 단계별 소요 시간", ("phase",)).set_function(
+            lambda: {(name,): seconds for name, seconds in {**self.phases, "total": self.total}.items()}
+        )
+
+    def report(self) -> str:
+        names = [n for n in STARTUP_PHASES if n in self.phases] + [n for n in self.phases if n not in STARTUP_PHASES]
+        parts = [f"{name}={self.phases[name] * 1000:.0f}ms" for name in names]
+        total = self.total if self.total is not None else time.perf_counter() - self.started
+        return f"시작 소요 {total * 1000:.0f}ms ({', '.join(parts)})"
+
+    def log(self) -> None:
+        logging.info(self.report())
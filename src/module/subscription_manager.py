@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+
+from bisect                 import bisect_left, insort
+from collections            import deque
+from typing                 import (
+    Callable,
+    List,
+    Dict,
+    Set,
+    Tuple,
+    Optional,
+    Deque
+)
+from module.metrics         import METRICS
+from module.user_store      import open_subscription_store
+
+# --------------------------------------
+# 구독 타입/비트 플래그
+# --------------------------------------
+SUB_TYPES: List[str]        = ["minute_5_before", "minute_3_before", "on_time"]
+ALL_TYPE: str               = "all"
+DM_PREF: str                = "dm"       # 수신 방식 선호(켜짐 = 채널 멘션 대신 DM), 구독 타입과 같은 방식으로 저장
+
+CHANGE_LOG_SIZE: int        = 10_000     # 사전 렌더링 패치용 변경 이력 보관 개수
+FLUSH_INTERVAL: float       = 0.5        # write-behind 저장 주기(초)
+RETRY_INTERVAL: float       = 5.0        # 저장 실패 시 재시도 간격(초)
+TOGGLE_BURST: int           = 5          # 사용자당 연속 토글 허용 수
+TOGGLE_REFILL_SECONDS: float = 2.0       # 이 시간마다 1회씩 다시 허용(지속 0.5회/초)
+THROTTLE_TRACK_MAX: int     = 10_000     # 기억하는 사용자 수가 이를 넘으면 다 회복된 사용자부터 정리
+
+TOGGLE_SECONDS  = METRICS.histogram("alertbot_toggle_seconds", "구독 토글 1건 처리 시간")
+TOGGLE_THROTTLED = METRICS.counter("alertbot_toggle_throttled_total", "사용자별 토글 한도 초과로 거절한 클릭 수")
+SAVE_SECONDS    = METRICS.histogram("alertbot_subscription_save_seconds", "write-behind 구독 저장 1회 소요 시간")
+
+def build_type_bits(sub_types: List[str]) -> Dict[str, int]:
+    """구독 타입 목록 → 비트 할당(순서대로 0,1,2…, 그 다음 'all', 마지막은 DM 선호)"""
+    bits = {t: 1 << i for i, t in enumerate(sub_types)}
+    bits[ALL_TYPE] = 1 << len(sub_types)
+    bits[DM_PREF]  = 1 << (len(sub_types) + 1)
+    return bits
+
+# 구독 변경 리스너: (user_id, {바뀐 타입(all 포함): 구독 여부})
+ChangeListener = Callable[[int, Dict[str, bool]], None]
+
+# 사용자당 int 하나로 구독 상태 표현(타입별 set 4개 대체)
+TYPE_BITS: Dict[str, int]   = build_type_bits(SUB_TYPES)
+
+DEFAULT_LABELS: Dict[str, str] = {
+    "minute_5_before": "정각 5분 전",
+    "minute_3_before": "정각 3분 전",
+    "on_time":         "정각",
+    ALL_TYPE:          "전체",
+    DM_PREF:           "DM 알림",
+}
+
+# --------------------------------------
+# 사용자별 토글 한도
+# --------------------------------------
+class ToggleThrottle:
+    """
+    사용자별 토큰 버킷(용량 burst, refill_seconds 마다 1개 충전). 기다리지 않고 즉시 허용/거절만 판정.
+    - 연타/매크로 한 명이 저장·역할 동기화·사전 렌더링 패치를 계속 만들어 내지 못하게 함
+    - 가득 찬(다 회복된) 사용자는 기억할 필요가 없어 THROTTLE_TRACK_MAX 를 넘으면 정리
+    - 한도는 인스턴스 단위: 여러 매니저(길드)가 같은 인스턴스를 쓰면 길드 수와 상관없이 사용자당 한도 1개
+    """
+    def __init__(self, burst: int = TOGGLE_BURST, refill_seconds: float = TOGGLE_REFILL_SECONDS) -> None:
+        self.burst: int                                 = burst
+        self.refill_seconds: float                      = refill_seconds
+        self._buckets: Dict[int, Tuple[float, float]]   = {}    # user_id → (남은 토큰, 갱신 시각)
+        self._prune_at: int                             = THROTTLE_TRACK_MAX
+        self.rejected: int                              = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _tokens(self, user_id: int, now: float) -> float:
+        tokens, updated = self._buckets.get(user_id, (float(self.burst), now))
+        return min(float(self.burst), tokens + (now - updated) / self.refill_seconds)
+
+    def check(self, user_id: int, now: Optional[float] = None) -> float:
+        """토큰 1개 소비 시도. 허용이면 0, 거절이면 다시 누를 수 있을 때까지 남은 초"""
+        now    = time.monotonic() if now is None else now
+        tokens = self._tokens(user_id, now)
+        if tokens < 1.0:
+            self.rejected += 1
+            TOGGLE_THROTTLED.inc()
+            return (1.0 - tokens) * self.refill_seconds
+        self._buckets[user_id] = (tokens - 1.0, now)
+        if len(self._buckets) > self._prune_at:
+            self._buckets  = {u: v for u, v in self._buckets.items() if self._tokens(u, now) < self.burst}
+            # 아직 회복 중인 사용자가 많으면 다음 정리는 그 두 배에서(클릭마다 전체 정리 방지)
+            self._prune_at = max(THROTTLE_TRACK_MAX, 2 * len(self._buckets))
+        return 0.0
+
+# --------------------------------------
+# 구독 상태 매니저 (동시성 안전)
+# --------------------------------------
+class SubscriptionManager:
+    """
+    구독 상태를 일원화하여 관리하는 매니저.
+    - 토글 동시성: 토글 처리 구간에 await 가 없어 이벤트 루프에서 원자적으로 실행 → 별도 잠금 없이 도착 순서대로 적용
+    - 사용자별 토글 한도(ToggleThrottle): 초과 클릭은 상태를 바꾸지 않고 잠시 뒤 다시 누르라고 응답
+      (throttle 을 넘기지 않으면 매니저마다 따로 둠 → 봇은 모든 길드 매니저가 하나를 공유)
+    - 'all'과 개별 구독 간 배타성 보장
+    - 구독 타입은 스케줄 테이블에서 주입(sub_types/labels), 기본값은 결계 3종
+    - 상태: 사용자별 비트 플래그(dict[user_id] = flags)
+    - 수신자 인덱스: 알림 타입별 정렬 리스트(`all ∪ sub_type`)를 토글 시 증분 갱신
+    - 변경 이력: version + (version, user_id) 로그 → 사전 렌더링된 페이로드에 차이분만 패치
+    - 저장: write-behind. 토글은 메모리만 바꾸고 즉시 반환(상호작용 3초 제한과 디스크 속도 분리)
+      변경된 사용자만 dirty 로 모아 flush_interval 마다 record_many 1회로 반영
+      (같은 사용자의 연속 토글은 최종 상태 1건으로 병합, json=저널 n줄, sqlite=트랜잭션 1회)
+      json 백엔드는 임계치 도달 시 백그라운드 압축(스냅샷 교체), 종료 시 flush() 로 남은 변경 저장
+    - 수신 방식: DM 선호 비트(toggle(user, 'dm')) → 채널 멘션 대상에서 빠지고 DM 대상(dm_recipients)에 포함
+    - add_listener(): 토글로 바뀐 타입별 구독 여부를 통지(역할 동기화 등)
+    - 공유 백엔드(sqlite)는 refresh() 로 다른 프로세스의 변경을 감지해 다시 읽음(샤드 프로세스 간 일관성)
+    """
+    def __init__(
+            self,
+            file_name: str,
+            backend: str = "json",
+            sub_types: Optional[List[str]] = None,
+            labels: Optional[Dict[str, str]] = None,
+            flush_interval: float = FLUSH_INTERVAL,
+            throttle: Optional[ToggleThrottle] = None
+    ) -> None:
+        self.sub_types: List[str]                   = list(sub_types or SUB_TYPES)
+        self._bits: Dict[str, int]                  = build_type_bits(self.sub_types)
+        self._labels: Dict[str, str]                = {**DEFAULT_LABELS, **(labels or {})}
+        self._file_name: str                        = file_name
+        self.throttle: ToggleThrottle               = throttle or ToggleThrottle()
+        self._store                                 = open_subscription_store(file_name, backend)
+        self._compaction: Optional[asyncio.Task]    = None
+        self.flush_interval: float                  = flush_interval
+        self._dirty: Dict[int, None]                = {}    # 저장 대기 사용자(삽입 순서 유지 집합)
+        self._write_lock: asyncio.Lock              = asyncio.Lock()
+        self._writer: Optional[asyncio.Task]        = None
+        self._listeners: List[ChangeListener]       = []
+        self._flags: Dict[int, int]                 = {}
+        self._recipients: Dict[str, List[int]]      = {t: [] for t in self.sub_types}
+        self._dm_users: Set[int]                    = set()
+        self.version: int                           = 0
+        self._change_log: Deque[Tuple[int, int]]    = deque(maxlen=CHANGE_LOG_SIZE)
+        self._seen_data_version: Optional[int]     = self._store.data_version()
+        self._load(self._store.load())
+
+    def _load(self, data: Dict[str, Set[int]]) -> None:
+        """백엔드의 {타입: set} 를 비트 플래그 + 수신자 인덱스로 변환"""
+        flags: Dict[int, int] = {}
+        for t, users in data.items():
+            bit = self._bits.get(t)
+            if bit is None:
+                continue
+            for user_id in users:
+                flags[user_id] = flags.get(user_id, 0) | bit
+        self._flags = flags
+        dm_bit      = self._bits[DM_PREF]
+        self._dm_users = {u for u, f in flags.items() if f & dm_bit}
+        for t in self.sub_types:
+            mask = self._bits[t] | self._bits[ALL_TYPE]
+            self._recipients[t] = sorted(u for u, f in flags.items() if f & mask)
+
+    async def toggle(self, user_id: int, sub_type: str) -> Tuple[bool, str]:
+        """
+        구독/해제를 토글한다.
+        - sub_type == 'all': 개별 구독 모두 제거 후 all 토글
+        - sub_type in self.sub_types: all 제거 후 해당 타입만 토글
+        - sub_type == 'dm': 수신 방식(DM ↔ 채널 멘션)만 전환, 구독은 그대로
+        - 사용자별 한도를 넘은 클릭은 거절(False). 허용된 연속 토글은 저장 시 최종 상태 1건으로 병합
+        Returns: (성공여부, 사용자 메시지)
+        """
+        started = time.perf_counter()
+        try:
+            return await self._toggle(user_id, sub_type)
+        finally:
+            TOGGLE_SECONDS.observe(time.perf_counter() - started)
+
+    async def _toggle(self, user_id: int, sub_type: str) -> Tuple[bool, str]:
+        retry_after = self.throttle.check(user_id)
+        if retry_after > 0:
+            return False, f"⏳ 그만 좀 눌러. {math.ceil(retry_after)}초 뒤에 다시 해."
+        try:
+            old = self._flags.get(user_id, 0)
+            bit = self._bits[sub_type]
+            dm  = old & self._bits[DM_PREF]
+            if sub_type == DM_PREF:
+                new = old ^ bit
+            elif sub_type == ALL_TYPE:
+                # 개별 구독 모두 제거 후 all 토글(수신 방식은 유지)
+                new = (0 if old & bit else bit) | dm
+            else:
+                # 개별 구독 선택 시 all에서 제외
+                new = (old & ~self._bits[ALL_TYPE]) ^ bit
+            label = self._label_from_type(sub_type)
+            if sub_type == DM_PREF:
+                msg = (
+                    "📬 이제 알림은 DM으로 간다. DM 막아두면 못 받는 거 알지?"
+                    if new & bit else
+                    "📢 다시 채널에서 멘션해줄게. 놓치지 마."
+                )
+            elif new & bit:
+                msg = f"✅ {label} 구독? 됐다, 됐어.\n이젠 뭐 또 바라는거 있어?"
+            else:
+                msg = f"🔕 {label} 구독 해제? 어, 됐다니까.\n이제 신경 끄고 살아."
+            self._apply(user_id, old, new)
+            self._notify(user_id, old, new)
+
+            # 저장은 write-behind 큐로 넘기고 바로 응답
+            self._mark_dirty(user_id)
+            return True, msg
+        except Exception as e:
+            logging.exception("toggle() 실패: %s", e)
+            return False, "❌ 구독 처리 중 오류! 인간, 뭐 잘못 눌렀냐?"
+
+    def _apply(self, user_id: int, old: int, new: int) -> None:
+        """플래그 갱신 + 변화가 생긴 알림 타입의 수신자 인덱스만 증분 수정"""
+        if new:
+            self._flags[user_id] = new
+        else:
+            self._flags.pop(user_id, None)
+        if new & self._bits[DM_PREF]:
+            self._dm_users.add(user_id)
+        else:
+            self._dm_users.discard(user_id)
+        self.version += 1
+        self._change_log.append((self.version, user_id))
+        all_bit = self._bits[ALL_TYPE]
+        for t in self.sub_types:
+            mask    = self._bits[t] | all_bit
+            was, now = bool(old & mask), bool(new & mask)
+            if was == now:
+                continue
+            ids = self._recipients[t]
+            if now:
+                insort(ids, user_id)
+            else:
+                i = bisect_left(ids, user_id)
+                if i < len(ids) and ids[i] == user_id:
+                    del ids[i]
+
+    def set_labels(self, labels: Dict[str, str]) -> None:
+        """표시 이름 갱신(설정 재적재). 구독 타입/비트 배치는 바뀌지 않음"""
+        self._labels.update(labels)
+
+    # ----- 변경 통지 -----
+    def add_listener(self, listener: ChangeListener) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, user_id: int, old: int, new: int) -> None:
+        if not self._listeners:
+            return
+        changes = {t: bool(new & bit) for t, bit in self._bits.items() if (old ^ new) & bit}
+        for listener in self._listeners:
+            try:
+                listener(user_id, changes)
+            except Exception:
+                logging.exception("구독 변경 리스너 실패")
+
+    def subscribers_of(self, sub_type: str) -> List[int]:
+        """해당 타입을 '직접' 구독한 사용자(all 미포함, 역할 일괄 동기화용)"""
+        bit = self._bits.get(sub_type, 0)
+        return sorted(u for u, f in self._flags.items() if f & bit)
+
+    # ----- write-behind 저장 -----
+    @property
+    def pending_writes(self) -> int:
+        return len(self._dirty)
+
+    def _mark_dirty(self, user_id: int) -> None:
+        self._dirty.pop(user_id, None)
+        self._dirty[user_id] = None
+        self._schedule_write(self.flush_interval)
+
+    def _schedule_write(self, delay: float) -> None:
+        """저장 태스크가 없을 때만 delay 뒤 1회 저장을 예약(그 사이 토글은 같은 배치로 병합)"""
+        if self._writer is not None and not self._writer.done():
+            return
+
+        async def write_soon() -> None:
+            await asyncio.sleep(delay)
+            # 저장 자체는 취소되지 않게 보호(flush() 가 대기 중인 예약만 취소해도 배치 유실 없음)
+            await asyncio.shield(self._write_dirty())
+
+        self._writer = asyncio.create_task(write_soon())
+
+    async def _write_dirty(self) -> bool:
+        """dirty 사용자들의 현재 상태를 한 번에 저장. 실패 시 dirty 로 되돌리고 재시도 예약"""
+        async with self._write_lock:
+            if not self._dirty:
+                return True
+            users       = list(self._dirty)
+            self._dirty = {}
+            batch       = [(user_id, self.types_of(user_id)) for user_id in users]
+            started = time.perf_counter()
+            try:
+                ok = await asyncio.to_thread(self._store.record_many, batch)
+            except Exception:
+                logging.exception("구독 상태 저장 중 예외")
+                ok = False
+            SAVE_SECONDS.observe(time.perf_counter() - started)
+            if not ok:
+                # 저장 도중 다시 바뀐 사용자는 이미 dirty → 나머지만 되돌림
+                for user_id in users:
+                    self._dirty.setdefault(user_id, None)
+                logging.error("구독 상태 저장 실패(%d명) — %.0fs 후 재시도", len(users), RETRY_INTERVAL)
+                self._writer = None
+                self._schedule_write(RETRY_INTERVAL)
+                return False
+            if self._store.needs_compaction:
+                self._start_compaction()
+        if self._dirty:
+            # 저장 중에 들어온 토글
+            self._writer = None
+            self._schedule_write(self.flush_interval)
+        return True
+
+    async def refresh(self) -> bool:
+        """
+        다른 프로세스가 공유 저장소를 바꿨으면 전체 상태를 다시 읽는다.
+        - 저장 대기 중인 로컬 변경이 있거나, 읽는 사이 토글이 들어오면 이번에는 건너뜀(다음 주기에 재시도)
+        - 변경 이력을 비워 사전 렌더링된 페이로드는 전체 재구성되게 함
+        Returns: 다시 읽었으면 True
+        """
+        data_version = await asyncio.to_thread(self._store.data_version)
+        if data_version is None or data_version == self._seen_data_version or self._dirty:
+            return False
+        version = self.version
+        data    = await asyncio.to_thread(self._store.load)
+        if self.version != version or self._dirty:
+            return False
+        self._load(data)
+        self._seen_data_version = data_version
+        self.version += 1
+        self._change_log.clear()
+        logging.info("공유 저장소 외부 변경 반영(%s, 구독자 %d명)", self._file_name, len(self._flags))
+        return True
+
+    def changes_since(self, version: int) -> Optional[Set[int]]:
+        """
+        version 이후 상태가 바뀐 user_id 집합.
+        이력이 잘려 나가 정확히 알 수 없으면 None(호출자는 전체 재구성).
+        """
+        if version >= self.version:
+            return set()
+        if not self._change_log or self._change_log[0][0] > version + 1:
+            return None
+        changed: Set[int] = set()
+        for v, user_id in reversed(self._change_log):
+            if v <= version:
+                break
+            changed.add(user_id)
+        return changed
+
+    def is_recipient(self, user_id: int, sub_type: str) -> bool:
+        mask = self._bits.get(sub_type, 0) | self._bits[ALL_TYPE]
+        return bool(self._flags.get(user_id, 0) & mask)
+
+    def prefers_dm(self, user_id: int) -> bool:
+        return user_id in self._dm_users
+
+    def is_channel_recipient(self, user_id: int, sub_type: str) -> bool:
+        """채널 멘션 대상 여부(구독 중 + DM 선호 아님)"""
+        return user_id not in self._dm_users and self.is_recipient(user_id, sub_type)
+
+    def channel_recipients(self, sub_type: str) -> List[int]:
+        """채널 멘션 대상(DM 선호 사용자 제외). DM 선호자가 없으면 인덱스를 그대로(O(1))"""
+        ids = self.recipients_for(sub_type)
+        if not self._dm_users:
+            return ids
+        return [u for u in ids if u not in self._dm_users]
+
+    def dm_recipients(self, sub_type: str) -> List[int]:
+        """DM 으로 받을 구독자(DM 선호 사용자 수에 비례)"""
+        return sorted(u for u in self._dm_users if self.is_recipient(u, sub_type))
+
+    def types_of(self, user_id: int) -> List[str]:
+        flags = self._flags.get(user_id, 0)
+        return [t for t, bit in self._bits.items() if flags & bit]
+
+    def snapshot(self) -> Dict[str, Set[int]]:
+        """백엔드 저장용 {타입: set(User ID)} 복사본"""
+        data: Dict[str, Set[int]] = {t: set() for t in self._bits}
+        for user_id, flags in self._flags.items():
+            for t, bit in self._bits.items():
+                if flags & bit:
+                    data[t].add(user_id)
+        return data
+
+    def _start_compaction(self) -> None:
+        """
+        저널 회전 + 메모리 스냅샷을 같은 시점에 뜬 뒤, 스냅샷 저장은 백그라운드 스레드로 넘긴다.
+        (호출자는 self._write_lock 을 보유 중이어야 함 → 회전 중에 저널 추가가 끼어들지 않음)
+        - 스냅샷에 아직 저장 안 된(dirty) 변경이 섞여도, 이후 새 저널에 같은 최종 상태가 기록되므로 멱등
+        """
+        if self._compaction is not None and not self._compaction.done():
+            return
+        self._store.rotate()
+        snapshot = self.snapshot()
+        self._compaction = asyncio.create_task(asyncio.to_thread(self._store.compact, snapshot))
+
+    async def flush(self) -> None:
+        """종료 시 호출: 대기 중인 변경 저장 → 진행 중/남은 저널을 스냅샷으로 압축하고 파일 핸들 정리"""
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        await self._write_dirty()
+        if self._writer is not None:
+            self._writer.cancel()   # 실패 시 예약된 재시도는 종료 시점에 의미 없음
+        async with self._write_lock:
+            if self._compaction is not None:
+                await asyncio.gather(self._compaction, return_exceptions=True)
+            self._compaction = None
+            if self._store.pending_records:
+                self._start_compaction()
+            compaction = self._compaction
+        if compaction is not None:
+            await asyncio.gather(compaction, return_exceptions=True)
+        self._store.close()
+
+    def recipients_for(self, sub_type: str) -> List[int]:
+        """
+        알림 전송 대상(`all ∪ sub_type`, user_id 오름차순).
+        - 미리 유지되는 인덱스를 그대로 넘겨준다(O(1)) → 호출자는 읽기 전용으로만 사용
+        - 다음 토글에서 제자리 갱신되므로, await 너머로 보관하려면 복사해서 쓸 것
+        """
+        ids = self._recipients.get(sub_type)
+        if ids is not None:
+            return ids
+        bit = self._bits.get(sub_type, 0) | self._bits[ALL_TYPE]
+        return sorted(u for u, f in self._flags.items() if f & bit)
+
+    def _label_from_type(self, sub_type: str) -> str:
+        return self._labels.get(sub_type, sub_type)
@@ -1,37 +1,396 @@
-import json
-from typing import Dict, Set
-from pathlib import Path
-
-from module.utils import get_app_dir
-
-CONFIG_PATH = get_app_dir() / "config"
-
-def load_subscriptions(config_file_name: str) -> Dict[str, Set[int]]:
-    """
-    구독자 정보를 파일에서 로드하여 {구독타입: set(User ID)} 형태로 반환
-    """
-    file_path = CONFIG_PATH / config_file_name
-    if not file_path.exists():
-        return {"minute_5_before": set(), "minute_3_before": set(), "on_time": set(), "all": set()}
-    try:
-        with file_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        # set으로 변환
-        return {k: set(v) for k, v in data.items()}
-    except Exception:
-        # 파일 구조 오류 등 예외
-        return {"minute_5_before": set(), "minute_3_before": set(), "on_time": set(), "all": set()}
-
-def save_subscriptions(config_file_name: str, data: Dict[str, Set[int]]) -> bool:
-    """
-    {구독타입: set(User ID)} 형태의 데이터를 파일로 저장
-    """
-    file_path = CONFIG_PATH / config_file_name
-    try:
-        # set → list 변환해서 저장
-        serializable = {k: list(v) for k, v in data.items()}
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(serializable, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception:
-        return False
\ No newline at end of file
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Set, TextIO, Tuple
+from pathlib import Path
+
+from module.utils import get_state_dir
+
+def _empty_subscriptions() -> Dict[str, Set[int]]:
+    return {"minute_5_before": set(), "minute_3_before": set(), "on_time": set(), "all": set(), "dm": set()}
+
+def _load_json_snapshot(config_file_name: str) -> Dict[str, Set[int]]:
+    """
+    구독자 정보를 JSON 스냅샷 파일에서 로드하여 {구독타입: set(User ID)} 형태로 반환
+    """
+    file_path = get_state_dir() / config_file_name
+    if not file_path.exists():
+        return _empty_subscriptions()
+    try:
+        with file_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        # set으로 변환
+        return {k: set(v) for k, v in data.items()}
+    except Exception:
+        # 파일 구조 오류 등 예외
+        return _empty_subscriptions()
+
+def _save_json_snapshot(config_file_name: str, data: Dict[str, Set[int]]) -> bool:
+    """
+    {구독타입: set(User ID)} 형태의 데이터를 JSON 스냅샷 파일로 저장
+    - 임시 파일에 쓴 뒤 교체(os.replace)하므로 저장 도중 죽어도 기존 파일은 온전함
+    """
+    file_path = get_state_dir() / config_file_name
+    tmp_path  = file_path.with_name(file_path.name + ".tmp")
+    try:
+        # set → list 변환해서 저장
+        serializable = {k: list(v) for k, v in data.items()}
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(serializable, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+        return True
+    except Exception:
+        return False
+
+# --------------------------------------
+# 저장소 백엔드 인터페이스
+# --------------------------------------
+class SubscriptionStore(ABC):
+    """
+    구독 저장소 백엔드 공통 인터페이스.
+    - load()        : 전체 상태 복원(필수)
+    - record()      : 사용자 1명의 최종 구독 타입 목록 반영(부분 갱신)
+    - record_many() : 여러 사용자 상태를 한 번에 반영(배치, 필수)
+    - save_all()    : 전체 상태 덮어쓰기(필수)
+    - rotate()/compact() : 압축이 필요한 백엔드만 구현(기본은 no-op)
+    - data_version() : 다른 프로세스와 공유하는 백엔드만 구현(외부 변경 감지용, 기본은 None)
+    """
+    @abstractmethod
+    def load(self) -> Dict[str, Set[int]]:
+        ...
+
+    def record(self, user_id: int, types: Iterable[str]) -> bool:
+        return self.record_many([(user_id, types)])
+
+    @abstractmethod
+    def record_many(self, records: Iterable[Tuple[int, Iterable[str]]]) -> bool:
+        ...
+
+    @abstractmethod
+    def save_all(self, data: Dict[str, Set[int]]) -> bool:
+        ...
+
+    @property
+    def needs_compaction(self) -> bool:
+        return False
+
+    @property
+    def pending_records(self) -> int:
+        return 0
+
+    def rotate(self) -> None:
+        return None
+
+    def data_version(self) -> Optional[int]:
+        return None
+
+    def compact(self, snapshot: Dict[str, Set[int]]) -> bool:
+        return True
+
+    def close(self) -> None:
+        return None
+
+# --------------------------------------
+# JSON 백엔드(기본): 추가 전용 저널(스냅샷 + 저널 꼬리)
+# --------------------------------------
+class SubscriptionJournal(SubscriptionStore):
+    """
+    토글마다 전체 파일을 다시 쓰지 않도록, 변경을 저널(JSONL)에 한 줄씩 추가하는 저장소.
+    - 레코드 = 해당 사용자의 '토글 후 최종 구독 타입 목록' → 재적용해도 결과가 같음(멱등)
+    - compact(): 저널을 회전(.journal → .journal.old)한 뒤 스냅샷(JSON)을 원자적으로 교체
+    - load(): 스냅샷 + .journal.old + .journal 순서로 재생하여 상태 복원
+    - 마지막 줄이 잘린 경우(쓰기 도중 크래시) 해당 줄부터 무시하고 파일도 그 앞까지 잘라 냄
+    """
+    def __init__(self, config_file_name: str, compact_threshold: int = 500, fsync: bool = True) -> None:
+        self._file_name: str            = config_file_name
+        snapshot_path: Path             = get_state_dir() / config_file_name
+        self.journal_path: Path         = snapshot_path.with_suffix(".journal")
+        self.rotated_path: Path         = snapshot_path.with_suffix(".journal.old")
+        self.compact_threshold: int     = compact_threshold
+        self._fsync: bool               = fsync
+        self._io_lock                   = threading.Lock()   # append/rotate 는 워커 스레드에서 호출됨
+        self._fh: Optional[TextIO]      = None
+        self._pending: int              = 0                  # 마지막 압축 이후 쌓인 레코드 수
+
+    @property
+    def pending_records(self) -> int:
+        return self._pending
+
+    # ----- 복원 -----
+    def load(self) -> Dict[str, Set[int]]:
+        data = _load_json_snapshot(self._file_name)
+        for t in _empty_subscriptions():
+            data.setdefault(t, set())
+        for path in (self.rotated_path, self.journal_path):
+            self._pending += self._replay(path, data)
+        return data
+
+    @staticmethod
+    def _replay(path: Path, data: Dict[str, Set[int]]) -> int:
+        if not path.exists():
+            return 0
+        applied = 0
+        good    = 0     # 마지막으로 온전히 적용한 줄 끝의 바이트 오프셋
+        with path.open("rb") as f:
+            for line_no, line in enumerate(f, start=1):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("개행 없는 마지막 줄")
+                    record  = json.loads(line)
+                    user_id = int(record["u"])
+                    types   = set(record["s"])
+                except (ValueError, KeyError, TypeError):
+                    logging.warning("저널 손상 레코드 무시(%s:%d) — 이후 꼬리 폐기", path.name, line_no)
+                    break
+                for t in types:
+                    data.setdefault(t, set())
+                for t, users in data.items():
+                    if t in types:
+                        users.add(user_id)
+                    else:
+                        users.discard(user_id)
+                applied += 1
+                good    += len(line)
+            size = f.seek(0, os.SEEK_END)
+        if good < size:
+            # 잘린 꼬리를 남겨 두면 다음 레코드가 그 뒤에 붙어 함께 버려지므로 여기서 잘라 냄
+            with path.open("r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        return applied
+
+    # ----- 기록 -----
+    def record_many(self, records: Iterable[Tuple[int, Iterable[str]]]) -> bool:
+        """사용자별 최종 상태를 저널에 1줄씩 추가(구독자 수와 무관한 고정 비용)"""
+        lines = [
+            json.dumps({"u": user_id, "s": sorted(types)}, ensure_ascii=False) + "\n"
+            for user_id, types in records
+        ]
+        try:
+            with self._io_lock:
+                if self._fh is None:
+                    self._fh = self.journal_path.open("a", encoding="utf-8")
+                self._fh.writelines(lines)
+                self._fh.flush()
+                if self._fsync:
+                    os.fsync(self._fh.fileno())
+                self._pending += len(lines)
+            return True
+        except Exception:
+            logging.exception("저널 기록 실패")
+            return False
+
+    def save_all(self, data: Dict[str, Set[int]]) -> bool:
+        self.rotate()
+        return self.compact(data)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._pending >= self.compact_threshold
+
+    # ----- 압축 -----
+    def rotate(self) -> None:
+        """
+        현재 저널을 .journal.old 로 넘기고 새 저널을 시작한다.
+        이벤트 루프에서 메모리 스냅샷을 뜨는 시점과 '같은 순간'에 호출해야 한다.
+        이전 압축이 실패해 .old 가 남아 있으면 회전 없이 .old 만 다시 압축 대상이 된다.
+        """
+        with self._io_lock:
+            if self.rotated_path.exists():
+                return
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self.journal_path.exists():
+                os.replace(self.journal_path, self.rotated_path)
+            self._pending = 0
+
+    def compact(self, snapshot: Dict[str, Set[int]]) -> bool:
+        """rotate() 시점의 스냅샷을 원자적으로 저장하고, 반영된 .old 저널을 제거한다."""
+        if not _save_json_snapshot(self._file_name, snapshot):
+            logging.error("저널 압축 실패: 스냅샷 저장 불가(.journal.old 유지)")
+            return False
+        try:
+            self.rotated_path.unlink(missing_ok=True)
+        except OSError:
+            logging.exception("압축된 저널 삭제 실패")
+        return True
+
+    def close(self) -> None:
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+# --------------------------------------
+# SQLite 백엔드: 사용자/타입당 1행, WAL, 배치 트랜잭션
+# --------------------------------------
+class SqliteSubscriptionStore(SubscriptionStore):
+    """
+    (user_id, sub_type) 당 1행을 저장하는 SQLite 저장소.
+    - WAL 모드 + busy_timeout → 여러 프로세스가 같은 DB를 안전하게 공유
+    - data_version(): 다른 연결(프로세스)이 커밋할 때만 바뀌는 값 → 샤드 프로세스 간 변경 감지
+    - record_many(): 한 트랜잭션 안에서 사용자별 DELETE + INSERT (부분 갱신)
+    - 호출은 asyncio.to_thread 워커 스레드에서 오므로 연결은 락으로 직렬화
+    """
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS subscriptions ("
+        "  user_id  INTEGER NOT NULL,"
+        "  sub_type TEXT    NOT NULL,"
+        "  PRIMARY KEY (user_id, sub_type)"
+        ") WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS idx_subscriptions_type ON subscriptions (sub_type, user_id)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+
+    def __init__(self, db_file_name: str) -> None:
+        self.db_path: Path  = get_state_dir() / db_file_name
+        self._io_lock       = threading.Lock()
+        self._conn          = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        for stmt in self._SCHEMA:
+            self._conn.execute(stmt)
+
+    def load(self) -> Dict[str, Set[int]]:
+        data = _empty_subscriptions()
+        with self._io_lock:
+            rows = self._conn.execute("SELECT sub_type, user_id FROM subscriptions").fetchall()
+        for sub_type, user_id in rows:
+            data.setdefault(sub_type, set()).add(user_id)
+        return data
+
+    def record_many(self, records: Iterable[Tuple[int, Iterable[str]]]) -> bool:
+        # 같은 사용자가 여러 번 오면 마지막 상태만 반영
+        latest = {user_id: list(types) for user_id, types in records}
+        return self._write(
+            "DELETE FROM subscriptions WHERE user_id = ?",
+            [(user_id,) for user_id in latest],
+            [(user_id, t) for user_id, types in latest.items() for t in types],
+        )
+
+    def save_all(self, data: Dict[str, Set[int]]) -> bool:
+        return self._write(
+            "DELETE FROM subscriptions",
+            [()],
+            [(user_id, t) for t, users in data.items() for user_id in users],
+        )
+
+    def _write(self, delete_sql: str, delete_args: list, rows: list) -> bool:
+        """DELETE + INSERT 를 하나의 쓰기 트랜잭션으로 실행"""
+        try:
+            with self._io_lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(delete_sql, delete_args)
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO subscriptions (user_id, sub_type) VALUES (?, ?)", rows
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return True
+        except Exception:
+            logging.exception("SQLite 구독 저장 실패")
+            return False
+
+    def data_version(self) -> Optional[int]:
+        try:
+            with self._io_lock:
+                return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except Exception:
+            logging.exception("SQLite data_version 조회 실패")
+            return None
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._io_lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._io_lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        with self._io_lock:
+            self._conn.close()
+
+def _sqlite_file_name(config_file_name: str) -> str:
+    return str(Path(config_file_name).with_suffix(".db"))
+
+def migrate_json_to_sqlite(config_file_name: str, db_file_name: Optional[str] = None) -> int:
+    """
+    기존 JSON(스냅샷 + 저널) 구독 정보를 SQLite로 1회 이관한다.
+    - 이미 이관된 DB(meta.migrated_from 존재)는 건드리지 않음 → 여러 번 호출해도 안전
+    - JSON 원본은 삭제하지 않음(롤백용)
+    Returns: 이관한 (user, sub_type) 행 수, 이관하지 않았으면 0
+    """
+    store = SqliteSubscriptionStore(db_file_name or _sqlite_file_name(config_file_name))
+    try:
+        if store.get_meta("migrated_from") is not None:
+            return 0
+        journal = SubscriptionJournal(config_file_name)
+        data    = journal.load()
+        journal.close()
+        if not store.save_all(data):
+            raise RuntimeError("SQLite 이관 저장 실패")
+        store.set_meta("migrated_from", config_file_name)
+        rows = sum(len(users) for users in data.values())
+        logging.info("구독 정보 JSON → SQLite 이관 완료: %d행", rows)
+        return rows
+    finally:
+        store.close()
+
+# --------------------------------------
+# 백엔드 선택/공개 함수
+# --------------------------------------
+SUBSCRIPTION_BACKENDS: Tuple[str, ...] = ("json", "sqlite")
+
+def open_subscription_store(config_file_name: str, backend: str = "json") -> SubscriptionStore:
+    """
+    backend 이름으로 저장소를 연다.
+    - "json"  : {config_file_name} 스냅샷 + .journal (기본)
+    - "sqlite": {config_file_name 의 확장자만 .db}, 처음 열 때 JSON 자동 이관
+    """
+    if backend == "json":
+        return SubscriptionJournal(config_file_name)
+    if backend == "sqlite":
+        migrate_json_to_sqlite(config_file_name)
+        return SqliteSubscriptionStore(_sqlite_file_name(config_file_name))
+    raise ValueError(f"알 수 없는 구독 저장소 백엔드: {backend} (허용: {', '.join(SUBSCRIPTION_BACKENDS)})")
+
+def load_subscriptions(config_file_name: str, backend: str = "json") -> Dict[str, Set[int]]:
+    """
+    구독자 정보를 로드하여 {구독타입: set(User ID)} 형태로 반환
+    """
+    try:
+        store = open_subscription_store(config_file_name, backend)
+        try:
+            return store.load()
+        finally:
+            store.close()
+    except Exception:
+        logging.exception("구독 정보 로드 실패(backend=%s)", backend)
+        return _empty_subscriptions()
+
+def save_subscriptions(config_file_name: str, data: Dict[str, Set[int]], backend: str = "json") -> bool:
+    """
+    {구독타입: set(User ID)} 형태의 데이터를 선택한 백엔드에 전체 저장
+    """
+    try:
+        store = open_subscription_store(config_file_name, backend)
+        try:
+            return store.save_all(data)
+        finally:
+            store.close()
+    except Exception:
+        logging.exception("구독 정보 저장 실패(backend=%s)", backend)
+        return False
@@ -1,10 +1,15 @@
-import sys
-from pathlib import Path
-
-def get_app_dir() -> Path:
-    if getattr(sys, 'frozen', False):
-        # PyInstaller로 패키징된 경우
-        return Path(sys._MEIPASS)
-    else:
-        # 일반 파이썬 실행일 경우: main.py 기준 경로
-        return Path(sys.argv[0]).resolve().parent
\ No newline at end of file
+import sys
+from pathlib import Path
+
+def get_app_dir() -> Path:
+    if getattr(sys, 'frozen', False):
+        # PyInstaller로 패키징된 경우: 실행 파일이 있는 디렉터리(쓰기 가능, 재실행해도 유지)
+        # sys._MEIPASS 는 실행마다 새로 풀리는 임시 디렉터리라 상태 파일을 두면 종료 때 사라짐
+        return Path(sys.executable).resolve().parent
+    else:
+        # 일반 파이썬 실행일 경우: main.py 기준 경로
+        return Path(sys.argv[0]).resolve().parent
+
+def get_state_dir() -> Path:
+    """상태/설정 파일 디렉터리(config). 임포트 시점이 아니라 호출 시점에 결정"""
+    return get_app_dir() / "config"
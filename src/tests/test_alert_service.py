@@ -0,0 +1,40 @@
+from module.alert_service import PreparedAlert, render_mention_chunks
+
+def _ids(count: int, start: int = 100_000_000_000_000_000):
+    return [start + i for i in range(count)]
+
+def test_chunks_respect_limit_and_pack_greedily():
+    ids    = _ids(300)
+    chunks = render_mention_chunks("헤더\n", ids)
+    assert all(len(chunk) <= 2000 for chunk in chunks)
+    assert chunks[0].startswith("헤더\n")
+    # 멘션 1개 = 21자 + 공백 → 최소 개수로 채움
+    assert len(chunks) == 4
+    mentioned = " ".join(chunks).count("<@")
+    assert mentioned == len(ids)
+
+def test_long_header_spills_first_mention_to_next_chunk():
+    header = "x" * 1994 + "\n"
+    chunks = render_mention_chunks(header, _ids(3))
+    assert all(len(chunk) <= 2000 for chunk in chunks)
+    assert chunks[0] == header + "\n"
+    assert chunks[1].count("<@") == 3
+
+def test_oversized_header_is_truncated():
+    chunks = render_mention_chunks("y" * 2500, _ids(2))
+    assert all(len(chunk) <= 2000 for chunk in chunks)
+    assert len(chunks[0]) == 2000
+
+def test_patch_rerenders_and_skips_emptied_chunk():
+    ids   = _ids(200)
+    alert = PreparedAlert("h\n", ids)
+    before = alert.render()
+    for user_id in ids[-100:]:
+        alert.remove(user_id)
+    after = alert.render()
+    assert len(after) < len(before)
+    assert all("<@" in chunk for chunk in after[1:])
+    alert.add(ids[-1])
+    assert ids[-1] in alert
+    assert len(alert) == 101
+    assert all(len(chunk) <= 2000 for chunk in alert.render())
@@ -0,0 +1,31 @@
+import asyncio
+import json
+
+from module.config_loader import ConfigLoader, patch_config_text
+
+ALIGNED = """{
+    "TOKEN"                     : "token",
+    "DEFAULT_CHANNEL_ID"        : 111,
+    "DEBUG_CHANNEL_ID"          : 222,
+    "MESSAGE_RETENTION_SECONDS" : 600
+}
+"""
+
+def test_patch_keeps_layout_and_only_changes_values():
+    patched = patch_config_text(ALIGNED, {"DEFAULT_CHANNEL_ID": 999})
+    assert patched == ALIGNED.replace(": 111,", ": 999,")
+
+def test_patch_appends_missing_key_with_same_alignment():
+    patched = patch_config_text(ALIGNED, {"DISPATCH_CONCURRENCY": 4})
+    assert json.loads(patched)["DISPATCH_CONCURRENCY"] == 4
+    assert patched.splitlines()[:4] == ALIGNED.splitlines()[:4]
+    assert '    "DISPATCH_CONCURRENCY"      : 4' in patched
+
+def test_write_back_persists_and_keeps_layout(tmp_path):
+    path = tmp_path / "Config.json"
+    path.write_text(ALIGNED, encoding="utf-8")
+    loader = ConfigLoader(str(path))
+
+    snapshot = asyncio.run(loader.write_back(MESSAGE_RETENTION_SECONDS=120))
+    assert snapshot.message_retention_seconds == 120
+    assert path.read_text(encoding="utf-8") == ALIGNED.replace(": 600", ": 120")
@@ -0,0 +1,31 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("discord")
+
+from module.dispatcher import MessageDispatcher, MessageJob
+from module.outbox import MessageOutbox
+
+def test_put_during_compaction_is_not_lost(state_dir):
+    async def scenario():
+        dispatcher = MessageDispatcher(bot=None)
+        compact    = dispatcher.outbox.compact
+        entered    = threading.Event()
+
+        def slow_compact(rows):
+            entered.set()
+            time.sleep(0.05)        # 스냅샷을 뜬 뒤 파일을 교체하기 전 — 다른 put 이 끼어들 틈
+            return compact(rows)
+
+        dispatcher.outbox.compact = slow_compact
+        flush = asyncio.create_task(dispatcher._flush_outbox(compact=True))
+        await asyncio.to_thread(entered.wait)
+        await dispatcher.enqueue(MessageJob(channel_id=1, content="late", key="late"))
+        await flush
+        dispatcher.outbox.close()
+
+    asyncio.run(scenario())
+    assert [r["key"] for r in MessageOutbox().load()] == ["late"]
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("discord")
+
+from module import dm_delivery
+from module.dm_delivery import DirectMessageSender
+
+class FakeBot:
+    def __init__(self, hang: bool = False) -> None:
+        self.sent = []
+        self.hang = hang
+
+    async def create_dm(self, user):
+        async def send(content):
+            if self.hang:
+                await asyncio.Event().wait()
+            self.sent.append((user.id, content))
+        return SimpleNamespace(id=user.id, send=send)
+
+async def _direct_call(route, key, call, what, job=None):
+    return await call()
+
+def _run_sender(bot: FakeBot, *deliveries, drain: float = 1.0, crash: bool = False) -> None:
+    """전송기를 켜고 deliveries 를 적재한 뒤 정지(crash=True 면 stop() 없이 워커만 멈춤 = 프로세스 크래시)"""
+    async def scenario():
+        sender = DirectMessageSender(bot, _direct_call, workers=2)
+        sender.start()
+        for args in deliveries:
+            await sender.deliver(*args)
+        await asyncio.sleep(0.05)
+        if not crash:
+            await sender.stop(drain_timeout=drain)
+            return
+        for w in sender._workers:
+            w.cancel()
+        await asyncio.gather(*sender._workers, return_exceptions=True)
+        sender.outbox.close()
+
+    asyncio.run(scenario())
+
+def test_unsent_dms_are_resent_after_restart(state_dir):
+    hung = FakeBot(hang=True)
+    _run_sender(hung, ([1, 2, 3], "hi"), ([4], "old", time.time() - 1), drain=0.05)
+    assert hung.sent == []
+
+    bot = FakeBot()
+    _run_sender(bot)
+    assert sorted(bot.sent) == [(1, "hi"), (2, "hi"), (3, "hi")]     # 전송 중 취소분 포함, 마감 지난 DM 은 폐기
+
+    again = FakeBot()
+    _run_sender(again)
+    assert again.sent == []
+
+def test_queued_dms_survive_a_crash_and_are_not_resent_once_done(state_dir, monkeypatch):
+    monkeypatch.setattr(dm_delivery, "DM_OUTBOX_FLUSH_SECONDS", 0.0)
+    _run_sender(FakeBot(hang=True), ([1, 2], "hi"), crash=True)     # 적재 직후 크래시
+
+    bot = FakeBot()
+    _run_sender(bot, crash=True)                                    # 복원분 전송(done 기록) 후 다시 크래시
+    assert sorted(bot.sent) == [(1, "hi"), (2, "hi")]
+
+    again = FakeBot()
+    _run_sender(again)
+    assert again.sent == []
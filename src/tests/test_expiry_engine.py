@@ -0,0 +1,43 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("discord")
+
+from module.expiry_engine import MessageExpiryEngine
+
+class FakeChannel:
+    def __init__(self, channel_id: int, deleted) -> None:
+        self.id      = channel_id
+        self.deleted = deleted
+
+    def get_partial_message(self, message_id: int):
+        async def delete():
+            self.deleted.append(message_id)
+        return SimpleNamespace(delete=delete)
+
+def test_stop_mid_batch_keeps_undeleted_messages(state_dir):
+    deleted  = []
+    channels = {1: FakeChannel(1, deleted), 2: FakeChannel(2, deleted)}
+    bot      = SimpleNamespace(get_channel=channels.get)
+
+    async def caller(route, channel_id, call, what, job=None):
+        if channel_id == 2:
+            await asyncio.Event().wait()    # 두 번째 채널 삭제 도중 종료
+        return await call()
+
+    async def scenario():
+        engine = MessageExpiryEngine(bot, caller)
+        engine.schedule(1, 10, 0)
+        engine.schedule(2, 20, 0)
+        engine.start()
+        await asyncio.sleep(0.05)
+        await engine.stop()
+
+    asyncio.run(scenario())
+    assert deleted == [10]
+
+    restored = MessageExpiryEngine(bot, caller)
+    assert restored.load() == 1
+    assert [(p.channel_id, p.message_id) for p in restored._heap] == [(2, 20)]
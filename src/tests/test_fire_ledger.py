@@ -0,0 +1,111 @@
+import asyncio
+import datetime as dt
+import json
+
+from module.fire_ledger import (
+    STATUS_DELIVERED,
+    STATUS_EXPIRED,
+    FireLedger,
+    FireRecord
+)
+
+FIRE_AT = dt.datetime(2025, 8, 1, 12, 55, tzinfo=dt.timezone(dt.timedelta(hours=9)))
+
+def _record(guild_id: int, deadline: float = 4_000_000_000.0) -> FireRecord:
+    return FireRecord.create("minute_5_before", FIRE_AT, guild_id, 10 + guild_id, None, deadline, ["a", "b"])
+
+def test_claim_is_deduplicated_across_restarts(state_dir):
+    async def first_run():
+        ledger = FireLedger(fsync=False)
+        claimed = await ledger.claim_many([_record(1), _record(2)])
+        again   = await ledger.claim_many([_record(1)])
+        await ledger.stop()
+        return claimed, again
+
+    claimed, again = asyncio.run(first_run())
+    assert [r.guild_id for r in claimed] == [1, 2]
+    assert again == []
+
+    async def second_run():
+        ledger = FireLedger(fsync=False)
+        ledger.load()
+        return await ledger.claim_many([_record(1), _record(3)])
+
+    assert [r.guild_id for r in asyncio.run(second_run())] == [3]
+
+def test_marks_are_appended_and_replayed(state_dir):
+    async def run():
+        ledger = FireLedger(fsync=False)
+        [record] = await ledger.claim_many([_record(1)])
+        ledger.mark(record.key, 0, True)
+        await ledger._write()           # 디바운스 저장 1회분
+        return ledger, record.key
+
+    ledger, key = asyncio.run(run())
+    lines = [json.loads(line) for line in ledger._path.read_text(encoding="utf-8").splitlines()]
+    assert [line["op"] for line in lines] == ["claim", "mark"]
+
+    restored = FireLedger(fsync=False)
+    restored.load()
+    [(record, pending)] = restored.resumable()
+    assert record.key == key
+    assert pending == [1]
+
+def test_compaction_keeps_state_and_drops_history(state_dir):
+    async def run():
+        ledger = FireLedger(fsync=False, compact_threshold=3)
+        [record] = await ledger.claim_many([_record(1)])
+        ledger.mark(record.key, 0, True)
+        ledger.mark(record.key, 1, True)
+        assert ledger.needs_compaction
+        await ledger._write(compact=ledger.needs_compaction)
+        return ledger
+
+    ledger = asyncio.run(run())
+    assert len(ledger._path.read_text(encoding="utf-8").splitlines()) == 1
+    restored = FireLedger(fsync=False)
+    restored.load()
+    assert restored.resumable() == []
+    assert list(restored._records.values())[0].status == STATUS_DELIVERED
+
+def test_torn_tail_is_truncated(state_dir):
+    async def run():
+        ledger = FireLedger(fsync=False)
+        await ledger.claim_many([_record(1)])
+        await ledger.stop()
+        return ledger._path
+
+    path = asyncio.run(run())
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"op": "claim", "event": "on_ti')
+    ledger = FireLedger(fsync=False)
+    assert ledger.load() == 1
+    assert path.read_text(encoding="utf-8").endswith("\n")
+
+def test_expired_on_restart_is_persisted(state_dir):
+    async def run():
+        ledger = FireLedger(fsync=False)
+        await ledger.claim_many([_record(1, deadline=1.0)])
+        await ledger.stop()
+        restarted = FireLedger(fsync=False)
+        restarted.load()
+        assert restarted.resumable() == []
+        await restarted.stop()
+
+    asyncio.run(run())
+    ledger = FireLedger(fsync=False)
+    ledger.load()
+    assert list(ledger._records.values())[0].status == STATUS_EXPIRED
+
+def test_legacy_json_ledger_is_migrated(state_dir):
+    legacy = state_dir / "fire_ledger.json"
+    legacy.write_text(json.dumps([_record(7).to_row()]), encoding="utf-8")
+
+    async def run():
+        ledger = FireLedger(fsync=False)
+        assert ledger.load() == 1
+        await ledger.stop()
+
+    asyncio.run(run())
+    assert not legacy.exists()
+    assert (state_dir / "fire_ledger.jsonl").exists()
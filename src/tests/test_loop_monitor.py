@@ -0,0 +1,25 @@
+import asyncio
+
+from module.clock import SimulatedClock
+from module.loop_monitor import LoopMonitor
+
+def test_slow_report_does_not_show_up_as_loop_lag():
+    async def scenario():
+        clock = SimulatedClock(0.0)
+        sent  = []
+
+        async def slow_report(text):
+            await clock.sleep(5.0)      # 레이트리밋 대기 등으로 오래 걸리는 보고
+            sent.append(text)
+
+        monitor = LoopMonitor(clock=clock, report=slow_report, report_interval=0.0)
+        monitor.observe(3.0)            # 보고할 사건(경고 지연) 1건
+        monitor.start()
+        await clock.run_until(10.0)
+        await monitor.stop()
+        return monitor, sent
+
+    monitor, sent = asyncio.run(scenario())
+    assert len(sent) == 1
+    samples = list(monitor._recent)[1:]
+    assert len(samples) == 10 and max(samples) == 0.0
@@ -0,0 +1,41 @@
+from module.outbox import MessageOutbox
+
+def _row(key: str, content: str = "x"):
+    return {"key": key, "channel_id": 1, "content": content}
+
+def test_replay_keeps_only_unfinished_jobs_in_order(state_dir):
+    outbox = MessageOutbox(fsync=False)
+    outbox.put_many([_row("a"), _row("b"), _row("c")])
+    outbox.done_many(["b"])
+    outbox.put_many([_row("a", "again")])     # 같은 키는 마지막 put 만 유효
+    outbox.done_many(["unknown"])
+    outbox.close()
+
+    rows = MessageOutbox(fsync=False).load()
+    assert [(r["key"], r["content"]) for r in rows] == [("a", "again"), ("c", "x")]
+
+def test_compaction_rewrites_pending_only(state_dir):
+    outbox = MessageOutbox(fsync=False, compact_threshold=2)
+    outbox.put_many([_row("a"), _row("b"), _row("c")])
+    outbox.done_many(["a", "b"])
+    assert outbox.needs_compaction
+    assert outbox.compact([_row("c")])
+    outbox.put_many([_row("d")])
+    outbox.close()
+
+    assert not outbox.needs_compaction
+    assert len(outbox.path.read_text(encoding="utf-8").splitlines()) == 2
+    assert [r["key"] for r in MessageOutbox(fsync=False).load()] == ["c", "d"]
+
+def test_torn_tail_is_truncated_before_new_appends(state_dir):
+    outbox = MessageOutbox(fsync=False)
+    outbox.put_many([_row("a")])
+    outbox.close()
+    with outbox.path.open("a", encoding="utf-8") as f:
+        f.write('{"op": "put", "key": "b"')     # 쓰기 도중 크래시
+
+    outbox = MessageOutbox(fsync=False)
+    assert [r["key"] for r in outbox.load()] == ["a"]
+    outbox.put_many([_row("c")])
+    outbox.close()
+    assert [r["key"] for r in MessageOutbox(fsync=False).load()] == ["a", "c"]
@@ -0,0 +1,32 @@
+import asyncio
+
+from module.clock import SimulatedClock
+from module.rate_limiter import WindowBucket
+
+def test_window_bucket_never_exceeds_limit_in_any_window():
+    async def scenario():
+        clock  = SimulatedClock(0.0)
+        bucket = WindowBucket(5, 5.0, clock=clock)
+        stamps = []
+
+        async def take():
+            await bucket.acquire()
+            stamps.append(clock.monotonic())
+
+        tasks = [asyncio.ensure_future(take()) for _ in range(12)]
+        await clock.run_until(60.0)
+        await asyncio.gather(*tasks)
+        return stamps
+
+    stamps = asyncio.run(scenario())
+    assert len(stamps) == 12
+    assert stamps[:5] == [0.0] * 5                   # 처음 5회는 즉시
+    for i in range(5, len(stamps)):
+        assert stamps[i] - stamps[i - 5] >= 5.0      # 어느 5초 구간에도 5회 이하
+
+def test_sync_with_server_remaining_shrinks_local_budget():
+    clock  = SimulatedClock(0.0)
+    bucket = WindowBucket(5, 5.0, clock=clock)
+    bucket.sync(remaining=1, reset_after=5.0)
+    assert asyncio.run(bucket.acquire()) == 0.0
+    assert bucket.delay_until_available() > 0.0
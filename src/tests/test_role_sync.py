@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("discord")
+
+from module.role_sync import RoleSyncQueue
+from module.subscription_manager import SubscriptionManager
+
+GUILD = 1
+USER  = 42
+ROLES = {"on_time": 100, "all": 101}
+
+class FakeHTTP:
+    def __init__(self) -> None:
+        self.roles = set()
+
+    async def add_role(self, guild_id, user_id, role_id, reason=None):
+        self.roles.add(role_id)
+
+    async def remove_role(self, guild_id, user_id, role_id, reason=None):
+        self.roles.discard(role_id)
+
+class FakeRegistry:
+    def __init__(self, manager: SubscriptionManager) -> None:
+        self.manager = manager
+        self.config  = SimpleNamespace(role_ids=dict(ROLES))
+
+    def get(self, guild_id):
+        return self.config
+
+    def manager_for(self, guild_id):
+        return self.manager
+
+async def _direct_call(route, key, call, what, job=None):
+    return await call()
+
+def test_dm_preference_removes_and_restores_alert_roles(state_dir):
+    async def scenario():
+        http    = FakeHTTP()
+        manager = SubscriptionManager("subscribed_users.json")
+        queue   = RoleSyncQueue(SimpleNamespace(http=http), _direct_call, FakeRegistry(manager))
+        manager.add_listener(queue.listener_for(GUILD))
+
+        await manager.toggle(USER, "on_time")
+        await queue._drain()
+        assert http.roles == {100}
+
+        await manager.toggle(USER, "dm")
+        await queue._drain()
+        assert http.roles == set()          # DM 선호 → 채널 역할 멘션으로 중복 수신하지 않음
+
+        await manager.toggle(USER, "dm")
+        await queue._drain()
+        assert http.roles == {100}
+        await manager.flush()
+
+    asyncio.run(scenario())
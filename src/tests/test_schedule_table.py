@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from module.config_loader import BotConfig
+from module.schedule_table import DEFAULT_SCHEDULE, load_schedule, parse_event
+
+def test_parse_event_rejects_header_that_cannot_fit():
+    with pytest.raises(ValueError):
+        parse_event({"key": "boss", "template": "x" * 1990 + "{hour}:{minute} → {next_hour}\\n"})
+
+def test_parse_event_accepts_header_at_limit():
+    # 22:59 렌더링 기준 1999자 = 헤더 + 개행 2000자
+    template = "x" * (1999 - len("22:59 → 23")) + "{hour}:{minute} → {next_hour}"
+    spec = parse_event({"key": "boss", "template": template})
+    assert spec.key == "boss"
+
+def test_load_schedule_rejects_reserved_and_duplicate_keys():
+    with pytest.raises(ValueError):
+        load_schedule([{"key": "dm", "template": "t"}])
+    with pytest.raises(ValueError):
+        load_schedule([{"key": "a", "template": "t"}, {"key": "a", "template": "t"}])
+
+def test_shipped_config_schedule_matches_builtin_default():
+    text = (Path(__file__).resolve().parent.parent / "config" / "Config.json").read_text(encoding="utf-8")
+    raw  = json.loads(text.replace("<DISCORD-CHANNEL-ID>", "0"))
+    assert raw["ALERT_MESSAGE_MODE"] == BotConfig(token="").alert_message_mode
+    shipped = load_schedule(raw["ALERT_SCHEDULE"])
+    fields  = lambda e: (e.key, e.template, e.minutes, e.hours, e.weekdays, e.deadline_seconds, e.family)
+    assert [fields(e) for e in shipped] == [fields(e) for e in DEFAULT_SCHEDULE]
+
+@pytest.mark.parametrize("field", ["lead_seconds", "deadline_seconds"])
+def test_parse_event_rejects_negative_seconds(field):
+    with pytest.raises(ValueError, match=field):
+        parse_event({"key": "boss", "template": "t", field: -1})
+
+@pytest.mark.parametrize("template", ["{hours}시", "{0}시", "{hour"])
+def test_parse_event_reports_template_typo_with_event_key(template):
+    with pytest.raises(ValueError, match="'boss'"):
+        parse_event({"key": "boss", "template": template})
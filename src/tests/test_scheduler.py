@@ -0,0 +1,54 @@
+import asyncio
+import datetime as dt
+
+from module.clock import SimulatedClock
+from module.scheduler import AlertScheduler
+from module.schedule_table import parse_event
+
+KST = dt.timezone(dt.timedelta(hours=9))
+
+def _run(start: dt.datetime, until: dt.datetime, events):
+    """start 에 스케줄러를 켜고 until 까지 가상 시간으로 재생 → (이벤트 키, 예정 시각, 지연) 목록"""
+    async def scenario():
+        clock = SimulatedClock(start)
+        fired = []
+
+        async def on_fire(key, fire_at, lateness):
+            fired.append((key, fire_at, lateness))
+
+        scheduler = AlertScheduler(events, on_fire, tz=KST, clock=clock)
+        scheduler.start()
+        await clock.run_until(until)
+        await scheduler.stop()
+        return fired, scheduler
+
+    return asyncio.run(scenario())
+
+def test_rollover_across_midnight_and_weekday_filter():
+    hourly  = parse_event({"key": "on_time", "template": "t", "minute": 0, "deadline_seconds": 60})
+    weekday = parse_event({"key": "weekly", "template": "t", "minute": 0, "hour": 0, "weekday": 5})  # 토요일 0시
+    start   = dt.datetime(2025, 3, 7, 23, 30, tzinfo=KST)    # 금요일
+    fired, _ = _run(start, dt.datetime(2025, 3, 8, 1, 30, tzinfo=KST), [hourly, weekday])
+
+    assert [(k, t.strftime("%m-%d %H:%M")) for k, t, _ in fired] == [
+        ("on_time", "03-08 00:00"),
+        ("weekly", "03-08 00:00"),
+        ("on_time", "03-08 01:00"),
+    ]
+    assert all(lateness == 0.0 for _, _, lateness in fired)
+
+def test_catch_up_within_deadline_after_restart():
+    event = parse_event({"key": "on_time", "template": "t", "minute": 0, "deadline_seconds": 300})
+    start = dt.datetime(2025, 3, 8, 12, 2, tzinfo=KST)       # 정각 2분 뒤 재시작
+    fired, scheduler = _run(start, dt.datetime(2025, 3, 8, 13, 0, 1, tzinfo=KST), [event])
+
+    assert [t.strftime("%H:%M") for _, t, _ in fired] == ["12:00", "13:00"]
+    assert fired[0][2] == 120.0
+    assert scheduler.missed == 0
+
+def test_no_catch_up_past_tolerance():
+    event = parse_event({"key": "on_time", "template": "t", "minute": 0, "deadline_seconds": 60})
+    start = dt.datetime(2025, 3, 8, 12, 10, tzinfo=KST)      # 허용치(90초) 한참 뒤
+    fired, _ = _run(start, dt.datetime(2025, 3, 8, 13, 0, 1, tzinfo=KST), [event])
+
+    assert [t.strftime("%H:%M") for _, t, _ in fired] == ["13:00"]
@@ -0,0 +1,52 @@
+from module.user_store import SubscriptionJournal
+
+def _journal(**kwargs) -> SubscriptionJournal:
+    return SubscriptionJournal("subscribed_users.json", fsync=False, **kwargs)
+
+def test_replay_restores_latest_state(state_dir):
+    store = _journal()
+    store.load()
+    store.record(1, ["on_time"])
+    store.record(2, ["on_time", "all"])
+    store.record(1, ["minute_5_before"])
+    store.close()
+
+    data = _journal().load()
+    assert data["on_time"] == {2}
+    assert data["all"] == {2}
+    assert data["minute_5_before"] == {1}
+
+def test_torn_tail_is_truncated_so_later_records_survive(state_dir):
+    store = _journal()
+    store.load()
+    store.record(1, ["on_time"])
+    store.close()
+    # 쓰기 도중 크래시: 개행 없이 잘린 마지막 줄
+    with store.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"u": 2, "s": ["on')
+
+    store = _journal()
+    assert store.load()["on_time"] == {1}
+    store.record(3, ["on_time"])        # 크래시 뒤 확인 응답까지 나간 토글
+    store.close()
+
+    assert _journal().load()["on_time"] == {1, 3}
+
+def test_compaction_folds_journal_into_snapshot(state_dir):
+    store = _journal(compact_threshold=2)
+    data  = store.load()
+    store.record(1, ["on_time"])
+    store.record(2, ["dm"])
+    assert store.needs_compaction
+    data["on_time"].add(1)
+    data["dm"].add(2)
+    store.rotate()
+    store.record(3, ["all"])            # 회전 이후 기록은 새 저널로
+    assert store.compact(data)
+    store.close()
+
+    assert not store.rotated_path.exists()
+    restored = _journal().load()
+    assert restored["on_time"] == {1}
+    assert restored["dm"] == {2}
+    assert restored["all"] == {3}
@@ -0,0 +1,11 @@
+import sys
+
+from module.utils import get_state_dir
+
+def test_frozen_build_keeps_state_next_to_executable(tmp_path, monkeypatch):
+    bundle = tmp_path / "_MEI12345"
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "_MEIPASS", str(bundle), raising=False)
+    monkeypatch.setattr(sys, "executable", str(tmp_path / "app" / "alertbot.exe"))
+
+    assert get_state_dir() == (tmp_path / "app" / "config").resolve()     # 재실행해도 유지되는 경로(_MEIPASS 아님)